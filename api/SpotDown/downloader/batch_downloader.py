@@ -16,9 +16,11 @@ from rich.console import Console
 
 
 # Internal utils
+from SpotDown.utils.os import file_utils
 from SpotDown.utils.config_json import config_manager
 from SpotDown.extractor.youtube_extractor import YouTubeExtractor
 from SpotDown.downloader.youtube_downloader import YouTubeDownloader
+from SpotDown.downloader.download_index import reuse_downloaded
 
 
 # Variable
@@ -61,28 +63,43 @@ class BatchDownloader:
         self.start_time = time.time()
         self.worker_statuses = [WorkerStatus(i+1) for i in range(workers)]
         self.tasks = Queue()
-
-        for track in tracks:
-            self.tasks.put(track)
-
         self.youtube_extractor = YouTubeExtractor()
         self.downloader = YouTubeDownloader()
 
+    def already_downloaded(self, track: Dict) -> bool:
+        """Same recording (ISRC or Spotify ID) downloaded before, copied in place if needed, or a file with the same name"""
+        if reuse_downloaded(track, "mp3"):
+            return True
+        return file_utils.is_song_already_downloaded(track.get('artist', ''), track.get('title', ''))
+
+    def resolver(self):
+        """Search every track not downloaded yet concurrently and hand them to the workers as results arrive"""
+        try:
+            pending = []
+            for track in self.tracks:
+                if self.already_downloaded(track):
+                    self.skipped += 1
+                else:
+                    pending.append(track)
+
+            for index, results in self.youtube_extractor.search_many(pending):
+                if shutdown_requested:
+                    break
+                self.tasks.put((pending[index], results))
+        finally:
+            for _ in self.worker_statuses:
+                self.tasks.put(None)
+
     def worker(self, ws: WorkerStatus):
-        while not self.tasks.empty():
-            if shutdown_requested:
+        while not shutdown_requested:
+            ws.update(status="search", current="", progress=10)
+            item = self.tasks.get()
+            if item is None:
+                self.tasks.task_done()
                 break
 
-            track = self.tasks.get()
-            info = {
-                'artist': track.get('artist', ''),
-                'title': track.get('title', ''),
-                'duration_seconds': int(track.get('duration_ms', 0)) // 1000 if track.get('duration_ms') else None
-            }
-
-            # Searching
-            ws.update(status="search", current=f"{info['artist']} - {info['title']}", progress=10)
-            results = self.youtube_extractor.search_videos(f"{info['artist']} {info['title']}")
+            track, results = item
+            ws.update(current=f"{track.get('artist', '')} - {track.get('title', '')}")
             if not results:
                 ws.update(status="failed", progress=100)
                 self.failed += 1
@@ -161,7 +178,9 @@ class BatchDownloader:
         
         # suppress logging to avoid breaking live UI
         logging.disable(logging.CRITICAL)
-        threads = []
+        resolver = threading.Thread(target=self.resolver, daemon=True)
+        resolver.start()
+        threads = [resolver]
 
         for ws in self.worker_statuses:
             t = threading.Thread(target=self.worker, args=(ws,))
@@ -0,0 +1,136 @@
+# 16.10.2026
+
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+
+# External imports
+from yt_dlp.cookies import YoutubeDLCookieJar, extract_cookies_from_browser
+
+
+# Internal utils
+from SpotDown.utils.config_json import config_manager
+
+
+# Variable
+cookie_retry_after = config_manager.get_int("YTDLP", "cookie_retry_after")
+COOKIE_FILES = (Path("cookies.txt"), Path("..") / "cookies.txt")
+BROWSERS = ("chrome", "edge")
+AUTH_ERRORS = ("sign in", "cookie", "login", "403")
+
+_cookie_jars: Optional["CookieJarCache"] = None
+_cookie_jars_lock = threading.Lock()
+
+
+class CookieJarRef(NamedTuple):
+    """Loaded jar of a strategy, `generation` is bumped each time the strategy's jar is invalidated"""
+    strategy: str
+    generation: int
+    jar: YoutubeDLCookieJar
+
+
+def cookies_file() -> Optional[Path]:
+    """cookies.txt of the current directory, or of the parent one (useful for dev env)"""
+    for path in COOKIE_FILES:
+        if path.exists():
+            return path.resolve()
+    return None
+
+
+class CookieJarCache:
+    def __init__(self, retry_after: int = cookie_retry_after):
+        """
+        Cookie jars of each download strategy, loaded once per session.
+
+        A strategy is a cookies.txt file or a browser whose cookie database is
+        decrypted on first use. The strategy that last succeeded is tried first,
+        jars are dropped and reloaded after an authentication error.
+
+        Args:
+            retry_after (int): Seconds during which a strategy whose cookies failed to load is skipped
+        """
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.jars: Dict[str, YoutubeDLCookieJar] = {}
+        self.load_failures: Dict[str, float] = {}
+        self.generations: Dict[str, int] = {}
+        self.winner: Optional[str] = None
+
+    def strategies(self) -> List[str]:
+        """Strategies to try in order: last winner, cookies.txt, then the browsers"""
+        path = cookies_file()
+        strategies = ([str(path)] if path else []) + list(BROWSERS)
+        if self.winner in strategies:
+            strategies.remove(self.winner)
+            strategies.insert(0, self.winner)
+        return strategies
+
+    def jar(self, strategy: str) -> Optional[CookieJarRef]:
+        """Cookie jar of a strategy with its generation, None if its cookies cannot be loaded"""
+        with self.lock:
+            jar = self.jars.get(strategy)
+            if jar is None:
+                # A browser that is not installed or a locked database may be fixed later: retry after a while
+                failed_at = self.load_failures.get(strategy)
+                if failed_at is not None and time.monotonic() - failed_at < self.retry_after:
+                    return None
+
+                jar = self._load(strategy)
+                if jar is None:
+                    self.load_failures[strategy] = time.monotonic()
+                    return None
+
+                self.load_failures.pop(strategy, None)
+                self.jars[strategy] = jar
+            return CookieJarRef(strategy, self.generations.get(strategy, 0), jar)
+
+    def succeeded(self, strategy: str):
+        self.winner = strategy
+
+    def failed(self, strategy: str, error: Exception):
+        """Forget the jar of a strategy rejected by the site, it is reloaded on next use"""
+        message = str(error).lower()
+        if not any(marker in message for marker in AUTH_ERRORS):
+            return
+
+        with self.lock:
+            self.jars.pop(strategy, None)
+            self.generations[strategy] = self.generations.get(strategy, 0) + 1
+            if self.winner == strategy:
+                self.winner = None
+        logging.info(f"Cookies of {strategy} invalidated after auth error")
+
+    def _load(self, strategy: str) -> Optional[YoutubeDLCookieJar]:
+        try:
+            if strategy in BROWSERS:
+                jar = extract_cookies_from_browser(strategy)
+            else:
+                jar = YoutubeDLCookieJar(strategy)
+                jar.load()
+            logging.info(f"Loaded {len(jar)} cookies from {strategy}")
+            return jar
+
+        except Exception as e:
+            logging.warning(f"Unable to load cookies from {strategy}: {e}")
+            return None
+
+
+def apply_cookies(ydl, jar: YoutubeDLCookieJar):
+    """Copy a cached jar into a YoutubeDL instance, instead of letting it load cookies itself"""
+    for cookie in jar:
+        ydl.cookiejar.set_cookie(cookie)
+
+
+def get_cookie_jars() -> CookieJarCache:
+    """Process-wide cookie jar cache, shared by every download worker"""
+    global _cookie_jars
+
+    if _cookie_jars is None:
+        with _cookie_jars_lock:
+            if _cookie_jars is None:
+                _cookie_jars = CookieJarCache()
+
+    return _cookie_jars
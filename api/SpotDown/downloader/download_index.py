@@ -0,0 +1,126 @@
+# 16.10.2026
+
+import shutil
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Internal utils
+from SpotDown.utils.cache import DiskCache
+from SpotDown.utils.os import file_utils
+from SpotDown.utils.config_json import config_manager
+from SpotDown.helpers.string import track_keys
+
+
+# Variable
+index_ttl = config_manager.get_int("CACHE", "downloaded_ttl")
+index_size = config_manager.get_int("CACHE", "downloaded_max_entries")
+
+_index: Optional[DiskCache] = None
+_index_lock = threading.Lock()
+
+
+def get_download_index() -> DiskCache:
+    """Process-wide index of the downloaded recordings (ISRC or Spotify ID -> file path), opened on first use"""
+    global _index
+
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DiskCache("downloaded", index_ttl, index_size)
+
+    return _index
+
+
+def audio_ext(quality: str) -> str:
+    """Extension of the files produced for a quality setting"""
+    return "flac" if quality.upper() == "FLAC" else "mp3"
+
+
+def index_keys(track: Dict) -> List[str]:
+    """Exact identity keys of a track, titles are left out since different recordings can share them"""
+    return [key for key in track_keys(track) if not key.startswith("title:")]
+
+
+def target_path(track: Dict, ext: str, subdirectory: Optional[str] = None) -> Path:
+    """Path a track is downloaded to, same naming as YouTubeDownloader.fetch"""
+    music_folder = file_utils.get_music_folder()
+    if subdirectory:
+        music_folder = music_folder / file_utils.sanitize_filename(subdirectory)
+
+    filename = file_utils.create_filename(track.get('artist', 'Unknown Artist'), track.get('title', 'Unknown Title'))
+    return music_folder / f"{filename}.{ext}"
+
+
+def find_downloaded(track: Dict, ext: str) -> Optional[Path]:
+    """
+    File of a previous download of the same recording, in any folder.
+
+    Args:
+        track (Dict): Track info with `isrc` and/or `spotify_id`
+        ext (str): Wanted format ("mp3" or "flac"), files in another format do not count
+
+    Returns:
+        Optional[Path]: Existing file, None if the recording was never downloaded or the file is gone
+    """
+    keys = index_keys(track)
+    if not keys:
+        return None
+
+    try:
+        index = get_download_index()
+        for key in keys:
+            path = index.get(key)
+            if path is None:
+                continue
+
+            path = Path(path)
+            if not path.exists():
+                index.delete(key)
+            elif path.suffix == f".{ext}":
+                return path
+    except Exception as e:
+        logging.warning(f"Download index unavailable: {e}")
+    return None
+
+
+def record_downloaded(track: Dict, path: Path) -> None:
+    """Remember the file of a downloaded recording under each of its exact keys"""
+    try:
+        index = get_download_index()
+        for key in index_keys(track):
+            index.set(key, str(path))
+    except Exception as e:
+        logging.warning(f"Unable to record download of {path}: {e}")
+
+
+def reuse_downloaded(track: Dict, ext: str, subdirectory: Optional[str] = None) -> bool:
+    """
+    Skip the download of a recording already on disk.
+
+    A file downloaded to another folder (other playlist or album) is copied
+    to the target folder instead of being searched and transcoded again.
+
+    Returns:
+        bool: True if the track is now present in the target folder
+    """
+    existing = find_downloaded(track, ext)
+    if existing is None:
+        return False
+
+    target = target_path(track, ext, subdirectory)
+    if target.exists():
+        logging.info(f"Already downloaded: {target}")
+        return True
+
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(existing, target)
+        record_downloaded(track, target)
+        logging.info(f"Copied previous download {existing} to {target}")
+        return True
+    except Exception as e:
+        logging.warning(f"Failed to copy previous download {existing}: {e}")
+        return False
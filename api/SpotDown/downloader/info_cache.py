@@ -0,0 +1,112 @@
+# 16.10.2026
+
+import copy
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+# External imports
+from yt_dlp import YoutubeDL
+
+
+# Internal utils
+from SpotDown.utils.config_json import config_manager
+
+
+# Variable
+info_ttl = config_manager.get_int("YTDLP", "info_ttl")
+info_max_entries = config_manager.get_int("YTDLP", "info_max_entries")
+
+# Fields of the format picked by the extraction, copied to the top level of the info dict.
+# Left there, process_ie_result keeps that pick instead of applying the downloader's format.
+FORMAT_KEYS = (
+    'format', 'format_id', 'format_note', 'format_index', 'url', 'manifest_url', 'ext', 'protocol',
+    'acodec', 'vcodec', 'audio_ext', 'video_ext', 'abr', 'vbr', 'tbr', 'asr', 'audio_channels',
+    'width', 'height', 'fps', 'resolution', 'aspect_ratio', 'dynamic_range', 'stretched_ratio',
+    'filesize', 'filesize_approx', 'container', 'quality', 'source_preference', 'language_preference',
+    'preference', 'has_drm', 'http_headers', 'fragments', 'fragment_base_url', 'downloader_options',
+)
+
+_info_cache: Optional["InfoCache"] = None
+_info_cache_lock = threading.Lock()
+
+
+class InfoCache:
+    def __init__(self, ttl: int = info_ttl, max_entries: int = info_max_entries):
+        """
+        In-memory cache of yt-dlp info dicts by URL.
+
+        An info dict extracted to answer /api/info or to start a download is handed
+        to process_ie_result by the downloader instead of extracting the page again.
+        The TTL is short since the format URLs it contains expire.
+
+        Args:
+            ttl (int): Seconds an info dict stays usable
+            max_entries (int): Maximum info dicts kept, the oldest are dropped first
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+    def get(self, url: Optional[str]) -> Optional[Dict]:
+        """Copy of the info dict of a URL, yt-dlp mutates the dicts it processes"""
+        if not url:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return None
+
+            expires_at, info = entry
+            if expires_at < time.monotonic():
+                del self.entries[url]
+                return None
+
+        return copy.deepcopy(info)
+
+    def put(self, info: Dict, *urls: Optional[str]):
+        """Store an info dict under each of the given URLs and its webpage_url"""
+        info = sanitize_info(info)
+        expires_at = time.monotonic() + self.ttl
+        keys = {url for url in (*urls, info.get('webpage_url')) if url}
+
+        with self.lock:
+            for key in keys:
+                self.entries[key] = (expires_at, info)
+                self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, url: Optional[str]):
+        with self.lock:
+            self.entries.pop(url, None)
+
+
+def sanitize_info(info: Dict) -> Dict:
+    """
+    Copy of an extracted info dict without the result of its format selection.
+
+    Drops the requested formats/downloads and the per-format fields, so reprocessing
+    the dict selects from 'formats' again with the options of the session it is given to.
+    """
+    info = YoutubeDL.sanitize_info(dict(info), remove_private_keys=True)
+    for key in FORMAT_KEYS:
+        info.pop(key, None)
+    return info
+
+
+def get_info_cache() -> InfoCache:
+    """Process-wide info dict cache, shared by the API and the download workers"""
+    global _info_cache
+
+    if _info_cache is None:
+        with _info_cache_lock:
+            if _info_cache is None:
+                _info_cache = InfoCache()
+
+    return _info_cache
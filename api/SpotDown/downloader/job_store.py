@@ -0,0 +1,168 @@
+# 16.10.2026
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterator, List
+
+
+# Internal utils
+from SpotDown.helpers.string import track_keys
+from SpotDown.utils.config_json import config_manager
+
+
+# Variable
+job_store_file = config_manager.get("SCHEDULER", "job_store")
+
+TRACK_PENDING = "pending"
+TRACK_DONE = "done"
+TRACK_FAILED = "failed"
+
+# Keys of the resolved video kept for single-track jobs, the full yt-dlp info is not needed to resume
+VIDEO_INFO_KEYS = ('url', 'webpage_url', 'video_id', 'title', 'uploader', 'channel', 'thumbnail', 'duration_seconds')
+
+
+class JobStore:
+    def __init__(self, file_name: str = job_store_file):
+        """
+        SQLite (WAL mode) store of the running download jobs, used to resume them after a crash or restart.
+
+        Args:
+            file_name (str): Database file, relative paths are placed next to config.json
+        """
+        if os.path.isabs(file_name):
+            self.file_path = file_name
+        else:
+            self.file_path = os.path.join(os.path.dirname(config_manager.file_path), file_name)
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.file_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                task_id TEXT PRIMARY KEY,
+                quality TEXT NOT NULL,
+                dj_priority INTEGER NOT NULL,
+                subdirectory TEXT,
+                single INTEGER NOT NULL,
+                video_info TEXT,
+                progress TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                extracting INTEGER NOT NULL DEFAULT 0,
+                source TEXT
+            );
+            CREATE TABLE IF NOT EXISTS job_tracks (
+                task_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                track TEXT NOT NULL,
+                state TEXT NOT NULL,
+                PRIMARY KEY (task_id, idx)
+            );
+        """)
+        self.conn.commit()
+        logging.info(f"JobStore initialized at {self.file_path}")
+
+    def save_job(self, job) -> None:
+        """Persist a new job and its track list, already stored jobs are left untouched"""
+        video_info = None
+        if job.video_info:
+            video_info = json.dumps({key: job.video_info.get(key) for key in VIDEO_INFO_KEYS if job.video_info.get(key) is not None})
+        progress = job.progress.get(job.task_id) or {}
+
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO jobs (task_id, quality, dj_priority, subdirectory, single, video_info, progress, created_at, extracting, source) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.task_id, job.quality, int(job.dj_priority), job.subdirectory, int(job.single), video_info,
+                    json.dumps(progress), time.time(), int(job.extracting), json.dumps(job.source) if job.source else None
+                )
+            )
+            if cursor.rowcount:
+                self.conn.executemany(
+                    "INSERT INTO job_tracks VALUES (?, ?, ?, ?)",
+                    [(job.task_id, idx, json.dumps(track), TRACK_PENDING) for idx, track in enumerate(job.tracks)]
+                )
+            self.conn.commit()
+
+    def add_tracks(self, task_id: str, start: int, tracks: List[Dict]) -> None:
+        """Append tracks extracted after the job was saved, starting at index `start`"""
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO job_tracks VALUES (?, ?, ?, ?)",
+                [(task_id, start + offset, json.dumps(track), TRACK_PENDING) for offset, track in enumerate(tracks)]
+            )
+            self.conn.commit()
+
+    def finish_extraction(self, task_id: str) -> None:
+        """Mark the stored track list of a job as complete, a resume no longer extracts it again"""
+        with self.lock:
+            self.conn.execute("UPDATE jobs SET extracting = 0 WHERE task_id = ?", (task_id,))
+            self.conn.commit()
+
+    def set_track_state(self, task_id: str, idx: int, state: str) -> None:
+        with self.lock:
+            self.conn.execute("UPDATE job_tracks SET state = ? WHERE task_id = ? AND idx = ?", (state, task_id, idx))
+            self.conn.commit()
+
+    def finish_job(self, task_id: str) -> None:
+        """Forget a finished job, the store only keeps what is needed to resume"""
+        with self.lock:
+            self.conn.execute("DELETE FROM job_tracks WHERE task_id = ?", (task_id,))
+            self.conn.execute("DELETE FROM jobs WHERE task_id = ?", (task_id,))
+            self.conn.commit()
+
+    def unfinished_jobs(self) -> List[Dict]:
+        """
+        Load the jobs interrupted by the last shutdown.
+
+        Returns:
+            List[Dict]: Job parameters with their tracks and per-track states, oldest first.
+                `extracting` jobs were interrupted before their whole track list was stored.
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT task_id, quality, dj_priority, subdirectory, single, video_info, progress, extracting, source FROM jobs ORDER BY created_at"
+            ).fetchall()
+
+            jobs = []
+            for task_id, quality, dj_priority, subdirectory, single, video_info, progress, extracting, source in rows:
+                tracks = self.conn.execute(
+                    "SELECT track, state FROM job_tracks WHERE task_id = ? ORDER BY idx", (task_id,)
+                ).fetchall()
+
+                jobs.append({
+                    "task_id": task_id,
+                    "quality": quality,
+                    "dj_priority": bool(dj_priority),
+                    "subdirectory": subdirectory,
+                    "single": bool(single),
+                    "video_info": json.loads(video_info) if video_info else None,
+                    "progress": json.loads(progress),
+                    "extracting": bool(extracting),
+                    "source": json.loads(source) if source else None,
+                    "tracks": [json.loads(track) for track, _ in tracks],
+                    "states": [state for _, state in tracks]
+                })
+
+        return jobs
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+def resumed_states(states: List[str]) -> Dict[int, bool]:
+    """Map the finished track indices of a stored job to their success flag"""
+    return {idx: state == TRACK_DONE for idx, state in enumerate(states) if state != TRACK_PENDING}
+
+
+def unstored_pages(pages: Iterator[List[Dict]], stored: List[Dict]) -> Iterator[List[Dict]]:
+    """Filter re-extracted pages of a resumed job down to the tracks it did not store yet (see track_keys)"""
+    known = {key for track in stored for key in track_keys(track)}
+    for tracks in pages:
+        yield [track for track in tracks if not any(key in known for key in track_keys(track))]
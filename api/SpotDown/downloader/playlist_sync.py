@@ -0,0 +1,178 @@
+# 16.10.2026
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterator, List, Optional, Set
+
+
+# Internal utils
+from SpotDown.utils.os import file_utils
+from SpotDown.helpers.string import track_keys
+from SpotDown.utils.config_json import config_manager
+
+
+# Variable
+sync_store_file = config_manager.get("SYNC", "store")
+prune_default = config_manager.get_bool("SYNC", "prune")
+AUDIO_EXTENSIONS = ("mp3", "flac")
+
+
+class PlaylistSyncStore:
+    def __init__(self, file_name: str = sync_store_file):
+        """
+        SQLite store of the synced playlists: last snapshot_id and the tracks already downloaded.
+
+        Args:
+            file_name (str): Database file, relative paths are placed next to config.json
+        """
+        if os.path.isabs(file_name):
+            self.file_path = file_name
+        else:
+            self.file_path = os.path.join(os.path.dirname(config_manager.file_path), file_name)
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.file_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS playlists (
+                playlist_id TEXT PRIMARY KEY,
+                snapshot_id TEXT,
+                subdirectory TEXT,
+                synced_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS playlist_tracks (
+                playlist_id TEXT NOT NULL,
+                track_key TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                PRIMARY KEY (playlist_id, track_key)
+            );
+        """)
+        self.conn.commit()
+        logging.info(f"PlaylistSyncStore initialized at {self.file_path}")
+
+    def get(self, playlist_id: str) -> Optional[Dict]:
+        """
+        Last sync state of a playlist.
+
+        Returns:
+            Optional[Dict]: snapshot_id, subdirectory and `tracks` (track key -> filename), None if never synced
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT snapshot_id, subdirectory FROM playlists WHERE playlist_id = ?", (playlist_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            tracks = self.conn.execute(
+                "SELECT track_key, filename FROM playlist_tracks WHERE playlist_id = ?", (playlist_id,)
+            ).fetchall()
+
+        return {"snapshot_id": row[0], "subdirectory": row[1], "tracks": dict(tracks)}
+
+    def save(self, playlist_id: str, snapshot_id: Optional[str], subdirectory: Optional[str], tracks: Dict[str, str]) -> None:
+        """
+        Replace the sync state of a playlist.
+
+        Args:
+            playlist_id (str): Spotify playlist ID
+            snapshot_id (Optional[str]): Snapshot fully synced, None forces a diff on the next sync
+            subdirectory (Optional[str]): Folder the tracks were downloaded to
+            tracks (Dict[str, str]): Track key -> filename of the tracks present locally
+        """
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO playlists VALUES (?, ?, ?, ?)",
+                (playlist_id, snapshot_id, subdirectory, time.time())
+            )
+            self.conn.execute("DELETE FROM playlist_tracks WHERE playlist_id = ?", (playlist_id,))
+            self.conn.executemany(
+                "INSERT INTO playlist_tracks VALUES (?, ?, ?)",
+                [(playlist_id, key, filename) for key, filename in tracks.items()]
+            )
+            self.conn.commit()
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+class PlaylistDiff:
+    def __init__(self, previous: Optional[Dict]):
+        """
+        Difference between the last synced state of a playlist and its current snapshot.
+
+        Args:
+            previous (Optional[Dict]): State returned by PlaylistSyncStore.get, None on first sync
+        """
+        self.known: Dict[str, str] = dict(previous["tracks"]) if previous else {}
+        self.current: Dict[str, str] = {}
+        self.complete = False
+
+    def key(self, track: Dict) -> str:
+        """
+        Key a track is synced under: the stored key it shares with a synced track
+        (see track_keys), else its most exact key.
+        """
+        keys = track_keys(track)
+        return next((key for key in keys if key in self.known), keys[0])
+
+    def added_pages(self, pages: Iterator[List[Dict]]) -> Iterator[List[Dict]]:
+        """Filter streamed playlist pages down to the tracks not synced yet"""
+        for tracks in pages:
+            added = []
+            for track in tracks:
+                key = self.key(track)
+                self.current[key] = file_utils.create_filename(track.get('artist', ''), track.get('title', ''))
+                if key not in self.known:
+                    added.append(track)
+            yield added
+        self.complete = True
+
+    def removed(self) -> List[str]:
+        """Filenames of the synced tracks no longer in the playlist, empty until the snapshot was fully read"""
+        if not self.complete:
+            return []
+        return [filename for key, filename in self.known.items() if key not in self.current]
+
+    def synced(self, downloaded: Set[str]) -> Dict[str, str]:
+        """
+        New state of the playlist after a sync.
+
+        Args:
+            downloaded (Set[str]): Keys of the new tracks downloaded successfully
+
+        Returns:
+            Dict[str, str]: Track key -> filename of the tracks present locally
+        """
+        tracks = {key: filename for key, filename in self.known.items() if not self.complete or key in self.current}
+        tracks.update({key: self.current[key] for key in downloaded if key in self.current})
+        return tracks
+
+    def fully_synced(self, tracks: Dict[str, str]) -> bool:
+        """True if every track of the snapshot is present locally"""
+        return self.complete and all(key in tracks for key in self.current)
+
+
+def prune_files(subdirectory: Optional[str], filenames: List[str]) -> int:
+    """Delete the downloaded files of tracks removed from a playlist, returns how many were deleted"""
+    music_folder = file_utils.get_music_folder()
+    if subdirectory:
+        music_folder = music_folder / file_utils.sanitize_filename(subdirectory)
+
+    removed = 0
+    for filename in filenames:
+        for ext in AUDIO_EXTENSIONS:
+            path = music_folder / f"{filename}.{ext}"
+            if path.exists():
+                try:
+                    path.unlink()
+                    removed += 1
+                    logging.info(f"Pruned removed playlist track: {path}")
+                except Exception as e:
+                    logging.warning(f"Failed to prune {path}: {e}")
+    return removed
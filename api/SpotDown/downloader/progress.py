@@ -0,0 +1,170 @@
+# 16.10.2026
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+
+# Internal utils
+from SpotDown.utils.config_json import config_manager
+
+
+# Variable
+FINAL_STATUSES = ("completed", "error", "not_found")
+finished_ttl = config_manager.get_int("PROGRESS", "finished_ttl")
+max_finished = config_manager.get_int("PROGRESS", "max_finished")
+stale_ttl = config_manager.get_int("PROGRESS", "stale_ttl")
+
+
+class ProgressRecord:
+    """Compact progress of one task, only the fields that were set are exposed"""
+    FIELDS = ("status", "percent", "filename", "total_tracks", "current_track", "completed_tracks", "active_tracks", "message", "error")
+    __slots__ = FIELDS + ("version", "finished_at")
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            setattr(self, name, None)
+        self.version = 0
+        self.finished_at: Optional[float] = None
+        self.set(**fields)
+
+    def set(self, **fields) -> bool:
+        """Assign the given fields, returns True if anything changed"""
+        changed = False
+        for name, value in fields.items():
+            if name not in self.FIELDS:
+                raise AttributeError(f"Unknown progress field '{name}'")
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                changed = True
+        return changed
+
+    def to_dict(self) -> Dict:
+        """Same shape as the old free-form progress dict"""
+        data = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        return data
+
+
+class ProgressRegistry:
+    def __init__(self, ttl: int = finished_ttl, max_finished_tasks: int = max_finished, stale: int = stale_ttl):
+        """
+        Thread-safe, memory-bounded store of the download progress exposed by /api/progress.
+
+        Every real change bumps a global version number and records it on the
+        task, so push clients can ask for "what changed since version N".
+        Finished tasks are kept for `ttl` seconds and at most
+        `max_finished_tasks` of them, the oldest are evicted first. Unfinished
+        tasks without any update for `stale` seconds (e.g. stuck after a crash)
+        are evicted too. Expired tasks are swept on reads as well as writes.
+
+        Args:
+            ttl (int): Seconds a finished task stays available
+            max_finished_tasks (int): Maximum number of finished tasks kept
+            stale (int): Seconds an unfinished task stays available after its last update
+        """
+        self._records: Dict[str, ProgressRecord] = {}
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self._unfinished: "OrderedDict[str, float]" = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+        self.ttl = ttl
+        self.max_finished_tasks = max_finished_tasks
+        self.stale = stale
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def create(self, task_id: str, **fields):
+        """Register a new task with its initial progress fields"""
+        with self._lock:
+            self._finished.pop(task_id, None)
+            self._unfinished.pop(task_id, None)
+            record = ProgressRecord(**fields)
+            self._records[task_id] = record
+            self._bump(task_id, record)
+            self._evict()
+
+    def update(self, task_id: str, **fields):
+        """Update some fields of a task, ignoring writes that change nothing"""
+        with self._lock:
+            record = self._records.get(task_id)
+            if record is None:
+                return
+
+            if record.set(**fields):
+                self._bump(task_id, record)
+                self._evict()
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        """Return the task progress, None if unknown or evicted"""
+        with self._lock:
+            self._evict()
+            record = self._records.get(task_id)
+            return record.to_dict() if record is not None else None
+
+    def changes_since(self, task_ids: Iterable[str], since: int) -> Tuple[int, Dict[str, Dict]]:
+        """
+        Collect the tasks changed after a given version.
+
+        Args:
+            task_ids (Iterable[str]): Tasks the caller is interested in
+            since (int): Last version already seen by the caller
+
+        Returns:
+            Tuple[int, Dict[str, Dict]]: Current version and the changed tasks, evicted ones are reported as not_found
+        """
+        with self._lock:
+            self._evict()
+            changed = {}
+            for task_id in task_ids:
+                record = self._records.get(task_id)
+                if record is None:
+                    changed[task_id] = {"status": "not_found"}
+                elif record.version > since:
+                    changed[task_id] = record.to_dict()
+            return self._version, changed
+
+    def _bump(self, task_id: str, record: ProgressRecord):
+        self._version += 1
+        record.version = self._version
+
+        if record.status in FINAL_STATUSES:
+            self._unfinished.pop(task_id, None)
+            if record.finished_at is None:
+                record.finished_at = time.time()
+                self._finished[task_id] = record.finished_at
+        else:
+            if record.finished_at is not None:
+                record.finished_at = None
+                self._finished.pop(task_id, None)
+            # Ordered by last update, the stalest task first
+            self._unfinished[task_id] = time.time()
+            self._unfinished.move_to_end(task_id)
+
+    def _evict(self):
+        """Drop expired finished tasks, the oldest ones above the limit and stale unfinished tasks"""
+        now = time.time()
+        expire_before = now - self.ttl
+        while self._finished:
+            task_id, finished_at = next(iter(self._finished.items()))
+            if finished_at >= expire_before and len(self._finished) <= self.max_finished_tasks:
+                break
+            del self._finished[task_id]
+            self._records.pop(task_id, None)
+
+        stale_before = now - self.stale
+        while self._unfinished:
+            task_id, updated_at = next(iter(self._unfinished.items()))
+            if updated_at >= stale_before:
+                break
+            del self._unfinished[task_id]
+            self._records.pop(task_id, None)
@@ -0,0 +1,513 @@
+# 16.10.2026
+
+import re
+import logging
+import threading
+from queue import Queue
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+# Internal utils
+from SpotDown.utils.config_json import config_manager
+from SpotDown.downloader.progress import ProgressRegistry
+from SpotDown.downloader.job_store import JobStore, TRACK_DONE, TRACK_FAILED
+from SpotDown.extractor.youtube_extractor import YouTubeExtractor
+from SpotDown.downloader.youtube_downloader import YouTubeDownloader
+from SpotDown.downloader.download_index import audio_ext, reuse_downloaded, record_downloaded
+
+
+# Variable
+resolve_workers = config_manager.get_int("SCHEDULER", "resolve_workers")
+download_workers = config_manager.get_int("SCHEDULER", "download_workers")
+postprocess_workers = config_manager.get_int("SCHEDULER", "postprocess_workers")
+queue_size = config_manager.get_int("SCHEDULER", "queue_size")
+request_workers = config_manager.get_int("SCHEDULER", "request_workers")
+parallel_tracks = config_manager.get_int("DOWNLOAD", "parallel_tracks")
+ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+
+def percent_from_hook(d: Dict) -> float:
+    """Compute the download percent from a yt-dlp progress hook dict"""
+    if d.get('total_bytes'):
+        return d['downloaded_bytes'] / d['total_bytes'] * 100
+    elif d.get('total_bytes_estimate'):
+        return d['downloaded_bytes'] / d['total_bytes_estimate'] * 100
+
+    p_str = d.get('_percent_str', '0%').replace('%', '')
+    return float(ansi_escape.sub('', p_str))
+
+
+def is_direct_url(url: Optional[str]) -> bool:
+    """Check if a track URL can be downloaded directly instead of searched on YouTube"""
+    if not url or "spotify.com" in url:
+        return False
+    return "youtube" in url or "youtu.be" in url or "soundcloud" in url
+
+
+def is_direct_track(track: Dict) -> bool:
+    """Tracks of generic playlists are flagged `direct`, any site yt-dlp extracted them from works"""
+    url = track.get('url') or track.get('original_url')
+    return bool(url) and (track.get('direct') or is_direct_url(url))
+
+
+class TrackTask:
+    """A single track travelling through the scheduler stages"""
+    def __init__(self, job: "DownloadJob", index: int, track: Dict):
+        self.job = job
+        self.index = index
+        self.track = track
+        self.video_info: Optional[Dict] = None
+        self.fetched = None
+        self.status = "starting"
+        self.percent = 0.0
+
+    @property
+    def filename(self) -> str:
+        return f"{self.track.get('artist', 'Unknown')} - {self.track.get('title', 'Unknown')}"
+
+
+class DownloadJob:
+    def __init__(self, task_id: str, tracks: List[Dict], progress: ProgressRegistry, quality: str = "320K", dj_priority: bool = False, subdirectory: Optional[str] = None, single: bool = False, video_info: Optional[Dict] = None, concurrency: int = parallel_tracks, store: Optional[JobStore] = None, finished_tracks: Optional[Dict[int, bool]] = None, extracting: bool = False, on_complete: Optional[Callable[["DownloadJob"], None]] = None, source: Optional[Dict] = None):
+        """
+        A download request (single track, playlist, album or tracklist) handled by the scheduler.
+
+        Args:
+            task_id (str): Id exposed through /api/progress
+            tracks (List[Dict]): Tracks to download
+            progress (ProgressRegistry): Registry holding the job progress
+            quality (str): Audio quality (e.g. "320K", "FLAC")
+            dj_priority (bool): Whether to prioritize DJ mixes when searching
+            subdirectory (Optional[str]): Subdirectory name for the downloads
+            single (bool): Report a single track (error status on failure) instead of a batch summary
+            video_info (Optional[Dict]): Already resolved video, skips the search for single-track jobs
+            concurrency (int): Maximum tracks of this job in flight at once
+            store (Optional[JobStore]): Store persisting the job so it can be resumed
+            finished_tracks (Optional[Dict[int, bool]]): Tracks already handled before a restart, with their success flag
+            extracting (bool): More tracks are still being extracted, the job can't complete before finish_extraction()
+            on_complete (Optional[Callable[[DownloadJob], None]]): Called once the whole job is finished
+            source (Optional[Dict]): How the job was created (spotify_url, kind, sync options), stored so that
+                a resume can restart an interrupted extraction and rebuild on_complete
+        """
+        self.task_id = task_id
+        self.tracks = tracks
+        self.progress = progress
+        self.quality = quality
+        self.dj_priority = dj_priority
+        self.subdirectory = subdirectory
+        self.single = single
+        self.video_info = video_info
+        self.concurrency = max(1, concurrency)
+        self.store = store
+        self.extracting = extracting
+        self.on_complete = on_complete
+        self.source = source
+
+        # Resumed jobs skip the tracks finished before the restart
+        self.results: Dict[int, bool] = dict(finished_tracks or {})
+        self.skip = set(self.results)
+        self.total = len(tracks)
+        self.next_index = 0
+        self.finished = len(self.skip)
+        self.success_count = sum(1 for success in (finished_tracks or {}).values() if success)
+        self.in_flight = 0
+        self.completed = False
+        self.active: Dict[int, TrackTask] = {}
+        self.resolved: Dict[int, List[Dict]] = {}
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def next_tasks(self) -> List[TrackTask]:
+        """Hand out the next tracks, as many as there are free slots below the job concurrency"""
+        tasks = []
+        with self.lock:
+            while self.in_flight < self.concurrency:
+                while self.next_index in self.skip:
+                    self.next_index += 1
+                if self.next_index >= self.total:
+                    break
+                task = TrackTask(self, self.next_index, self.tracks[self.next_index])
+                if self.single:
+                    task.video_info = self.video_info
+                self.next_index += 1
+                self.in_flight += 1
+                tasks.append(task)
+        return tasks
+
+    def add_tracks(self, tracks: List[Dict]) -> int:
+        """Append tracks extracted after the job was submitted, returns the index of the first one"""
+        with self.lock:
+            start = self.total
+            self.tracks.extend(tracks)
+            self.total = len(self.tracks)
+
+        if self.store:
+            self.store.add_tracks(self.task_id, start, tracks)
+        return start
+
+    def finish_extraction(self, error: Optional[str] = None) -> bool:
+        """Mark the track list as final, returns True if this completed the job"""
+        with self.lock:
+            self.extracting = False
+            all_done = self._take_completion()
+            if not self.single:
+                self.progress.update(self.task_id, total_tracks=self.total)
+
+        if self.store:
+            self.store.finish_extraction(self.task_id)
+
+        if error:
+            self.progress.update(self.task_id, error=error)
+
+        if all_done:
+            self.complete()
+        return all_done
+
+    def _take_completion(self) -> bool:
+        """True exactly once, when every track is finished and no more are coming. Lock must be held"""
+        if self.completed or self.extracting or self.finished < self.total:
+            return False
+        self.completed = True
+        return True
+
+    def store_resolved(self, index: int, results: List[Dict]):
+        """Keep prefetched search results for a track that was not handed out yet"""
+        with self.lock:
+            if index >= self.next_index:
+                self.resolved[index] = results
+
+    def take_resolved(self, index: int) -> Optional[List[Dict]]:
+        with self.lock:
+            return self.resolved.pop(index, None)
+
+    def track_started(self, task: TrackTask):
+        with self.lock:
+            self.active[task.index] = task
+            task.status = "searching"
+            self._publish(task)
+
+    def make_progress_hook(self, task: TrackTask) -> Callable:
+        """Build the yt-dlp progress hook for one track"""
+        def hook(d):
+            if d['status'] == 'downloading':
+                try:
+                    percent = percent_from_hook(d)
+                except Exception:
+                    return
+                with self.lock:
+                    task.status = "downloading"
+                    task.percent = percent
+                    self._publish(task)
+            elif d['status'] == 'finished':
+                with self.lock:
+                    task.status = "processing"
+                    task.percent = 100
+                    self._publish(task)
+        return hook
+
+    def _publish(self, task: TrackTask):
+        """Update the progress entry, must be called with the job lock held"""
+        # Percent is rounded so that chunk-level noise does not count as a change
+        if self.single:
+            self.progress.update(
+                self.task_id,
+                status=task.status if task.status == "processing" else "downloading",
+                percent=round(task.percent, 1)
+            )
+            return
+
+        # Several tracks can be in flight: percent is the average of the active ones,
+        # current_track counts every track handed to the pipeline so far
+        active = sorted(self.active.values(), key=lambda t: t.index)
+        self.progress.update(
+            self.task_id,
+            status="downloading",
+            current_track=min(self.next_index, self.total),
+            completed_tracks=self.finished,
+            filename=task.filename,
+            percent=round(sum(t.percent for t in active) / len(active), 1) if active else 0,
+            active_tracks=[
+                {"index": t.index + 1, "filename": t.filename, "status": t.status, "percent": round(t.percent, 1)}
+                for t in active
+            ]
+        )
+
+    def track_finished(self, task: TrackTask, success: bool, error: Optional[str] = None):
+        """Record the result of one track, returns True once the whole job is finished"""
+        with self.lock:
+            self.active.pop(task.index, None)
+            self.in_flight -= 1
+            self.finished += 1
+            self.results[task.index] = success
+            if success:
+                self.success_count += 1
+            all_done = self._take_completion()
+            if not all_done and not self.single:
+                self.progress.update(self.task_id, completed_tracks=self.finished)
+
+        if self.store:
+            self.store.set_track_state(self.task_id, task.index, TRACK_DONE if success else TRACK_FAILED)
+
+        if error:
+            self.progress.update(self.task_id, error=error)
+
+        if all_done:
+            self.complete()
+        return all_done
+
+    def complete(self):
+        if self.single:
+            if self.success_count:
+                self.progress.update(self.task_id, status="completed", percent=100)
+            else:
+                self.progress.update(self.task_id, status="error")
+        else:
+            self.progress.update(
+                self.task_id,
+                status="completed",
+                percent=100,
+                completed_tracks=self.finished,
+                active_tracks=[],
+                message=f"Descarga completada. {self.success_count}/{self.total} canciones descargadas."
+            )
+
+        if self.store:
+            self.store.finish_job(self.task_id)
+
+        if self.on_complete:
+            try:
+                self.on_complete(self)
+            except Exception as e:
+                logging.error(f"Error in completion callback of job {self.task_id}: {e}")
+        self.done.set()
+
+
+class DownloadScheduler:
+    def __init__(self, resolve_count: int = resolve_workers, download_count: int = download_workers, postprocess_count: int = postprocess_workers, max_queued: int = queue_size, request_count: int = request_workers):
+        """
+        Bounded, multi-stage pipeline for download jobs.
+
+        Each track goes through three worker pools connected by queues:
+        resolve (YouTube search), download (yt-dlp network fetch) and
+        postprocess (ffmpeg). The pool sizes cap the number of concurrent
+        yt-dlp downloads and ffmpeg processes for the whole process.
+        The tracks of large jobs that wait behind the first in-flight ones
+        are batch-searched ahead of time by a prefetch thread; its searches
+        and those of the resolve workers share the SEARCH.max_concurrent cap.
+
+        Download requests whose URL must first be resolved into a job
+        (Spotify or yt-dlp metadata) are handled by a separate request pool,
+        so callers get their task id without waiting for the extraction.
+
+        Args:
+            resolve_count (int): Number of search workers
+            download_count (int): Number of yt-dlp workers
+            postprocess_count (int): Number of ffmpeg workers
+            max_queued (int): Maximum tracks waiting between two stages
+            request_count (int): Number of workers resolving download requests into jobs
+        """
+        self.youtube_extractor = YouTubeExtractor()
+        self.downloader = YouTubeDownloader()
+
+        # Jobs feed the resolve queue, the following stages apply backpressure
+        self.resolve_queue: Queue = Queue()
+        self.download_queue: Queue = Queue(maxsize=max_queued)
+        self.postprocess_queue: Queue = Queue(maxsize=max_queued)
+
+        self.threads: List[threading.Thread] = []
+        self._start_pool("resolve", resolve_count, self.resolve_queue, self._resolve)
+        self._start_pool("download", download_count, self.download_queue, self._download)
+        self._start_pool("postprocess", postprocess_count, self.postprocess_queue, self._postprocess)
+
+        self.prefetch_queue: Queue = Queue()
+        t = threading.Thread(target=self._prefetch_worker, name="prefetch-1", daemon=True)
+        self.threads.append(t)
+        t.start()
+
+        self.request_queue: Queue = Queue()
+        for i in range(max(1, request_count)):
+            t = threading.Thread(target=self._request_worker, name=f"request-{i + 1}", daemon=True)
+            self.threads.append(t)
+            t.start()
+
+    def _start_pool(self, name: str, count: int, queue: Queue, handler: Callable):
+        for i in range(max(1, count)):
+            t = threading.Thread(target=self._worker, args=(queue, handler), name=f"{name}-{i + 1}", daemon=True)
+            self.threads.append(t)
+            t.start()
+
+    def submit(self, job: DownloadJob, pages: Optional[Iterator[List[Dict]]] = None):
+        """
+        Queue a job, at most job.concurrency of its tracks are in the pipeline at once.
+
+        Args:
+            job (DownloadJob): Job to run
+            pages (Optional[Iterator[List[Dict]]]): Remaining tracks of a job created with extracting=True,
+                consumed by a background thread so downloads start before the extraction ends
+        """
+        logging.info(f"Scheduling job {job.task_id} with {job.total} track(s){' so far' if job.extracting else ''}, {job.concurrency} in parallel")
+        if job.store:
+            job.store.save_job(job)
+
+        if pages is not None:
+            t = threading.Thread(target=self._consume_pages, args=(job, pages), name=f"extract-{job.task_id[:8]}", daemon=True)
+            t.start()
+
+        with job.lock:
+            all_done = job._take_completion()
+        if all_done:
+            job.complete()
+            return
+
+        self._feed(job)
+        self._queue_prefetch(job, 0)
+
+    def submit_request(self, task_id: str, progress: ProgressRegistry, resolve: Callable[[], None]):
+        """
+        Queue a download request whose job is not known yet.
+
+        Args:
+            task_id (str): Id already returned to the client, its progress entry must exist
+            progress (ProgressRegistry): Registry holding the progress entry, set to error if `resolve` raises
+            resolve (Callable[[], None]): Extracts the URL metadata and submits the resulting job
+        """
+        self.request_queue.put((task_id, progress, resolve))
+
+    def _request_worker(self):
+        while True:
+            task_id, progress, resolve = self.request_queue.get()
+            try:
+                resolve()
+            except Exception as e:
+                logging.error(f"Error resolving download request {task_id}: {e}")
+                progress.update(task_id, status="error", error=str(e), message=str(e))
+            finally:
+                self.request_queue.task_done()
+
+    def _consume_pages(self, job: DownloadJob, pages: Iterator[List[Dict]]):
+        error = None
+        try:
+            for tracks in pages:
+                if tracks:
+                    start = job.add_tracks(tracks)
+                    self._feed(job)
+                    self._queue_prefetch(job, start)
+        except Exception as e:
+            logging.error(f"Error extracting tracks of job {job.task_id}: {e}")
+            error = str(e)
+        finally:
+            job.finish_extraction(error)
+
+    def _queue_prefetch(self, job: DownloadJob, start: int):
+        """Batch-search the tracks from `start` on if more of them are waiting than the job runs at once"""
+        if not job.single and job.total - max(start, job.next_index) > job.concurrency:
+            self.prefetch_queue.put((job, start, job.total))
+
+    def _feed(self, job: DownloadJob):
+        for task in job.next_tasks():
+            self.resolve_queue.put(task)
+
+    def _worker(self, queue: Queue, handler: Callable):
+        while True:
+            task = queue.get()
+            try:
+                handler(task)
+            except Exception as e:
+                logging.error(f"Error processing {task.track.get('title')}: {e}")
+                self._finish(task, False, str(e))
+            finally:
+                queue.task_done()
+
+    def _prefetch_worker(self):
+        while True:
+            job, start, end = self.prefetch_queue.get()
+            try:
+                self._prefetch(job, start, end)
+            except Exception as e:
+                logging.error(f"Error prefetching searches of job {job.task_id}: {e}")
+            finally:
+                self.prefetch_queue.task_done()
+
+    def _prefetch(self, job: DownloadJob, start: int, end: int):
+        """Batch-search the tracks of a range not handed out yet, so the resolve stage finds them ready"""
+        with job.lock:
+            start = max(start, job.next_index)
+
+        indices = [
+            i for i in range(start, end)
+            if i not in job.skip and not is_direct_track(job.tracks[i])
+        ]
+        if not indices:
+            return
+
+        logging.info(f"Prefetching {len(indices)} searches for job {job.task_id}")
+        for position, results in self.youtube_extractor.search_many([job.tracks[i] for i in indices], job.dj_priority):
+            if job.done.is_set():
+                break
+            # Empty results are not kept, the resolve stage retries the search itself
+            if results:
+                job.store_resolved(indices[position], results)
+
+    def _finish(self, task: TrackTask, success: bool, error: Optional[str] = None):
+        task.job.track_finished(task, success, error)
+        self._feed(task.job)
+
+    def _resolve(self, task: TrackTask):
+        track = task.track
+        task.job.track_started(task)
+
+        if task.video_info:
+            self.download_queue.put(task)
+            return
+
+        # Determine if we need to search on YouTube or if we have a direct URL
+        direct_url = track.get('url') or track.get('original_url')
+
+        if is_direct_track(track):
+            # Generic playlist track (SoundCloud/YouTube) - Direct Download
+            task.video_info = {
+                'url': direct_url,
+                'title': track.get('title'),
+                'uploader': track.get('artist'),
+                'webpage_url': direct_url
+            }
+        else:
+            # Ensure cover_url is present for the downloader
+            track['cover_url'] = track.get('cover_art') or track.get('cover_url')
+
+            # Same recording (ISRC or Spotify ID) already downloaded, possibly for another playlist
+            if reuse_downloaded(track, audio_ext(task.job.quality), task.job.subdirectory):
+                self._finish(task, True)
+                return
+
+            youtube_results = task.job.take_resolved(task.index)
+            if youtube_results is None:
+                query = f"{track['artist']} {track['title']}"
+                youtube_results = self.youtube_extractor.search(query, track, task.job.dj_priority)
+            if not youtube_results:
+                self._finish(task, False)
+                return
+
+            best_match = youtube_results[0]
+            task.video_info = best_match
+
+            # Get cover art from YouTube thumbnail
+            if not track.get('cover_url') and best_match.get('thumbnail'):
+                track['cover_url'] = best_match.get('thumbnail')
+
+        self.download_queue.put(task)
+
+    def _download(self, task: TrackTask):
+        job = task.job
+        task.fetched = self.downloader.fetch(task.video_info, task.track, job.quality, job.make_progress_hook(task), job.subdirectory)
+        if not task.fetched:
+            self._finish(task, False)
+            return
+
+        self.postprocess_queue.put(task)
+
+    def _postprocess(self, task: TrackTask):
+        fetched = task.fetched
+        success = self.downloader.postprocess(fetched)
+        if success:
+            record_downloaded(task.track, fetched.music_folder / f"{fetched.filename}.{fetched.ext}")
+        self._finish(task, success)
@@ -0,0 +1,187 @@
+# 16.10.2026
+
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# External imports
+import yt_dlp
+
+
+# Internal utils
+from SpotDown.utils.config_json import config_manager
+from SpotDown.downloader.cookie_jar import CookieJarRef, apply_cookies
+
+
+# Variable
+max_idle_sessions = config_manager.get_int("YTDLP", "max_idle_sessions")
+
+_pool: Optional["YDLSessionPool"] = None
+_pool_lock = threading.Lock()
+
+
+class YDLSession:
+    def __init__(self, options: Dict[str, Any], cookies: Optional[CookieJarRef] = None):
+        """
+        Long-lived YoutubeDL instance, used by one thread at a time.
+
+        Extractors, the HTTP handlers and the cookie jar are initialized once. The
+        output template and the progress hook change per call: yt-dlp calls a single
+        dispatcher hook registered at creation, which forwards to `progress_hook`.
+        """
+        self.ydl = yt_dlp.YoutubeDL(options)
+        self.progress_hook: Optional[Callable] = None
+        self.ydl.add_progress_hook(self._dispatch)
+        if cookies is not None:
+            apply_cookies(self.ydl, cookies.jar)
+
+    def _dispatch(self, d: Dict):
+        if self.progress_hook:
+            self.progress_hook(d)
+
+    def prepare(self, outtmpl: Optional[str], progress_hook: Optional[Callable]):
+        if outtmpl:
+            self.ydl.params['outtmpl'] = {'default': outtmpl}
+        self.progress_hook = progress_hook
+
+    def close(self):
+        try:
+            self.ydl.close()
+        except Exception as e:
+            logging.warning(f"Error closing yt-dlp session: {e}")
+
+
+def profile_key(options: Dict[str, Any], cookies: Optional[CookieJarRef]) -> Tuple:
+    """
+    Sessions are shared between calls with the same options and the same cookie jar,
+    identified by its strategy and generation: a reloaded jar never reuses sessions of the old one.
+    """
+    cookie_key = (cookies.strategy, cookies.generation) if cookies else None
+    return tuple(sorted((key, repr(value)) for key, value in options.items())) + (cookie_key,)
+
+
+class YDLSessionPool:
+    def __init__(self, max_idle: int = max_idle_sessions):
+        """
+        Idle yt-dlp sessions keyed by option profile (format, flat extraction, cookies...).
+
+        A session is checked out by one worker for the duration of a call and put
+        back afterwards, at most `max_idle` sessions are kept across all profiles.
+
+        Args:
+            max_idle (int): Idle sessions kept, the least recently used are closed first
+        """
+        self.max_idle = max_idle
+        self.lock = threading.Lock()
+        self.idle: "OrderedDict[Tuple, List[YDLSession]]" = OrderedDict()
+        self.idle_count = 0
+        self.generations: Dict[str, int] = {}
+
+    @contextmanager
+    def session(self, options: Dict[str, Any], cookies: Optional[CookieJarRef] = None, outtmpl: Optional[str] = None, progress_hook: Optional[Callable] = None) -> Iterator[yt_dlp.YoutubeDL]:
+        """
+        Borrow a YoutubeDL for one call.
+
+        Args:
+            options (Dict[str, Any]): yt-dlp options of the profile, without outtmpl and hooks
+            cookies (Optional[CookieJarRef]): Cookies copied into new sessions of the profile, idle
+                sessions built with an older generation of the same strategy are closed
+            outtmpl (Optional[str]): Output template of this call
+            progress_hook (Optional[Callable]): Progress hook of this call
+
+        Yields:
+            yt_dlp.YoutubeDL: Session ready to use, discarded instead of reused if the call raises
+        """
+        if cookies is not None:
+            self._drop_stale(cookies)
+
+        key = profile_key(options, cookies)
+        session = self._take(key) or YDLSession(options, cookies)
+        session.prepare(outtmpl, progress_hook)
+
+        try:
+            yield session.ydl
+        except BaseException:
+            session.close()
+            raise
+
+        session.prepare(None, None)
+        self._put(key, session)
+
+    def _take(self, key: Tuple) -> Optional[YDLSession]:
+        with self.lock:
+            sessions = self.idle.get(key)
+            if not sessions:
+                return None
+
+            session = sessions.pop()
+            self.idle_count -= 1
+            if not sessions:
+                del self.idle[key]
+            return session
+
+    def _drop_stale(self, cookies: CookieJarRef):
+        """Close the idle sessions built with an invalidated jar of the strategy"""
+        stale = []
+        with self.lock:
+            if cookies.generation <= self.generations.get(cookies.strategy, 0):
+                return
+            self.generations[cookies.strategy] = cookies.generation
+
+            for key in [key for key in self.idle if self._is_stale(key)]:
+                sessions = self.idle.pop(key)
+                self.idle_count -= len(sessions)
+                stale.extend(sessions)
+
+        for session in stale:
+            session.close()
+
+    def _is_stale(self, key: Tuple) -> bool:
+        """True if the session profile uses an invalidated cookie jar. Lock must be held"""
+        cookie_key = key[-1]
+        return cookie_key is not None and cookie_key[1] < self.generations.get(cookie_key[0], 0)
+
+    def _put(self, key: Tuple, session: YDLSession):
+        evicted = []
+        with self.lock:
+            if self._is_stale(key):
+                # The jar was invalidated while the session was checked out
+                evicted.append(session)
+            else:
+                self.idle.setdefault(key, []).append(session)
+                self.idle.move_to_end(key)
+                self.idle_count += 1
+
+            while self.idle_count > self.max_idle:
+                oldest_key, sessions = next(iter(self.idle.items()))
+                evicted.append(sessions.pop(0))
+                self.idle_count -= 1
+                if not sessions:
+                    del self.idle[oldest_key]
+
+        for old in evicted:
+            old.close()
+
+    def close(self):
+        with self.lock:
+            sessions = [session for group in self.idle.values() for session in group]
+            self.idle.clear()
+            self.idle_count = 0
+
+        for session in sessions:
+            session.close()
+
+
+def get_ydl_pool() -> YDLSessionPool:
+    """Process-wide pool of yt-dlp sessions"""
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = YDLSessionPool()
+
+    return _pool
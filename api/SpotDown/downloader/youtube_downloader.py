@@ -7,14 +7,17 @@ import traceback
 from pathlib import Path
 
 # External imports
-import httpx
-import yt_dlp
 from rich.console import Console
 
 # Internal utils
 from SpotDown.utils.os import file_utils
 from SpotDown.utils.config_json import config_manager
-from SpotDown.helpers.ffmpeg import convert_to_jpg_with_ffmpeg, add_cover_art
+from SpotDown.utils.cover_cache import get_cover_cache
+from SpotDown.downloader.cookie_jar import get_cookie_jars
+from SpotDown.downloader.ydl_pool import get_ydl_pool
+from SpotDown.downloader.info_cache import get_info_cache
+from SpotDown.downloader.download_index import record_downloaded
+from SpotDown.helpers.ffmpeg import transcode_audio
 
 # Variable
 console = Console()
@@ -22,10 +25,31 @@ allow_metadata = config_manager.get("DOWNLOAD", "allow_metadata")
 auto_first = config_manager.get("DOWNLOAD", "auto_first")
 
 
+class FetchedAudio:
+    """Raw audio downloaded by yt-dlp, waiting for the ffmpeg postprocess step"""
+    def __init__(self, source_path: str, info: Dict, music_folder: Path, filename: str, quality: str, cover_path: Optional[Path] = None, tags: Optional[Dict[str, str]] = None):
+        self.source_path = source_path
+        self.info = info
+        self.tags = tags or {}
+        self.music_folder = music_folder
+        self.filename = filename
+        self.quality = quality
+        self.cover_path = cover_path
+
+    @property
+    def is_flac(self) -> bool:
+        return self.quality.upper() == "FLAC"
+
+    @property
+    def ext(self) -> str:
+        return "flac" if self.is_flac else "mp3"
+
+
 class YouTubeDownloader:
     def download(self, video_info: Dict, spotify_info: Dict, quality: str = "320K", progress_hook: Optional[Callable] = None, subdirectory: Optional[str] = None) -> bool:
         """
-        Download YouTube video as mp3 using yt_dlp library
+        Download YouTube video as mp3 using yt_dlp library.
+        The file is recorded in the download index under the ISRC/Spotify ID of the track.
 
         Args:
             video_info (Dict): YouTube video info
@@ -37,9 +61,33 @@ class YouTubeDownloader:
         Returns:
             bool: True if download succeeded
         """
+        fetched = self.fetch(video_info, spotify_info, quality, progress_hook, subdirectory)
+        if not fetched:
+            return False
+
+        success = self.postprocess(fetched)
+        if success:
+            record_downloaded(spotify_info, fetched.music_folder / f"{fetched.filename}.{fetched.ext}")
+        return success
+
+    def fetch(self, video_info: Dict, spotify_info: Dict, quality: str = "320K", progress_hook: Optional[Callable] = None, subdirectory: Optional[str] = None) -> Optional[FetchedAudio]:
+        """
+        Network stage: download the best audio stream and the cover image, without running ffmpeg.
+        The cover stays pinned in the cover cache until postprocess() is called with the result.
+
+        Args:
+            video_info (Dict): YouTube video info
+            spotify_info (Dict): Spotify track info
+            quality (str): Audio quality (e.g. "320K", "192K")
+            progress_hook (Callable): Function to call with progress updates
+            subdirectory (Optional[str]): Subdirectory name for the download
+
+        Returns:
+            Optional[FetchedAudio]: Downloaded source audio, None on failure
+        """
         try:
             music_folder = file_utils.get_music_folder()
-            
+
             if subdirectory:
                 clean_subdir = file_utils.sanitize_filename(subdirectory)
                 music_folder = music_folder / clean_subdir
@@ -52,191 +100,135 @@ class YouTubeDownloader:
             )
             # yt-dlp template for filename
             output_template = str(music_folder / f"{filename}.%(ext)s")
-            
-            logging.info(f"Start download: {video_info.get('url')} as {output_template}")
-
-            # Download cover image if available
-            cover_path = None
-            if allow_metadata:
-                cover_url = spotify_info.get('cover_url')
-                if cover_url:
-                    try:
-                        cover_path = music_folder / f"{filename}_cover.jpg"
-                        with httpx.Client(timeout=10) as client:
-                            resp = client.get(cover_url)
-                            if resp.status_code == 200:
-                                
-                                # Check if it's WebP or needs conversion
-                                content_type = resp.headers.get("content-type", "").lower()
-                                is_webp = content_type.endswith("webp") or cover_url.lower().endswith(".webp")
-                                
-                                if is_webp or not content_type.startswith("image/jpeg"):
-                                    
-                                    # Use ffmpeg for conversion to JPG
-                                    if convert_to_jpg_with_ffmpeg(resp.content, cover_path):
-                                        if not auto_first:
-                                            console.print(f"[blue]Downloaded and converted thumbnail: {cover_path}[/blue]")
-                                        logging.info(f"Downloaded and converted thumbnail: {cover_path}")
-                                    else:
-                                        cover_path = None
-                                        logging.warning("Failed to convert image with ffmpeg")
-
-                                else:
-                                    # Direct save for JPG images
-                                    with open(cover_path, 'wb') as f:
-                                        f.write(resp.content)
-
-                                    if not auto_first:
-                                        console.print(f"[blue]Downloaded thumbnail: {cover_path}[/blue]")
-                                    logging.info(f"Downloaded thumbnail: {cover_path}")
-
-                            else:
-                                cover_path = None
-                                logging.warning(f"Failed to download cover image, status code: {resp.status_code}")
-                                
-                    except Exception as e:
-                        if not auto_first:
-                            console.print(f"[yellow]Unable to download cover: {e}[/yellow]")
-                        logging.error(f"Unable to download cover: {e}")
-                        cover_path = None
-
-            # Configure yt-dlp options
-            is_flac = quality.upper() == "FLAC"
-            ext = "flac" if is_flac else "mp3"
-            
-            # Update output template with correct extension
-            output_template = str(music_folder / f"{filename}.%(ext)s")
-
-            postprocessors = [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': ext,
-            }]
 
-            if not is_flac:
-                postprocessors[0]['preferredquality'] = quality.replace('K', '')
+            logging.info(f"Start download: {video_info.get('url')} as {output_template}")
 
+            # Session profile, the output template and progress hook are set per call
             ydl_opts = {
                 'format': 'bestaudio/best',
-                'outtmpl': output_template,
-                'postprocessors': postprocessors,
                 'ffmpeg_location': file_utils.ffmpeg_path,
                 'quiet': False, # Enable output for debugging
                 'no_warnings': False,
                 'noplaylist': True,
                 'verbose': True, # Enable verbose logging
-                # 'cookiesfrombrowser' will be set in the loop below
+                # cookies are copied from the cached jars in the loop below
             }
-            
+
             logging.info(f"DEBUG: ffmpeg_path: {file_utils.ffmpeg_path}")
-            # logging.info(f"DEBUG: ydl_opts: {ydl_opts}")
-
-            if allow_metadata and not is_flac:
-                ydl_opts['writethumbnail'] = False 
-                ydl_opts['postprocessors'].append({'key': 'FFmpegMetadata', 'add_metadata': True})
-            
-            # Add progress hook if provided
-            if progress_hook:
-                ydl_opts['progress_hooks'] = [progress_hook]
-
-            # Check for cookies.txt in current directory
-            cookies_file = Path("cookies.txt")
-            if not cookies_file.exists():
-                # Check in parent directory (useful for dev env)
-                cookies_file = Path("..") / "cookies.txt"
-            
-            if cookies_file.exists():
-                logging.info(f"Found cookies.txt at {cookies_file.resolve()}")
-                ydl_opts['cookiefile'] = str(cookies_file.resolve())
-                
-                # Run download with cookiefile
-                try:
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([video_info['url']])
-                    
-                    if not auto_first:
-                        console.print("[red]Download completed![/red]")
-                    logging.info(f"Download completed using cookies.txt")
-                    
-                    # Manually embed cover art if available (duplicated logic, could be refactored)
-                    final_filename = f"{filename}.{ext}"
-                    downloaded_file = music_folder / final_filename
-                    if cover_path and cover_path.exists() and downloaded_file.exists():
-                         try:
-                            if add_cover_art(downloaded_file, cover_path):
-                                logging.info(f"Embedded cover art into {downloaded_file}")
-                            else:
-                                logging.warning("Failed to embed cover art")
-                            cover_path.unlink()
-                         except Exception as ex:
-                            logging.warning(f"Failed to process cover art: {ex}")
-                    
-                    return True
 
-                except Exception as e:
-                    logging.error(f"Error downloading with cookies.txt: {e}")
-                    # Fallback to browser if cookies.txt fails? Maybe not, usually implies bad cookies.
-                    # But let's allow fallback just in case.
-                    logging.info("Falling back to browser cookies...")
-
-            # Run download with browser fallback
-            browsers_to_try = ['chrome', 'edge']
-            download_success = False
+            # Cookie strategies from the session cache, the last one that worked first
+            cookie_jars = get_cookie_jars()
+            info = None
             last_error = None
 
-            for browser in browsers_to_try:
+            # Info dict already extracted for this URL (e.g. by /api/download): only the download remains
+            extracted = get_info_cache().get(video_info['url'])
+
+            strategies = cookie_jars.strategies()
+            while strategies:
+                strategy = strategies.pop(0)
+                cookies = cookie_jars.jar(strategy)
+                if cookies is None:
+                    continue
+
                 try:
-                    logging.info(f"Attempting download using cookies from: {browser}")
-                    current_opts = ydl_opts.copy()
-                    current_opts['cookiesfrombrowser'] = (browser, )
-                    
-                    with yt_dlp.YoutubeDL(current_opts) as ydl:
-                        ydl.download([video_info['url']])
-                    
-                    download_success = True
-                    logging.info(f"Download attempt with {browser} succeeded.")
+                    logging.info(f"Attempting download using cookies from: {strategy}")
+                    with get_ydl_pool().session(ydl_opts, cookies, output_template, progress_hook) as ydl:
+                        if extracted:
+                            info = ydl.process_ie_result(extracted, download=True)
+                        else:
+                            info = ydl.extract_info(video_info['url'], download=True)
+
+                    logging.info(f"Download attempt with {strategy} succeeded.")
+                    cookie_jars.succeeded(strategy)
                     break # Success, exit loop
                 except Exception as e:
-                    logging.warning(f"Download attempt with {browser} failed: {e}")
+                    logging.warning(f"Download attempt with {strategy} failed: {e}")
                     last_error = e
-            
-            if not download_success:
+                    if extracted:
+                        # Stale format URLs are not a cookie problem, extract again with the same strategy
+                        get_info_cache().delete(video_info['url'])
+                        extracted = None
+                        strategies.insert(0, strategy)
+                    else:
+                        cookie_jars.failed(strategy, e)
+
+            if info is None:
                 logging.error(f"All download attempts failed. Last error: {last_error}")
-                return False
+                return None
+
+            # Locate the raw audio file written by yt-dlp
+            requested = (info.get('requested_downloads') or [{}])[0]
+            source_path = requested.get('filepath')
+            if not source_path or not os.path.exists(source_path):
+                logging.error(f"Download apparently succeeded but source file not found: {source_path}")
+                return None
+
+            pp_info = dict(info)
+            pp_info.update(requested)
+
+            # Cover image from the shared cache, downloaded once per album image.
+            # It stays pinned in the cache until postprocess() embedded it
+            cover_path = None
+            if allow_metadata and spotify_info.get('cover_url'):
+                cover_path = get_cover_cache().get(spotify_info['cover_url'])
+
+            return FetchedAudio(source_path, pp_info, music_folder, filename, quality, cover_path, self._tags(pp_info, spotify_info))
 
-            # Check if file exists
-            final_filename = f"{filename}.{ext}"
-            downloaded_file = music_folder / final_filename
-            
-            if downloaded_file.exists():
+        except Exception as e:
+            if not auto_first:
+                console.print(f"[red]Error during download: {e}[/red]")
+            logging.error(f"Error during download: {e}")
+            traceback.print_exc()
+            return None
+
+    def postprocess(self, fetched: FetchedAudio) -> bool:
+        """
+        CPU stage: transcode the fetched audio with ffmpeg, add metadata and embed the cover.
+
+        Args:
+            fetched (FetchedAudio): Result of a previous fetch()
+
+        Returns:
+            bool: True if the final file was produced
+        """
+        downloaded_file = fetched.music_folder / f"{fetched.filename}.{fetched.ext}"
+        source_path = Path(fetched.source_path)
+        try:
+            # ffmpeg cannot read and write the same file (e.g. an mp3 source for an mp3 output)
+            if source_path == downloaded_file:
+                source_path = source_path.rename(source_path.with_name(f"{fetched.filename}.source{source_path.suffix}"))
+
+            # Transcode, tags and cover in one ffmpeg run: the final file is written once
+            tags = fetched.tags if allow_metadata else None
+            if transcode_audio(source_path, downloaded_file, fetched.quality, tags, fetched.cover_path):
+                source_path.unlink(missing_ok=True)
                 if not auto_first:
                     console.print("[red]Download completed![/red]")
                 logging.info(f"Download completed: {downloaded_file}")
-
-                # Manually embed cover art if available
-                if cover_path and cover_path.exists():
-                    try:
-                        if add_cover_art(downloaded_file, cover_path):
-                            logging.info(f"Embedded cover art into {downloaded_file}")
-                        else:
-                            logging.warning("Failed to embed cover art")
-                            
-                        # Cleanup cover file
-                        cover_path.unlink()
-                        logging.info(f"Removed temporary cover file: {cover_path}")
-                    except Exception as ex:
-                        logging.warning(f"Failed to process cover art: {ex}")
-
                 return True
             else:
-                logging.error(f"Download apparently succeeded but file not found: {downloaded_file}")
-                logging.error(f"Directory contents of {music_folder}:")
-                for f in music_folder.iterdir():
-                    logging.error(f" - {f.name}")
+                logging.error(f"Postprocess failed, source kept at {source_path}")
                 return False
 
         except Exception as e:
             if not auto_first:
-                console.print(f"[red]Error during download: {e}[/red]")
-            logging.error(f"Error during download: {e}")
+                console.print(f"[red]Error during postprocess: {e}[/red]")
+            logging.error(f"Error during postprocess: {e}")
             traceback.print_exc()
-            return False
\ No newline at end of file
+            return False
+
+        finally:
+            if fetched.cover_path:
+                get_cover_cache().release(fetched.cover_path)
+
+    def _tags(self, info: Dict, spotify_info: Dict) -> Dict[str, str]:
+        """Tags of the final file: Spotify metadata first, the yt-dlp info of the video otherwise"""
+        upload_date = info.get('upload_date') or ''
+        return {
+            'title': spotify_info.get('title') or info.get('track') or info.get('title'),
+            'artist': spotify_info.get('artist') or info.get('artist') or info.get('uploader'),
+            'album': spotify_info.get('album') or info.get('album'),
+            'date': spotify_info.get('year') or upload_date[:4],
+            'comment': info.get('webpage_url'),
+        }
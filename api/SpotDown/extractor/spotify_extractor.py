@@ -4,21 +4,47 @@ import os
 import re
 import sys
 import json
+import hashlib
 import logging
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
 from dotenv import load_dotenv
 
 
 # External library
 import spotipy
+import requests
 from spotipy.oauth2 import SpotifyClientCredentials
+from spotipy.cache_handler import CacheFileHandler
 from rich.console import Console
 from rich.progress import Progress
 
 
+# Internal utils
+from SpotDown.utils.cache import DiskCache
+from SpotDown.extractor.spotify_requests import get_request_layer, max_concurrency, SpotifyRateLimited
+from SpotDown.helpers.string import track_keys
+from SpotDown.utils.config_json import config_manager
+
+
 # Variable
 console = Console()
 load_dotenv()
+artist_groups = config_manager.get("SPOTIFY", "artist_groups")
+token_cache = config_manager.get("SPOTIFY", "token_cache")
+
+track_ttl = config_manager.get_int("CACHE", "spotify_track_ttl")
+album_ttl = config_manager.get_int("CACHE", "spotify_album_ttl")
+playlist_ttl = config_manager.get_int("CACHE", "spotify_playlist_ttl")
+snapshot_ttl = config_manager.get_int("CACHE", "spotify_snapshot_ttl")
+metadata_cache_size = config_manager.get_int("CACHE", "spotify_max_entries")
+
+_metadata_cache: Optional[DiskCache] = None
+_metadata_cache_lock = threading.Lock()
+_client: Optional[spotipy.Spotify] = None
+_client_credentials: Optional[tuple] = None
+_client_lock = threading.Lock()
 
 
 def extract_track_id(spotify_url):
@@ -57,20 +83,177 @@ def extract_album_id(spotify_url):
     return None
 
 
-class SpotifyExtractor:
-    def __init__(self):
-        client_id = os.getenv("SPOTIPY_CLIENT_ID")
-        client_secret = os.getenv("SPOTIPY_CLIENT_SECRET")
+def extract_artist_id(spotify_url):
+    patterns = [
+        r'artist/([a-zA-Z0-9]{22})',
+        r'spotify:artist:([a-zA-Z0-9]{22})'
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, spotify_url)
+        if match:
+            return match.group(1)
+    return None
 
-        if not client_id or not client_secret:
-            raise ValueError("Faltan las credenciales de Spotify. Configúralas en la web.")
 
-        try:
-            self.sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
+def get_metadata_cache() -> DiskCache:
+    """
+    Process-wide cache of Spotify metadata, opened on first use.
+
+    Keys: track:<id>, album:<id>, playlist:<id> (title, cover and current snapshot_id,
+    short TTL) and playlist_tracks:<id>:<snapshot_id> (track list of that snapshot).
+    """
+    global _metadata_cache
+
+    if _metadata_cache is None:
+        with _metadata_cache_lock:
+            if _metadata_cache is None:
+                _metadata_cache = DiskCache("spotify", album_ttl, metadata_cache_size)
+
+    return _metadata_cache
+
+
+def cache_get(key: str) -> Optional[Dict]:
+    try:
+        return get_metadata_cache().get(key)
+    except Exception as e:
+        logging.warning(f"Spotify metadata cache unavailable: {e}")
+        return None
+
+
+def cache_set(key: str, value, ttl: int):
+    try:
+        get_metadata_cache().set(key, value, ttl)
+    except Exception as e:
+        logging.warning(f"Unable to cache Spotify metadata: {e}")
+
+
+def cache_pages(pages: Iterator[List[Dict]], key: str, ttl: int, value: Callable[[List[Dict]], Dict]) -> Iterator[List[Dict]]:
+    """Pass pages through, caching value(all tracks) under `key` once the last page was consumed"""
+    tracks = []
+    for page in pages:
+        tracks.extend(page)
+        yield page
+    cache_set(key, value(tracks), ttl)
+
+
+def token_cache_path(client_id: str) -> str:
+    """Token cache file of a client id, next to config.json so it survives restarts"""
+    base, ext = os.path.splitext(token_cache)
+    file_name = f"{base}_{hashlib.sha1(client_id.encode()).hexdigest()[:12]}{ext}"
+    if os.path.isabs(file_name):
+        return file_name
+    return os.path.join(os.path.dirname(config_manager.file_path), file_name)
+
+
+def get_spotify_client() -> spotipy.Spotify:
+    """
+    Return the process-wide Spotify client.
+
+    The client and its HTTP session are shared by every extractor and rebuilt
+    only when the credentials in the environment change (e.g. from /api/settings).
+    The access token is cached on disk per client id, so restarts skip the token request.
+
+    Returns:
+        spotipy.Spotify: Shared client
+    """
+    global _client, _client_credentials
+
+    client_id = os.getenv("SPOTIPY_CLIENT_ID")
+    client_secret = os.getenv("SPOTIPY_CLIENT_SECRET")
+
+    if not client_id or not client_secret:
+        raise ValueError("Faltan las credenciales de Spotify. Configúralas en la web.")
+
+    credentials = (client_id, client_secret)
+    with _client_lock:
+        if _client is None or _client_credentials != credentials:
+            _client = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
                 client_id=client_id,
-                client_secret=client_secret
-            ))
+                client_secret=client_secret,
+                cache_handler=CacheFileHandler(cache_path=token_cache_path(client_id))
+            # Plain session without urllib3 retries: spotipy's own Retry sleeps on 429 + Retry-After,
+            # outside the token bucket and max_retry_wait. SpotifyRequests retries instead.
+            ), requests_session=requests.Session())
+            _client_credentials = credentials
+            logging.info("Shared Spotify client created")
+
+        return _client
+
+
+def reset_spotify_client():
+    """Drop the shared client, the next extractor builds a new one"""
+    global _client, _client_credentials
+
+    with _client_lock:
+        _client = None
+        _client_credentials = None
+
+
+def call_with_backoff(func: Callable, *args, **kwargs):
+    """
+    Call a spotipy method through the shared request layer: token bucket rate limit,
+    adaptive concurrency and retries honouring Retry-After (see spotify_requests).
+    """
+    return get_request_layer().call(func, *args, **kwargs)
+
+
+def fetch_ordered(func: Callable, arguments: List) -> Iterator:
+    """
+    Call `func` once per argument through the request layer, which decides how many run at once.
+
+    Results are yielded in the order of `arguments` while later calls are still in flight.
+    """
+    if not arguments:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=min(max_concurrency, len(arguments)), thread_name_prefix="spotify-page")
+    try:
+        futures = [executor.submit(call_with_backoff, func, argument) for argument in arguments]
+        for future in futures:
+            yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_pages(first_page: Dict, fetch_page: Callable[[int], Dict], limit: int) -> Iterator[List[Dict]]:
+    """
+    Yield the items of a paginated Spotify listing, page by page and in order.
+
+    The first page usually comes embedded in the parent object (playlist or album),
+    the remaining offsets are fetched concurrently through the request layer.
+
+    Args:
+        first_page (Dict): Paging object already returned by the parent request
+        fetch_page (Callable[[int], Dict]): Fetches the paging object at a given offset
+        limit (int): Page size used for the remaining offsets
+
+    Yields:
+        List[Dict]: Items of each page
+    """
+    total = first_page['total']
+    items = first_page['items']
+    yield items
+
+    if not items:
+        return
+
+    for page in fetch_ordered(fetch_page, list(range(len(items), total, limit))):
+        if not page['items']:
+            break
+        yield page['items']
+
+
+def chunked(items: List, size: int) -> List[List]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class SpotifyExtractor:
+    def __init__(self):
+        try:
+            self.sp = get_spotify_client()
             logging.info("SpotifyExtractor initialized")
+        except ValueError:
+            raise
         except Exception as e:
             logging.error(f"Spotify init error: {e}")
             raise ValueError("Credenciales de Spotify inválidas. Verifícalas en Configuración.")
@@ -88,8 +271,13 @@ class SpotifyExtractor:
             logging.error("Invalid Spotify URL")
             return None
 
+        cached = cache_get(f"track:{track_id}")
+        if cached:
+            logging.info(f"Spotify cache hit for track {track_id}")
+            return dict(cached, url=spotify_url, original_url=spotify_url)
+
         try:
-            track = self.sp.track(track_id)
+            track = call_with_backoff(self.sp.track, track_id)
             
             # Extract album info
             album = track['album']
@@ -107,6 +295,8 @@ class SpotifyExtractor:
             artists = [artist['name'] for artist in track['artists']]
 
             track_info = {
+                "spotify_id": track.get('id'),
+                "isrc": (track.get('external_ids') or {}).get('isrc'),
                 "title": track['name'],
                 "artist": ', '.join(artists),
                 "album": album['name'],
@@ -116,167 +306,401 @@ class SpotifyExtractor:
                 "url": spotify_url,
                 "original_url": spotify_url
             }
+            cache_set(f"track:{track_id}", {k: v for k, v in track_info.items() if k not in ("url", "original_url")}, track_ttl)
             return track_info
 
+        except SpotifyRateLimited:
+            raise
         except Exception as e:
             logging.error(f"Error extracting track info: {e}")
             return None
 
-    def extract_playlist_tracks(self, playlist_url: str) -> Dict:
+    def playlist_snapshot(self, playlist_url: str) -> Optional[str]:
+        """Current snapshot_id of a playlist, always asked to Spotify (bypasses the metadata cache)"""
+        playlist_id = extract_playlist_id(playlist_url)
+
+        if not playlist_id:
+            logging.error("Invalid Spotify playlist URL")
+            return None
+
+        try:
+            return call_with_backoff(self.sp.playlist, playlist_id, fields='snapshot_id').get('snapshot_id')
+        except SpotifyRateLimited:
+            raise
+        except Exception as e:
+            logging.error(f"Error reading playlist snapshot: {e}")
+            return None
+
+    def stream_playlist_tracks(self, playlist_url: str, fresh: bool = False) -> Dict:
+        """
+        Start extracting a playlist without waiting for all of its pages.
+
+        Args:
+            playlist_url (str): Spotify playlist URL
+            fresh (bool): Always ask Spotify for the current snapshot instead of the recently cached one
+
+        Returns:
+            Dict: Playlist title, cover_url, url, snapshot_id, total_tracks and `pages`, an iterator
+                yielding lists of unique tracks as pages arrive. Empty dict on error.
+        """
         playlist_id = extract_playlist_id(playlist_url)
 
         if not playlist_id:
             logging.error("Invalid Spotify playlist URL")
             return {}
-        
+
+        # Recently seen playlist whose snapshot is cached: no request at all
+        meta = None if fresh else cache_get(f"playlist:{playlist_id}")
+        if meta:
+            cached = self._cached_playlist(playlist_id, meta, playlist_url)
+            if cached:
+                return cached
+
         try:
-            # Extract playlist info
-            playlist = self.sp.playlist(playlist_id)
-            total_tracks = playlist['tracks']['total']
-            tracks_info = []
-            offset = 0
+            # Extract playlist info, the response embeds the first page of tracks
+            playlist = call_with_backoff(self.sp.playlist, playlist_id)
             limit = 100
-            console.print(f"[green]Playlist has [red]{total_tracks}[/red] tracks.")
-
-            with Progress() as progress:
-                task = progress.add_task("[cyan]Extracting tracks...", total=total_tracks)
-
-                while offset < total_tracks:
-                    progress.update(task, advance=0, description=f"[cyan]Loading tracks {offset + 1}-{min(offset + limit, total_tracks)} of {total_tracks}...")
-                    results = self.sp.playlist_items(
-                        playlist_id,
-                        offset=offset,
-                        limit=limit,
-                        fields='items(track(name,artists(name),album(name,release_date,images),duration_ms))'
-                    )
-
-                    if not results['items']:
-                        break
-
-                    for idx, item in enumerate(results['items']):
-                        if item['track'] is None:
-                            continue
-                        
-                        # Extract track details
-                        track = item['track']
-
-                        # Extract album info
-                        album = track['album']
-
-                        # Extract duration in seconds
-                        duration_ms = track['duration_ms']
-                        duration_seconds = duration_ms // 1000 if duration_ms else None
-
-                        # Extract cover URL
-                        cover_url = album['images'][0]['url'] if album['images'] else None
-
-                        # Extract artists
-                        artists = [artist['name'] for artist in track['artists']]
-
-                        # Compile track info
-                        track_info = {
-                            "title": track['name'],
-                            "artist": ', '.join(artists),
-                            "album": album['name'],
-                            "added_at": None,
-                            "cover_url": cover_url,
-                            "duration_ms": duration_ms,
-                            "duration_seconds": duration_seconds,
-                            "play_count": None
-                        }
-
-                        # Append to list
-                        tracks_info.append(track_info)
-                        progress.update(task, advance=1)
-                    offset += limit
-
-            # Remove duplicates based on title and artist
-            unique = {}
-            for item in tracks_info:
-                key = (item.get("title", ""), item.get("artist", ""))
-                if key not in unique:
-                    unique[key] = item
-
-            # Convert back to list
-            unique_tracks = list(unique.values())
-            console.print(f"[green]Extracted [red]{len(unique_tracks)}[/red] unique tracks from playlist")
-            
-            return {
+
+            meta = {
                 "title": playlist['name'],
                 "cover_url": playlist['images'][0]['url'] if playlist['images'] else None,
+                "snapshot_id": playlist.get('snapshot_id')
+            }
+            cache_set(f"playlist:{playlist_id}", meta, playlist_ttl)
+
+            # Unchanged snapshot: the track list is the cached one
+            cached = self._cached_playlist(playlist_id, meta, playlist_url)
+            if cached:
+                return cached
+
+            def fetch_page(offset: int) -> Dict:
+                return self.sp.playlist_items(
+                    playlist_id,
+                    offset=offset,
+                    limit=limit,
+                    fields='items(track(id,external_ids(isrc),name,artists(name),album(name,release_date,images),duration_ms))'
+                )
+
+            pages = self._track_pages(fetch_pages(playlist['tracks'], fetch_page, limit), self._parse_playlist_item, unique=True)
+            if meta['snapshot_id']:
+                pages = cache_pages(pages, f"playlist_tracks:{playlist_id}:{meta['snapshot_id']}", snapshot_ttl, lambda tracks: tracks)
+
+            return {
+                **meta,
                 "url": playlist_url,
-                "tracks": unique_tracks
+                "total_tracks": playlist['tracks']['total'],
+                "pages": pages
             }
-        
+
+        except SpotifyRateLimited:
+            # A rate limit is not an empty playlist, let the caller report it
+            raise
         except Exception as e:
             logging.error(f"Error extracting playlist: {e}")
             return {}
 
-    def extract_album_tracks(self, album_url: str) -> Dict:
+    def stream_album_tracks(self, album_url: str) -> Dict:
+        """
+        Start extracting an album without waiting for all of its pages.
+
+        Args:
+            album_url (str): Spotify album URL
+
+        Returns:
+            Dict: Album title, cover_url, url, total_tracks and `pages`, an iterator
+                yielding lists of tracks as pages arrive. Empty dict on error.
+        """
         album_id = extract_album_id(album_url)
 
         if not album_id:
             logging.error("Invalid Spotify album URL")
             return {}
-        
+
+        # Released albums don't change, the whole track list is cached
+        cached = cache_get(f"album:{album_id}")
+        if cached:
+            logging.info(f"Spotify cache hit for album {album_id}")
+            tracks = cached.pop('tracks')
+            return {**cached, "url": album_url, "total_tracks": len(tracks), "pages": iter([tracks])}
+
         try:
-            # Extract album info
-            album = self.sp.album(album_id)
-            total_tracks = album['tracks']['total']
-            tracks_info = []
-            offset = 0
+            # Extract album info, the response embeds the first page of tracks
+            album = call_with_backoff(self.sp.album, album_id)
             limit = 50 # Album tracks limit is usually 50
-            console.print(f"[green]Album has [red]{total_tracks}[/red] tracks.")
-
-            with Progress() as progress:
-                task = progress.add_task("[cyan]Extracting tracks...", total=total_tracks)
-
-                while offset < total_tracks:
-                    progress.update(task, advance=0, description=f"[cyan]Loading tracks {offset + 1}-{min(offset + limit, total_tracks)} of {total_tracks}...")
-                    results = self.sp.album_tracks(
-                        album_id,
-                        offset=offset,
-                        limit=limit
-                    )
-
-                    if not results['items']:
-                        break
-
-                    for item in results['items']:
-                        # Extract track details
-                        # Note: album_tracks returns simplified track objects, missing album info (but we have it from album object)
-                        
-                        # Extract duration in seconds
-                        duration_ms = item['duration_ms']
-                        duration_seconds = duration_ms // 1000 if duration_ms else None
-
-                        # Extract artists
-                        artists = [artist['name'] for artist in item['artists']]
-
-                        # Compile track info
-                        track_info = {
-                            "title": item['name'],
-                            "artist": ', '.join(artists),
-                            "album": album['name'],
-                            "added_at": None,
-                            "cover_url": album['images'][0]['url'] if album['images'] else None,
-                            "duration_ms": duration_ms,
-                            "duration_seconds": duration_seconds,
-                            "play_count": None
-                        }
-
-                        # Append to list
-                        tracks_info.append(track_info)
-                        progress.update(task, advance=1)
-                    offset += limit
 
-            return {
+            def fetch_page(offset: int) -> Dict:
+                return self.sp.album_tracks(album_id, offset=offset, limit=limit)
+
+            def parse(item: Dict) -> Optional[Dict]:
+                return self._parse_album_item(item, album)
+
+            meta = {
                 "title": album['name'],
-                "cover_url": album['images'][0]['url'] if album['images'] else None,
+                "cover_url": album['images'][0]['url'] if album['images'] else None
+            }
+            pages = self._track_pages(fetch_pages(album['tracks'], fetch_page, limit), parse, unique=False, fill_isrcs=True)
+
+            return {
+                **meta,
                 "url": album_url,
-                "tracks": tracks_info
+                "total_tracks": album['tracks']['total'],
+                "pages": cache_pages(pages, f"album:{album_id}", album_ttl, lambda tracks: dict(meta, tracks=tracks))
             }
-        
+
+        except SpotifyRateLimited:
+            raise
         except Exception as e:
             logging.error(f"Error extracting album: {e}")
-            return {}
\ No newline at end of file
+            return {}
+
+    def _cached_playlist(self, playlist_id: str, meta: Dict, playlist_url: str) -> Optional[Dict]:
+        """Streamed collection built from the cached tracks of the playlist snapshot, None on miss"""
+        if not meta.get('snapshot_id'):
+            return None
+
+        tracks = cache_get(f"playlist_tracks:{playlist_id}:{meta['snapshot_id']}")
+        if tracks is None:
+            return None
+
+        logging.info(f"Spotify cache hit for playlist {playlist_id} (snapshot {meta['snapshot_id']})")
+        return {**meta, "url": playlist_url, "total_tracks": len(tracks), "pages": iter([tracks])}
+
+    def stream_artist_tracks(self, artist_url: str) -> Dict:
+        """
+        Start extracting the discography of an artist (albums and singles by default).
+
+        The release list is paged concurrently, then full albums are fetched 20 per request
+        and the ISRCs of their tracks 50 per request, all on the shared page workers.
+        Tracks already seen with the same ISRC or normalized title are dropped, so album
+        versions win over the singles and remasters released later.
+
+        Args:
+            artist_url (str): Spotify artist URL
+
+        Returns:
+            Dict: Artist name as title, cover_url, url, total_tracks (before dedup) and `pages`,
+                an iterator yielding the unique tracks of each group of releases. Empty dict on error.
+        """
+        artist_id = extract_artist_id(artist_url)
+
+        if not artist_id:
+            logging.error("Invalid Spotify artist URL")
+            return {}
+
+        try:
+            artist = call_with_backoff(self.sp.artist, artist_id)
+            limit = 50
+
+            def fetch_page(offset: int) -> Dict:
+                return self.sp.artist_albums(artist_id, include_groups=artist_groups, limit=limit, offset=offset)
+
+            first_page = call_with_backoff(fetch_page, 0)
+            releases = {}
+            for items in fetch_pages(first_page, fetch_page, limit):
+                for release in items:
+                    releases.setdefault(release['id'], release)
+
+            console.print(f"[green]Artist has [red]{len(releases)}[/red] releases.")
+            return {
+                "title": artist['name'],
+                "cover_url": artist['images'][0]['url'] if artist['images'] else None,
+                "url": artist_url,
+                "total_tracks": sum(release.get('total_tracks') or 0 for release in releases.values()),
+                "pages": self._artist_pages(list(releases))
+            }
+
+        except SpotifyRateLimited:
+            raise
+        except Exception as e:
+            logging.error(f"Error extracting artist: {e}")
+            return {}
+
+    def extract_artist_tracks(self, artist_url: str) -> Dict:
+        collection = self.stream_artist_tracks(artist_url)
+        if not collection:
+            return {}
+
+        try:
+            tracks_info = self._collect_pages(collection)
+        except SpotifyRateLimited:
+            raise
+        except Exception as e:
+            logging.error(f"Error extracting artist: {e}")
+            return {}
+
+        console.print(f"[green]Extracted [red]{len(tracks_info)}[/red] unique tracks from artist")
+        return collection
+
+    def _artist_pages(self, album_ids: List[str]) -> Iterator[List[Dict]]:
+        seen = set()
+
+        for response in fetch_ordered(self.sp.albums, chunked(album_ids, 20)):
+            tracks = []
+            for album in response['albums']:
+                if not album:
+                    continue
+
+                def fetch_page(offset: int, album_id: str = album['id']) -> Dict:
+                    return self.sp.album_tracks(album_id, offset=offset, limit=50)
+
+                for items in fetch_pages(album['tracks'], fetch_page, 50):
+                    tracks.extend(self._parse_album_item(item, album) for item in items)
+
+            self._fill_isrcs(tracks)
+
+            # Same recording on an album, single or compilation: same ISRC, or same title and artist
+            unique = []
+            for track in tracks:
+                keys = track_keys(track)
+                if any(key in seen for key in keys):
+                    continue
+                seen.update(keys)
+                unique.append(track)
+            yield unique
+
+    def extract_playlist_tracks(self, playlist_url: str) -> Dict:
+        collection = self.stream_playlist_tracks(playlist_url)
+        if not collection:
+            return {}
+
+        console.print(f"[green]Playlist has [red]{collection['total_tracks']}[/red] tracks.")
+        try:
+            tracks_info = self._collect_pages(collection)
+        except SpotifyRateLimited:
+            raise
+        except Exception as e:
+            logging.error(f"Error extracting playlist: {e}")
+            return {}
+
+        console.print(f"[green]Extracted [red]{len(tracks_info)}[/red] unique tracks from playlist")
+        return collection
+
+    def extract_album_tracks(self, album_url: str) -> Dict:
+        collection = self.stream_album_tracks(album_url)
+        if not collection:
+            return {}
+
+        console.print(f"[green]Album has [red]{collection['total_tracks']}[/red] tracks.")
+        try:
+            self._collect_pages(collection)
+        except SpotifyRateLimited:
+            raise
+        except Exception as e:
+            logging.error(f"Error extracting album: {e}")
+            return {}
+
+        return collection
+
+    def _collect_pages(self, collection: Dict) -> List[Dict]:
+        """Consume the pages of a streamed collection, replacing them with the full `tracks` list"""
+        total_tracks = collection.pop('total_tracks')
+        tracks_info = []
+
+        with Progress() as progress:
+            task = progress.add_task("[cyan]Extracting tracks...", total=total_tracks)
+
+            for tracks in collection.pop('pages'):
+                progress.update(task, advance=0, description=f"[cyan]Loading tracks {len(tracks_info) + 1}-{min(len(tracks_info) + len(tracks), total_tracks)} of {total_tracks}...")
+                tracks_info.extend(tracks)
+                progress.update(task, advance=len(tracks))
+
+        collection['tracks'] = tracks_info
+        return tracks_info
+
+    def _track_pages(self, pages: Iterator[List[Dict]], parse: Callable[[Dict], Optional[Dict]], unique: bool, fill_isrcs: bool = False) -> Iterator[List[Dict]]:
+        """
+        Parse raw Spotify pages into track info lists.
+
+        With `unique`, tracks sharing a key (ISRC, Spotify ID or normalized title and
+        artist, see track_keys) with an earlier one are dropped as they arrive.
+        With `fill_isrcs`, the ISRCs missing from simplified track objects are fetched.
+        """
+        seen = set()
+        for items in pages:
+            tracks = [track_info for track_info in map(parse, items) if track_info is not None]
+            if fill_isrcs:
+                self._fill_isrcs(tracks)
+
+            if unique:
+                unique_tracks = []
+                for track_info in tracks:
+                    keys = track_keys(track_info)
+                    if any(key in seen for key in keys):
+                        continue
+                    seen.update(keys)
+                    unique_tracks.append(track_info)
+                tracks = unique_tracks
+
+            yield tracks
+
+    def _fill_isrcs(self, tracks: List[Dict]):
+        """Set the ISRC of tracks parsed from simplified objects, full track objects are fetched 50 at a time"""
+        track_ids = [track['spotify_id'] for track in tracks if track.get('spotify_id') and not track.get('isrc')]
+
+        isrcs = {}
+        for full_tracks in fetch_ordered(self.sp.tracks, chunked(track_ids, 50)):
+            for full_track in full_tracks['tracks']:
+                if full_track:
+                    isrcs[full_track['id']] = (full_track.get('external_ids') or {}).get('isrc')
+
+        for track in tracks:
+            if not track.get('isrc'):
+                track['isrc'] = isrcs.get(track.get('spotify_id'))
+
+    def _parse_playlist_item(self, item: Dict) -> Optional[Dict]:
+        if item['track'] is None:
+            return None
+
+        # Extract track details
+        track = item['track']
+
+        # Extract album info
+        album = track['album']
+
+        # Extract duration in seconds
+        duration_ms = track['duration_ms']
+        duration_seconds = duration_ms // 1000 if duration_ms else None
+
+        # Extract cover URL
+        cover_url = album['images'][0]['url'] if album['images'] else None
+
+        # Extract artists
+        artists = [artist['name'] for artist in track['artists']]
+
+        # Compile track info
+        return {
+            "spotify_id": track.get('id'),
+            "isrc": (track.get('external_ids') or {}).get('isrc'),
+            "title": track['name'],
+            "artist": ', '.join(artists),
+            "album": album['name'],
+            "added_at": None,
+            "cover_url": cover_url,
+            "duration_ms": duration_ms,
+            "duration_seconds": duration_seconds,
+            "play_count": None
+        }
+
+    def _parse_album_item(self, item: Dict, album: Dict) -> Optional[Dict]:
+        # Note: album_tracks returns simplified track objects, missing album info (but we have it from album object)
+
+        # Extract duration in seconds
+        duration_ms = item['duration_ms']
+        duration_seconds = duration_ms // 1000 if duration_ms else None
+
+        # Extract artists
+        artists = [artist['name'] for artist in item['artists']]
+
+        # Compile track info, the ISRC is only in full track objects (see _fill_isrcs)
+        return {
+            "spotify_id": item.get('id'),
+            "isrc": None,
+            "title": item['name'],
+            "artist": ', '.join(artists),
+            "album": album['name'],
+            "added_at": None,
+            "cover_url": album['images'][0]['url'] if album['images'] else None,
+            "duration_ms": duration_ms,
+            "duration_seconds": duration_seconds,
+            "play_count": None
+        }
@@ -0,0 +1,203 @@
+# 16.10.2026
+
+import time
+import logging
+import threading
+from typing import Callable, Optional
+
+
+# External library
+from spotipy.exceptions import SpotifyException
+
+
+# Internal utils
+from SpotDown.utils.config_json import config_manager
+
+
+# Variable
+requests_per_second = config_manager.get_float("SPOTIFY", "requests_per_second")
+burst = config_manager.get_int("SPOTIFY", "burst")
+initial_concurrency = config_manager.get_int("SPOTIFY", "page_workers")
+max_concurrency = config_manager.get_int("SPOTIFY", "max_concurrency")
+max_retries = config_manager.get_int("SPOTIFY", "max_retries")
+max_retry_wait = config_manager.get_float("SPOTIFY", "max_retry_wait")
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_layer: Optional["SpotifyRequests"] = None
+_layer_lock = threading.Lock()
+
+
+class SpotifyRateLimited(Exception):
+    def __init__(self, retry_after: float):
+        """Spotify kept answering 429, or asked to wait longer than max_retry_wait"""
+        super().__init__(f"Spotify rate limit reached, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        """
+        Thread-safe token bucket shared by every Spotify request.
+
+        Args:
+            rate (float): Tokens added per second, 0 disables the limit
+            capacity (int): Maximum tokens stored, i.e. the allowed burst
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif not self.rate:
+                    return
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold every request for `seconds` (Retry-After), the bucket restarts empty"""
+        with self.lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0.0
+            self.updated = self.paused_until
+
+
+class AIMDLimiter:
+    def __init__(self, initial: int, maximum: int):
+        """
+        Concurrency limit adjusted with additive increase / multiplicative decrease.
+
+        The limit grows by one after a full window of successful requests and is
+        halved on 429, once per burst of concurrent 429s, so it settles just below
+        what Spotify tolerates.
+
+        Args:
+            initial (int): Starting limit
+            maximum (int): Upper bound of the limit
+        """
+        self.maximum = max(1, maximum)
+        self.limit = max(1, min(initial, self.maximum))
+        self.in_flight = 0
+        self.successes = 0
+        self.decreased_at = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+
+    def success(self):
+        with self.condition:
+            self.successes += 1
+            if self.successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self.successes = 0
+                self.condition.notify()
+
+    def throttled(self):
+        with self.condition:
+            # Requests already in flight when the limit was cut answer 429 too
+            now = time.monotonic()
+            if now - self.decreased_at < 1.0:
+                return
+            self.decreased_at = now
+            self.limit = max(1, self.limit // 2)
+            self.successes = 0
+            logging.info(f"Spotify concurrency reduced to {self.limit}")
+
+
+class SpotifyRequests:
+    def __init__(self, rate: float = requests_per_second, capacity: int = burst, concurrency: int = initial_concurrency, maximum: int = max_concurrency):
+        """
+        Request layer under every spotipy call of the extractors.
+
+        Requests take a token from a shared bucket and a slot of the adaptive
+        concurrency limit. 429 answers pause the whole bucket for the Retry-After
+        delay and halve the concurrency before retrying, 5xx answers are retried
+        with exponential backoff.
+        """
+        self.bucket = TokenBucket(rate, capacity)
+        self.limiter = AIMDLimiter(concurrency, maximum)
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        Call a spotipy method through the rate limits.
+
+        Raises:
+            SpotifyRateLimited: Retries exhausted on 429, or Retry-After above max_retry_wait
+            SpotifyException: Any other error, or 5xx after the last retry
+        """
+        delay = 1.0
+        for attempt in range(max_retries + 1):
+            self.bucket.acquire()
+            self.limiter.acquire()
+            try:
+                result = func(*args, **kwargs)
+                self.limiter.success()
+                return result
+
+            except SpotifyException as e:
+                if e.http_status not in RETRY_STATUSES:
+                    raise
+
+                retry_after = self._retry_after(e)
+                if e.http_status == 429:
+                    self.limiter.throttled()
+                    wait = retry_after if retry_after is not None else delay
+                    if attempt == max_retries or wait > max_retry_wait:
+                        raise SpotifyRateLimited(wait) from e
+                    self.bucket.pause(wait)
+                else:
+                    if attempt == max_retries:
+                        raise
+                    wait = delay
+
+                logging.warning(f"Spotify answered {e.http_status}, retrying in {wait:.1f}s (attempt {attempt + 1}/{max_retries})")
+
+            finally:
+                self.limiter.release()
+
+            time.sleep(wait)
+            delay = min(delay * 2, 30)
+
+    @staticmethod
+    def _retry_after(error: SpotifyException) -> Optional[float]:
+        try:
+            value = (error.headers or {}).get('Retry-After')
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+
+def get_request_layer() -> SpotifyRequests:
+    """Process-wide request layer, its limits are shared by every extractor and job"""
+    global _layer
+
+    if _layer is None:
+        with _layer_lock:
+            if _layer is None:
+                _layer = SpotifyRequests()
+
+    return _layer
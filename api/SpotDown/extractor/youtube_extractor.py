@@ -2,19 +2,30 @@
 
 import re
 import json
-import difflib
+import time
+import asyncio
 import logging
+import threading
+from queue import Queue
+from itertools import groupby
 from urllib.parse import quote_plus
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 
 # External imports
 import httpx
 from rich.console import Console
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Internal utils
-from SpotDown.utils.headers import get_userAgent
+from SpotDown.utils.cache import DiskCache
+from SpotDown.helpers.similarity import get_engine, normalize, split_artists
+from SpotDown.utils.http_client import get_http_client, client_options
 from SpotDown.helpers.string import contains_emoji
 from SpotDown.utils.config_json import config_manager
 
@@ -24,12 +35,188 @@ console = Console()
 auto_first = config_manager.get("DOWNLOAD", "auto_first")
 search_limit = config_manager.get_int("SEARCH", "limit")
 exclude_emoji = config_manager.get_bool("SEARCH", "exclude_emoji")
+batch_concurrency = config_manager.get_int("SEARCH", "batch_concurrency")
+rate_limit = config_manager.get_float("SEARCH", "rate_limit")
+max_concurrent_searches = config_manager.get_int("SEARCH", "max_concurrent")
+# "difflib" (default) or "rapidfuzz". rapidfuzz ranks faster but is not a drop-in replacement:
+# its scores differ from difflib's, and on fixtures/ranking_corpus.json (bench_ranking.py) it
+# changes the result order of 4 of the 30 tracks (5 with DJ priority), difflib of none
+similarity_engine = config_manager.get("SEARCH", "similarity_engine")
+search_cache_ttl = config_manager.get_int("CACHE", "search_ttl")
+search_cache_size = config_manager.get_int("CACHE", "search_max_entries")
+YOUTUBE_HOST = "www.youtube.com"
+YT_INITIAL_DATA_MARKERS = ("var ytInitialData = ", 'window["ytInitialData"] = ')
+json_decoder = json.JSONDecoder()
+
+_search_cache: Optional[DiskCache] = None
+_search_cache_lock = threading.Lock()
+
+_rate_limiter: Optional["RateLimiter"] = None
+_search_slots: Optional["SearchSlots"] = None
+_search_lock = threading.Lock()
+
+
+def get_search_cache() -> DiskCache:
+    """Process-wide cache of parsed YouTube search results, opened on first use"""
+    global _search_cache
+
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = DiskCache("search", search_cache_ttl, search_cache_size)
+
+    return _search_cache
+
+
+def normalize_query(query: str) -> str:
+    """Cache key of a search query: case and whitespace insensitive"""
+    return " ".join(query.lower().split())
+
+
+def search_cache_keys(query: str, track: Optional[Dict] = None) -> List[str]:
+    """
+    Cache keys of a search: the ISRC of the searched track first when known, so the
+    same recording titled differently across playlists and albums shares its results,
+    then the normalized query.
+    """
+    keys = []
+    if track and track.get('isrc'):
+        keys.append(f"isrc:{track['isrc'].upper()}")
+    keys.append(normalize_query(query))
+    return keys
+
+
+def parse_initial_data(html: str) -> Optional[Dict]:
+    """
+    Locate and decode the ytInitialData blob of a YouTube page.
+
+    The blob is found with plain substring scans instead of a regex over the
+    whole page, and decoded with orjson when installed. If the closing
+    script tag is missing, the stdlib decoder stops at the end of the object.
+
+    Args:
+        html (str): Page HTML
+
+    Returns:
+        Optional[Dict]: Decoded ytInitialData, None if not found or not valid JSON
+    """
+    for marker in YT_INITIAL_DATA_MARKERS:
+        start = html.find(marker)
+        if start != -1:
+            start += len(marker)
+            break
+    else:
+        return None
+
+    if orjson is not None:
+        end = html.find(";</script>", start)
+        if end != -1:
+            try:
+                return orjson.loads(html[start:end])
+            except orjson.JSONDecodeError:
+                pass
+
+    try:
+        data, _ = json_decoder.raw_decode(html, start)
+    except json.JSONDecodeError:
+        return None
+    return data
+
+
+class RateLimiter:
+    def __init__(self, rate: float):
+        """
+        Space out requests to the same host, across threads and event loops.
+
+        Args:
+            rate (float): Maximum requests per second for each host, 0 disables the limit
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, host: str) -> float:
+        """Book the next free slot of a host, returns the seconds to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.interval
+        return slot - now
+
+    async def wait(self, host: str):
+        if self.interval:
+            delay = self._reserve(host)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    def wait_blocking(self, host: str):
+        if self.interval:
+            delay = self._reserve(host)
+            if delay > 0:
+                time.sleep(delay)
+
+
+class SearchSlots:
+    poll_interval = 0.02
+
+    def __init__(self, count: int):
+        """
+        Cap on the YouTube searches in flight, shared by worker threads and batch searches.
+
+        Threads block on the semaphore, coroutines poll it so that neither the
+        event loop is blocked nor a slot leaks when the coroutine is cancelled.
+
+        Args:
+            count (int): Maximum searches in flight for the whole process
+        """
+        self._semaphore = threading.BoundedSemaphore(max(1, count))
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._semaphore.release()
+
+    async def acquire(self, stop: Optional[threading.Event] = None) -> bool:
+        """Wait for a free slot, False if `stop` is set first"""
+        while not self._semaphore.acquire(blocking=False):
+            if stop is not None and stop.is_set():
+                return False
+            await asyncio.sleep(self.poll_interval)
+        return True
+
+    def release(self):
+        self._semaphore.release()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter of the requests sent to YouTube"""
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        with _search_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter(rate_limit)
 
+    return _rate_limiter
+
+
+def get_search_slots() -> SearchSlots:
+    """Process-wide cap on concurrent YouTube searches"""
+    global _search_slots
+
+    if _search_slots is None:
+        with _search_lock:
+            if _search_slots is None:
+                _search_slots = SearchSlots(max_concurrent_searches)
+
+    return _search_slots
 
 
 class YouTubeExtractor:
     def __init__(self):
-        pass
+        self.similarity = get_engine(similarity_engine)
 
     def __enter__(self):
         return self
@@ -49,7 +236,7 @@ class YouTubeExtractor:
         Returns:
             List[Dict]: Sorted list of found videos
         """
-        results = self.search_videos(query)
+        results = self.search_videos(query, spotify_info)
         
         if not results:
             return []
@@ -59,29 +246,158 @@ class YouTubeExtractor:
             
         return results
 
-    def search_videos(self, query: str) -> List[Dict]:
+    def search_many(self, tracks: List[Dict], dj_priority: bool = False) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        Blocking wrapper of search_many_async, usable from worker threads.
+        The searches run on a private event loop and results are yielded as they complete.
+
+        Args:
+            tracks (List[Dict]): Spotify track dicts (artist, title, duration)
+            dj_priority (bool): Whether to prioritize DJ mixes
+
+        Yields:
+            Tuple[int, List[Dict]]: Index of the track in `tracks` and its sorted results
+        """
+        results: Queue = Queue()
+        stop = threading.Event()
+
+        async def consume():
+            async for item in self.search_many_async(tracks, dj_priority, stop=stop):
+                if stop.is_set():
+                    break
+                results.put(item)
+
+        def runner():
+            try:
+                asyncio.run(consume())
+            except Exception as e:
+                logging.error(f"Batch YouTube search error: {e}")
+            finally:
+                results.put(None)
+
+        threading.Thread(target=runner, name="youtube-batch-search", daemon=True).start()
+
+        try:
+            while True:
+                item = results.get()
+                if item is None:
+                    break
+                yield item
+        finally:
+            # Consumer stopped early (closed or garbage collected): searches not started yet are skipped
+            stop.set()
+
+    async def search_many_async(self, tracks: List[Dict], dj_priority: bool = False, concurrency: int = batch_concurrency, stop: Optional[threading.Event] = None) -> AsyncIterator[Tuple[int, List[Dict]]]:
+        """
+        Search a whole list of tracks concurrently.
+
+        Searches count against the process-wide search slots and rate limit,
+        shared with the single searches of the resolve workers.
+
+        Args:
+            tracks (List[Dict]): Spotify track dicts (artist, title, duration)
+            dj_priority (bool): Whether to prioritize DJ mixes
+            concurrency (int): Maximum searches of this batch in flight
+            stop (threading.Event, optional): Once set, searches not sent yet return no results
+
+        Yields:
+            Tuple[int, List[Dict]]: Index of the track in `tracks` and its sorted results, in completion order
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async with httpx.AsyncClient(**client_options()) as client:
+
+            async def resolve(index: int, track: Dict) -> Tuple[int, List[Dict]]:
+                info = self._track_info(track)
+                query = f"{info.get('artist', '')} {info.get('title', '')}"
+
+                async with semaphore:
+                    results = await self.search_videos_async(client, query, track, stop)
+
+                if results:
+                    self.sort_by_affinity_and_duration(results, info, dj_priority)
+                return index, results
+
+            pending = [asyncio.ensure_future(resolve(index, track)) for index, track in enumerate(tracks)]
+            try:
+                for future in asyncio.as_completed(pending):
+                    yield await future
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    async def search_videos_async(self, client: httpx.AsyncClient, query: str, track: Optional[Dict] = None, stop: Optional[threading.Event] = None) -> List[Dict]:
+        """
+        Async variant of search_videos on a caller-provided client
+
+        Args:
+            client (httpx.AsyncClient): Client used for the request
+            query (str): Search query
+            track (Dict, optional): Searched track, its ISRC keys the cache
+            stop (threading.Event, optional): Once set, the search is skipped if not sent yet
+
+        Returns:
+            List[Dict]: List of found videos
+        """
+        try:
+            cached = self._cached_results(query, track)
+            if cached is not None:
+                return cached
+
+            slots = get_search_slots()
+            if not await slots.acquire(stop):
+                return []
+
+            try:
+                await get_rate_limiter().wait(YOUTUBE_HOST)
+                if stop is not None and stop.is_set():
+                    return []
+
+                logging.info(f"Searching on YouTube (batch): {query}")
+                response = await client.get(self._search_url(query))
+            finally:
+                slots.release()
+
+            results = self._extract_youtube_videos(response.text, search_limit)
+            logging.info(f"Found {len(results)} results for query: {query}")
+            self._cache_results(query, results, track)
+            return results
+
+        except Exception as e:
+            logging.error(f"YouTube search error: {e}")
+            return []
+
+    def search_videos(self, query: str, track: Optional[Dict] = None) -> List[Dict]:
         """
         Search for videos on YouTube
         
         Args:
             query (str): Search query
+            track (Dict, optional): Searched track, its ISRC keys the cache
             
         Returns:
             List[Dict]: List of found videos
         """
         try:
+            cached = self._cached_results(query, track)
+            if cached is not None:
+                return cached
+
             logging.info(f"Starting YouTube search for query: {query}")
-            search_url = f"https://www.youtube.com/results?search_query={quote_plus(query)}"
+            search_url = self._search_url(query)
             if not auto_first:
                 console.print(f"\n[bold blue]Searching on YouTube:[/bold blue] {query}")
             logging.info(f"Searching on YouTube: {query}")
 
-            with httpx.Client(timeout=10) as client:
-                response = client.get(search_url, headers={"User-Agent": get_userAgent()})
-                html = response.text
+            # Pooled keep-alive client shared by every search, within the process-wide search cap
+            with get_search_slots():
+                get_rate_limiter().wait_blocking(YOUTUBE_HOST)
+                response = get_http_client().get(search_url)
+            html = response.text
 
             results = self._extract_youtube_videos(html, search_limit)
             logging.info(f"Found {len(results)} results for query: {query}")
+            self._cache_results(query, results, track)
             return results
 
         except Exception as e:
@@ -90,6 +406,40 @@ class YouTubeExtractor:
             logging.error(f"YouTube search error: {e}")
             return []
 
+    def _cached_results(self, query: str, track: Optional[Dict] = None) -> Optional[List[Dict]]:
+        """Parsed results of a previous search of the same recording or query, None on cache miss"""
+        try:
+            cache = get_search_cache()
+            for key in search_cache_keys(query, track):
+                results = cache.get(key)
+                if results is not None:
+                    logging.info(f"Search cache hit for {key} ({len(results)} results)")
+                    return results
+        except Exception as e:
+            logging.warning(f"Search cache unavailable: {e}")
+        return None
+
+    def _cache_results(self, query: str, results: List[Dict], track: Optional[Dict] = None):
+        """Store the parsed results, empty ones are not cached since they often mean throttling"""
+        if not results:
+            return
+        try:
+            cache = get_search_cache()
+            for key in search_cache_keys(query, track):
+                cache.set(key, results)
+        except Exception as e:
+            logging.warning(f"Unable to cache search results: {e}")
+
+    def _search_url(self, query: str) -> str:
+        return f"https://{YOUTUBE_HOST}/results?search_query={quote_plus(query)}"
+
+    def _track_info(self, track: Dict) -> Dict:
+        """Copy of a track dict with duration_seconds filled from duration_ms when missing"""
+        info = dict(track)
+        if info.get('duration_seconds') is None and track.get('duration_ms'):
+            info['duration_seconds'] = int(track['duration_ms']) // 1000
+        return info
+
     def sort_by_duration_similarity(self, youtube_results: List[Dict], target_duration: int):
         """
         Sort results by duration closest to the target
@@ -115,11 +465,15 @@ class YouTubeExtractor:
         """
         logging.info(f"Sorting {len(youtube_results)} results by artist affinity and duration (DJ Priority: {dj_priority})")
         target_duration = spotify_info.get('duration_seconds')
-        target_title = spotify_info.get('title', '').lower()
+        target_title = normalize(spotify_info.get('title', ''))
 
         # Split artists and clean them
-        target_artists = [a.strip().lower() for a in spotify_info.get('artist', '').split(',')]
-        logging.info(f"Target artists: {target_artists}")
+        target_artists = split_artists(spotify_info.get('artist', ''))
+        logging.info(f"Target artists: {list(target_artists)}")
+
+        # Targets are indexed once and shared by every candidate
+        title_scorer = self.similarity.scorer(target_title)
+        artist_scorers = [self.similarity.scorer(artist) for artist in target_artists]
 
         # Keywords for DJ versions
         mix_keywords = ["extended mix", "original mix", "club mix"]
@@ -131,12 +485,11 @@ class YouTubeExtractor:
             else:
                 result['duration_difference'] = float('inf')
 
-            yt_title = result.get('title', '').lower()
-            yt_channel = result.get('channel', '').lower()
+            yt_title = normalize(result.get('title', ''))
+            yt_channel = normalize(result.get('channel', ''))
 
             # Title matching
             result['exact_title_match'] = yt_title == target_title
-            result['title_affinity'] = difflib.SequenceMatcher(None, yt_title, target_title).ratio()
             
             # DJ Priority Check
             result['has_mix_keyword'] = False
@@ -159,26 +512,8 @@ class YouTubeExtractor:
                         # Penalize more
                         result['duration_difference'] = abs(diff) * 2
 
-            # Artist/Channel matching - check each artist
-            channel_exact_matches = []
-            channel_affinities = []
-            for artist in target_artists:
-
-                # Exact match
-                exact_match = yt_channel == artist
-                channel_exact_matches.append(exact_match)
-
-                # Check if artist is contained in channel
-                contains_artist = artist in yt_channel
-                channel_exact_matches.append(contains_artist)
-
-                # Similarity ratio
-                similarity = difflib.SequenceMatcher(None, yt_channel, artist).ratio()
-                channel_affinities.append(similarity)
-
-            # Best matches
-            result['exact_channel_match'] = any(channel_exact_matches)
-            result['channel_affinity'] = max(channel_affinities) if channel_affinities else 0.0
+            # Artist/Channel matching: exact match or artist contained in channel
+            result['exact_channel_match'] = any(yt_channel == artist or artist in yt_channel for artist in target_artists)
 
         # Sorting: 
         # 1. Exact channel match first (most important)
@@ -186,27 +521,47 @@ class YouTubeExtractor:
         # 3. Then duration difference
         # 4. Then channel affinity
         # 5. Then title matching
-        youtube_results.sort(
-            key=lambda x: (
+        def primary_key(x):
+            return (
                 not x['exact_channel_match'],        # False first (exact matches)
                 not x['has_mix_keyword'],            # False first (has mix keyword) -> Higher priority
-                x['duration_difference'],            # Lower difference first  
+                x['duration_difference']             # Lower difference first
+            )
+
+        def affinity_key(x):
+            return (
                 -x['channel_affinity'],              # Higher affinity first
                 not x['exact_title_match'],          # False first (exact titles)
                 -x['title_affinity']                 # Higher title affinity first
             )
-        )
+
+        # Affinities only break ties of the primary key, so the similarity
+        # scores are computed for tied results only. Sorting each tied run
+        # afterwards gives the same order as sorting on the full key.
+        youtube_results.sort(key=primary_key)
+
+        position = 0
+        for _, group in groupby(list(youtube_results), key=primary_key):
+            group = list(group)
+            if len(group) > 1:
+                for result in group:
+                    yt_channel = normalize(result.get('channel', ''))
+                    result['title_affinity'] = title_scorer(normalize(result.get('title', '')))
+                    result['channel_affinity'] = max((score(yt_channel) for score in artist_scorers), default=0.0)
+
+                group.sort(key=affinity_key)
+                youtube_results[position:position + len(group)] = group
+            position += len(group)
 
     def _extract_youtube_videos(self, html: str, limit: int) -> List[Dict]:
         """Extract videos from YouTube HTML"""
         try:
-            yt_match = re.search(r'var ytInitialData = ({.+?});', html, re.DOTALL)
+            yt_data = parse_initial_data(html)
 
-            if not yt_match:
+            if not yt_data:
                 logging.warning("ytInitialData not found in HTML")
                 return []
 
-            yt_data = json.loads(yt_match.group(1))
             results = []
 
             # Navigate the data structure
@@ -233,10 +588,10 @@ class YouTubeExtractor:
 
                             results.append(video_info)
                             
-                        if len(results) >= search_limit:
+                        if len(results) >= limit:
                             break
                 
-                if len(results) >= search_limit:
+                if len(results) >= limit:
                     break
 
             logging.info(f"Extracted {len(results)} video(s) from HTML")
@@ -4,6 +4,8 @@ import os
 import logging
 import tempfile
 import subprocess
+from pathlib import Path
+from typing import Dict, Optional
 
 
 # Internal utils
@@ -55,55 +57,62 @@ def convert_to_jpg_with_ffmpeg(input_data: bytes, output_path) -> bool:
         return False
 
 
-def add_cover_art(audio_path, cover_path) -> bool:
+def transcode_audio(source_path, output_path, quality: str, tags: Optional[Dict[str, str]] = None, cover_path=None) -> bool:
     """
-    Embed cover art into audio file using ffmpeg
+    Transcode, tag and embed the cover in a single ffmpeg run, so the final file is written once.
+
+    Args:
+        source_path: Audio downloaded by yt-dlp
+        output_path: Final .mp3 or .flac file, the codec follows the extension
+        quality (str): Audio quality ("320K", "192K", ... or "FLAC"), values below 10 are VBR levels
+        tags (Optional[Dict[str, str]]): Container metadata (title, artist, album, date, ...)
+        cover_path: JPG attached as front cover, None for no cover
+
+    Returns:
+        bool: True if the output file was produced
     """
-    try:
-        from pathlib import Path
-        audio_path_obj = Path(audio_path)
-        ext = audio_path_obj.suffix
-        temp_output = str(audio_path_obj.with_name(f"{audio_path_obj.stem}_temp{ext}"))
-        
-        ffmpeg_cmd = [
-            str(file_utils.ffmpeg_path),
-            '-i', str(audio_path),
-            '-i', str(cover_path),
-            '-map', '0:a',
+    output = Path(output_path)
+    is_mp3 = output.suffix.lower() == '.mp3'
+
+    ffmpeg_cmd = [str(file_utils.ffmpeg_path), '-y', '-i', str(source_path)]
+    if cover_path:
+        ffmpeg_cmd += ['-i', str(cover_path)]
+
+    # Only the first audio stream of the source, tags come from `tags` alone
+    ffmpeg_cmd += ['-map', '0:a:0', '-map_metadata', '-1']
+    if cover_path:
+        ffmpeg_cmd += [
             '-map', '1:0',
-            '-c', 'copy',
-            '-metadata:s:v', 'title="Album cover"',
-            '-metadata:s:v', 'comment="Cover (front)"',
-            '-disposition:v', 'attached_pic', 
-            '-y',
-            temp_output
+            '-c:v', 'copy',
+            '-metadata:s:v', 'title=Album cover',
+            '-metadata:s:v', 'comment=Cover (front)',
+            '-disposition:v', 'attached_pic'
         ]
-        
-        # Add ID3 version only for MP3
-        if ext.lower() == '.mp3':
-            ffmpeg_cmd.insert(5, '-id3v2_version')
-            ffmpeg_cmd.insert(6, '3')
-        
-        process = subprocess.run(
-            ffmpeg_cmd,
-            capture_output=True,
-            text=True
-        )
-        
-        if process.returncode == 0:
-            # Replace original file with new one
-            if os.path.exists(audio_path):
-                os.unlink(audio_path)
-            os.rename(temp_output, audio_path)
+
+    if is_mp3:
+        bitrate = quality.upper().replace('K', '')
+        ffmpeg_cmd += ['-c:a', 'libmp3lame']
+        ffmpeg_cmd += ['-q:a', bitrate] if bitrate.isdigit() and int(bitrate) < 10 else ['-b:a', f'{bitrate}k']
+        ffmpeg_cmd += ['-id3v2_version', '3']
+    else:
+        ffmpeg_cmd += ['-c:a', 'flac']
+
+    for key, value in (tags or {}).items():
+        if value:
+            ffmpeg_cmd += ['-metadata', f'{key}={value}']
+
+    ffmpeg_cmd.append(str(output))
+
+    try:
+        process = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
+        if process.returncode == 0 and output.exists():
             return True
-        else:
-            logging.error(f"FFmpeg embed failed: {process.stderr}")
-            if os.path.exists(temp_output):
-                os.unlink(temp_output)
-            return False
-            
+
+        logging.error(f"FFmpeg transcode failed: {process.stderr}")
+
     except Exception as e:
-        from rich.console import Console
-        Console().print(f"[red]Error embedding cover art: {e}[/red]")
-        logging.error(f"Error embedding cover art: {e}")
-        return False
\ No newline at end of file
+        logging.error(f"FFmpeg transcode failed: {e}")
+
+    if output.exists():
+        output.unlink()
+    return False
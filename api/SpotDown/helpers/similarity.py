@@ -0,0 +1,114 @@
+# 16.10.2026
+
+import difflib
+import logging
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+
+# Variable
+Scorer = Callable[[str], float]
+
+
+@lru_cache(maxsize=8192)
+def normalize(text: str) -> str:
+    """Lowercased text, cached since the same titles and channels come back across searches"""
+    return text.lower()
+
+
+@lru_cache(maxsize=2048)
+def split_artists(artists: str) -> Tuple[str, ...]:
+    """Normalized artists of a comma separated Spotify artist string"""
+    return tuple(artist.strip().lower() for artist in artists.split(','))
+
+
+class SimilarityEngine(ABC):
+    """Scores candidate strings against a fixed target, in [0, 1]"""
+    name = "base"
+
+    @abstractmethod
+    def scorer(self, target: str) -> Scorer:
+        """Build the scoring function of one target, reused for all of its candidates"""
+
+
+class DifflibEngine(SimilarityEngine):
+    """
+    Same values as difflib.SequenceMatcher(None, candidate, target).ratio().
+
+    The matcher indexes the target once and is reused for every candidate,
+    repeated candidates are answered from a per-target memo.
+    """
+    name = "difflib"
+
+    def scorer(self, target: str) -> Scorer:
+        matcher = difflib.SequenceMatcher(None)
+        matcher.set_seq2(target)
+        memo: Dict[str, float] = {}
+
+        def score(candidate: str) -> float:
+            value = memo.get(candidate)
+            if value is None:
+                matcher.set_seq1(candidate)
+                value = memo[candidate] = matcher.ratio()
+            return value
+
+        return score
+
+
+class RapidfuzzEngine(SimilarityEngine):
+    """
+    Indel similarity computed by rapidfuzz (C++).
+
+    Much faster than difflib but not numerically identical to it: close ties are
+    ordered differently, which changes the result order of 4 of the 30 tracks of
+    fixtures/ranking_corpus.json (see bench_ranking.py). Opt-in for that reason.
+    """
+    name = "rapidfuzz"
+
+    def __init__(self):
+        from rapidfuzz.distance import Indel
+        self._similarity = Indel.normalized_similarity
+
+    def scorer(self, target: str) -> Scorer:
+        similarity = self._similarity
+        return lambda candidate: similarity(candidate, target)
+
+
+ENGINES = {
+    DifflibEngine.name: DifflibEngine,
+    RapidfuzzEngine.name: RapidfuzzEngine,
+}
+
+
+def available_engines() -> List[str]:
+    names = []
+    for name, engine in ENGINES.items():
+        try:
+            engine()
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+def get_engine(name: str) -> SimilarityEngine:
+    """
+    Build a similarity engine by name, falling back to difflib.
+
+    Args:
+        name (str): Engine name ("difflib" or "rapidfuzz")
+
+    Returns:
+        SimilarityEngine: Requested engine, difflib if unknown or not installed
+    """
+    engine = ENGINES.get(name)
+    if engine is None:
+        logging.warning(f"Unknown similarity engine '{name}', using difflib")
+        return DifflibEngine()
+
+    try:
+        return engine()
+    except ImportError:
+        logging.warning(f"Similarity engine '{name}' is not installed, using difflib")
+        return DifflibEngine()
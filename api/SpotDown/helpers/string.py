@@ -1,6 +1,14 @@
 # 08.09.2025
 
 import re
+from typing import Dict, List
+from unidecode import unidecode
+
+
+# Variable
+version_suffix = re.compile(r'\s*(?:[-–]\s*[^-–]*\b(?:remaster(?:ed)?|deluxe|edition|mono|stereo|explicit|bonus track)\b.*$|[(\[][^)\]]*\b(?:remaster(?:ed)?|deluxe|edition|mono|stereo|explicit|bonus track)\b[^)\]]*[)\]])', re.IGNORECASE)
+non_alnum = re.compile(r'[^a-z0-9]+')
+
 
 def contains_emoji(text: str) -> bool:
     """
@@ -24,4 +32,29 @@ def contains_emoji(text: str) -> bool:
         "]+",
         flags=re.UNICODE
     )
-    return bool(emoji_pattern.search(text))
\ No newline at end of file
+    return bool(emoji_pattern.search(text))
+
+
+def normalize_title(title: str) -> str:
+    """
+    Comparable form of a track title: remaster/edition suffixes removed,
+    accents transliterated, lowercased and punctuation collapsed.
+    Live versions, remixes and edits stay distinct.
+    """
+    title = version_suffix.sub('', title or '')
+    return non_alnum.sub(' ', unidecode(title).lower().replace("'", '')).strip()
+
+
+def track_keys(track: Dict) -> List[str]:
+    """
+    Identity keys of a track, from the most to the least exact: ISRC, Spotify ID,
+    then normalized title and artist for tracks without IDs. Two tracks sharing
+    any key are considered the same recording.
+    """
+    keys = []
+    if track.get('isrc'):
+        keys.append(f"isrc:{track['isrc'].upper()}")
+    if track.get('spotify_id'):
+        keys.append(f"id:{track['spotify_id']}")
+    keys.append(f"title:{normalize_title(track.get('title', ''))}|{normalize_title(track.get('artist', ''))}")
+    return keys
@@ -11,8 +11,10 @@ from SpotDown.utils.config_json import config_manager
 from SpotDown.utils.console_utils import ConsoleUtils
 from SpotDown.upload.update import update as git_update
 from SpotDown.extractor.spotify_extractor import SpotifyExtractor
+from SpotDown.extractor.spotify_requests import SpotifyRateLimited
 from SpotDown.extractor.youtube_extractor import YouTubeExtractor
 from SpotDown.downloader.youtube_downloader import YouTubeDownloader
+from SpotDown.downloader.download_index import audio_ext, reuse_downloaded
 
 
 
@@ -33,12 +35,24 @@ def extract_spotify_data(spotify_url: str, max_retry: int = 3) -> Optional[Dict]
     return None
 
 
+def show_rate_limited(error: SpotifyRateLimited):
+    """Tell the user when Spotify will accept requests again"""
+    console.show_error(f"Spotify rate limit reached. Retry in {int(error.retry_after) or 1} seconds.")
+
+
 def search_on_youtube(query: str, spotify_info: Optional[Dict] = None, dj_priority: bool = False) -> List[Dict]:
     """Search for videos on YouTube and sort them by relevance"""
     with YouTubeExtractor() as youtube_extractor:
         return youtube_extractor.search(query, spotify_info, dj_priority)
 
 
+def already_downloaded(spotify_info: Dict, quality: str = "320K", subdirectory: Optional[str] = None) -> bool:
+    """Same recording (ISRC or Spotify ID) downloaded before, copied in place if needed, or a file with the same name"""
+    if reuse_downloaded(spotify_info, audio_ext(quality), subdirectory):
+        return True
+    return file_utils.is_song_already_downloaded(spotify_info.get('artist', ''), spotify_info.get('title', ''))
+
+
 def download_track(video_info: Dict, spotify_info: Dict, quality: str = "320K", progress_hook: Optional[Callable] = None, overwrite: bool = False, subdirectory: Optional[str] = None) -> bool:
     """Download a single track and add metadata"""
     downloader = YouTubeDownloader()
@@ -53,7 +67,7 @@ def download_track(video_info: Dict, spotify_info: Dict, quality: str = "320K",
     filename = file_utils.create_filename(artist, title)
 
     # Check if song already exists
-    if not overwrite and file_utils.is_song_already_downloaded(artist, title):
+    if not overwrite and already_downloaded(spotify_info, quality, subdirectory):
         console.show_info(f"[yellow]Already exists: {filename}")
         return False
     
@@ -73,9 +87,17 @@ def handle_playlist_download(tracks: List[Dict], max_results: int, dj_priority:
             'title': track.get('title', ''),
             'album': track.get('album', ''),
             'duration_seconds': int(track.get('duration_ms', 0)) // 1000 if track.get('duration_ms') else None,
-            'cover_url': track.get('cover_art', '')
+            'cover_url': track.get('cover_art', ''),
+            'isrc': track.get('isrc'),
+            'spotify_id': track.get('spotify_id')
         }
 
+        # Checked before searching: the recording may have been downloaded for another playlist
+        if already_downloaded(spotify_info):
+            filename = file_utils.create_filename(spotify_info['artist'], spotify_info['title'])
+            console.show_info(f"[yellow]Already exists: {filename}")
+            continue
+
         query = f"{spotify_info['artist']} {spotify_info['title']}"
         youtube_results = search_on_youtube(query, spotify_info, dj_priority)
 
@@ -122,15 +144,23 @@ def run():
 
     spotify_url, url_type = console.get_spotify_url()
 
-    if url_type == "playlist":
-        with SpotifyExtractor() as spotify_extractor:
-            tracks = spotify_extractor.extract_playlist_tracks(spotify_url)
+    if url_type in ("playlist", "artist"):
+        try:
+            with SpotifyExtractor() as spotify_extractor:
+                if url_type == "playlist":
+                    collection = spotify_extractor.extract_playlist_tracks(spotify_url)
+                else:
+                    collection = spotify_extractor.extract_artist_tracks(spotify_url)
+        except SpotifyRateLimited as e:
+            show_rate_limited(e)
+            return
+        tracks = collection.get('tracks', [])
             
         if not tracks:
-            console.show_error("No tracks found in playlist.")
+            console.show_error(f"No tracks found in {url_type}.")
             return
         
-        console.show_info(f"Found [green]{len(tracks)}[/green] tracks in playlist.")
+        console.show_info(f"Found [green]{len(tracks)}[/green] tracks in {url_type}.")
         if config_manager.get_bool("DOWNLOAD", "auto_first"):
             from SpotDown.downloader.batch_downloader import BatchDownloader
             console.show_info("Starting batch download for playlist")
@@ -140,7 +170,11 @@ def run():
         return
 
     if url_type == "track":
-        spotify_info = extract_spotify_data(spotify_url)
+        try:
+            spotify_info = extract_spotify_data(spotify_url)
+        except SpotifyRateLimited as e:
+            show_rate_limited(e)
+            return
 
         if not spotify_info:
             console.show_error("Can't extract data from Spotify.")
@@ -154,7 +188,7 @@ def run():
         artist = spotify_info.get('artist', '')
         title = spotify_info.get('title', '')
 
-        if file_utils.is_song_already_downloaded(artist, title):
+        if already_downloaded(spotify_info):
             filename = file_utils.create_filename(artist, title) + ".mp3"
             console.console.print(f"\n[red]Already exists: {filename}")
             return False
@@ -162,9 +196,5 @@ def run():
         handle_single_track_download(spotify_info)
         return
 
-    if url_type == "artist":
-        console.show_info("Artist download is not yet implemented.")
-        return
-
     console.show_error("Unsupported or invalid Spotify URL.")
     return
\ No newline at end of file
@@ -0,0 +1,117 @@
+# 16.10.2026
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Optional
+
+
+# Internal utils
+from SpotDown.utils.config_json import config_manager
+
+
+# Variable
+cache_file = config_manager.get("CACHE", "file")
+
+
+class DiskCache:
+    def __init__(self, namespace: str, ttl: int, max_entries: int, file_name: str = cache_file):
+        """
+        Persistent key/value cache stored in SQLite, with TTL and LRU eviction.
+
+        Values are stored as JSON, so only JSON-serializable data can be cached.
+        Each namespace is an independent table of the same database file.
+
+        Args:
+            namespace (str): Table name, one per kind of cached data
+            ttl (int): Seconds an entry stays valid
+            max_entries (int): Maximum entries kept, the least recently used are evicted first
+            file_name (str): Database file, relative paths are placed next to config.json
+        """
+        if os.path.isabs(file_name):
+            self.file_path = file_name
+        else:
+            self.file_path = os.path.join(os.path.dirname(config_manager.file_path), file_name)
+
+        self.table = f"cache_{namespace}"
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.file_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)")
+        self.conn.commit()
+        logging.info(f"DiskCache '{namespace}' initialized at {self.file_path}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, None if missing or expired"""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at < now:
+                self.conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self.conn.commit()
+                return None
+
+            self.conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value, `ttl` overrides the cache default for this entry"""
+        now = time.time()
+        data = json.dumps(value)
+        with self.lock:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)",
+                (key, data, now + (self.ttl if ttl is None else ttl), now)
+            )
+            self._evict(now)
+            self.conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self.conn.commit()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.conn.execute(f"DELETE FROM {self.table}")
+            self.conn.commit()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _evict(self, now: float):
+        """Drop expired entries and the least recently used ones above the limit, lock must be held"""
+        self.conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (now,))
+
+        count = self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
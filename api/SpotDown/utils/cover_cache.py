@@ -0,0 +1,184 @@
+# 16.10.2026
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# Internal utils
+from SpotDown.utils.config_json import config_manager
+from SpotDown.utils.http_client import get_http_client
+from SpotDown.helpers.ffmpeg import convert_to_jpg_with_ffmpeg
+
+
+# Variable
+cover_dir = config_manager.get("CACHE", "cover_dir")
+cover_max_mb = config_manager.get_int("CACHE", "cover_max_mb")
+cover_retry_after = config_manager.get_int("CACHE", "cover_retry_after")
+LOCK_STRIPES = 64
+
+_cover_cache: Optional["CoverCache"] = None
+_cover_cache_lock = threading.Lock()
+
+
+class CoverCache:
+    def __init__(self, directory: str = cover_dir, max_bytes: int = cover_max_mb * 1024 * 1024, retry_after: int = cover_retry_after):
+        """
+        Directory of cover images ready to embed, one JPG per image URL.
+
+        Tracks of the same album share their Spotify image, so each URL is downloaded
+        and converted once and the file is reused by every worker. The least recently
+        used covers are deleted once the directory grows above `max_bytes`, except the
+        ones pinned by a get() not released yet.
+
+        Args:
+            directory (str): Cache directory, relative paths are placed next to config.json
+            max_bytes (int): Disk usage above which old covers are evicted
+            retry_after (int): Seconds during which a URL that failed to download is not retried
+        """
+        if os.path.isabs(directory):
+            self.directory = Path(directory)
+        else:
+            self.directory = Path(os.path.dirname(config_manager.file_path)) / directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.retry_after = retry_after
+
+        # Striped locks: downloads of the same URL are serialized without keeping a lock per URL
+        self.lock = threading.Lock()
+        self.url_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self.failed: Dict[str, float] = {}
+        self.pinned: Dict[Path, int] = {}
+
+    def path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()[:32]}.jpg"
+
+    def get(self, url: str) -> Optional[Path]:
+        """
+        JPG of a cover image, downloaded and converted on first use.
+
+        Concurrent calls for the same URL wait for a single download. The returned
+        file is pinned: it is not evicted before release() is called with it.
+
+        Returns:
+            Optional[Path]: Cached file, None if the image could not be fetched
+        """
+        path = self.path(url)
+        self._pin(path)
+        if self._touch(path):
+            return path
+
+        with self.url_locks[hash(url) % LOCK_STRIPES]:
+            if self._touch(path):
+                return path
+
+            with self.lock:
+                failed_at = self.failed.get(url)
+            if failed_at is None or time.monotonic() - failed_at >= self.retry_after:
+                if self._download(url, path):
+                    with self.lock:
+                        self.failed.pop(url, None)
+                    self._evict()
+                    return path
+
+                with self.lock:
+                    self.failed[url] = time.monotonic()
+
+        self.release(path)
+        return None
+
+    def release(self, path: Path):
+        """Unpin a cover returned by get(), it can be evicted again"""
+        with self.lock:
+            count = self.pinned.get(path, 0) - 1
+            if count > 0:
+                self.pinned[path] = count
+            else:
+                self.pinned.pop(path, None)
+
+    def _pin(self, path: Path):
+        with self.lock:
+            self.pinned[path] = self.pinned.get(path, 0) + 1
+
+    def _touch(self, path: Path) -> bool:
+        """Mark a cover as used, False if it is not cached"""
+        try:
+            os.utime(path)
+            return True
+        except OSError:
+            return False
+
+    def _download(self, url: str, path: Path) -> bool:
+        """Fetch the image and store it as JPG, converting it with ffmpeg when needed"""
+        # Written next to the final file then renamed, readers never see a partial cover
+        temp_path = path.with_name(f"{path.stem}.{threading.get_ident()}.part.jpg")
+        try:
+            resp = get_http_client().get(url)
+            if resp.status_code != 200:
+                logging.warning(f"Failed to download cover image, status code: {resp.status_code}")
+                return False
+
+            # Check if it's WebP or needs conversion
+            content_type = resp.headers.get("content-type", "").lower()
+            is_webp = content_type.endswith("webp") or url.lower().endswith(".webp")
+
+            if is_webp or not content_type.startswith("image/jpeg"):
+                if not convert_to_jpg_with_ffmpeg(resp.content, temp_path):
+                    logging.warning("Failed to convert image with ffmpeg")
+                    return False
+            else:
+                temp_path.write_bytes(resp.content)
+
+            os.replace(temp_path, path)
+            logging.info(f"Cached cover {url} at {path}")
+            return True
+
+        except Exception as e:
+            logging.error(f"Unable to download cover: {e}")
+            return False
+
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+    def _evict(self):
+        """Delete the least recently used covers above the size limit, except the pinned ones"""
+        try:
+            covers = [
+                (stat.st_mtime, stat.st_size, entry)
+                for entry in self.directory.glob("*.jpg") if len(entry.stem) == 32
+                for stat in (entry.stat(),)
+            ]
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in covers)
+        for _, size, entry in sorted(covers, key=lambda cover: cover[0]):
+            if total <= self.max_bytes:
+                break
+
+            # Checked and deleted under the lock, a get() can't pin the cover in between
+            with self.lock:
+                if entry in self.pinned:
+                    continue
+                try:
+                    entry.unlink()
+                    total -= size
+                except OSError:
+                    pass
+
+
+def get_cover_cache() -> CoverCache:
+    """Process-wide cover cache, shared by every download worker"""
+    global _cover_cache
+
+    if _cover_cache is None:
+        with _cover_cache_lock:
+            if _cover_cache is None:
+                _cover_cache = CoverCache()
+
+    return _cover_cache
@@ -0,0 +1,80 @@
+# 16.10.2026
+
+import logging
+import threading
+from typing import Optional
+
+
+# External library
+import httpx
+
+
+# Internal utils
+from SpotDown.utils.headers import get_userAgent
+from SpotDown.utils.config_json import config_manager
+
+
+# Variable
+max_connections = config_manager.get_int("HTTP", "max_connections")
+max_keepalive = config_manager.get_int("HTTP", "max_keepalive")
+keepalive_expiry = config_manager.get_float("HTTP", "keepalive_expiry")
+timeout = config_manager.get_float("HTTP", "timeout")
+use_http2 = config_manager.get_bool("HTTP", "http2")
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional 'h2' package"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def client_options() -> dict:
+    """Keyword arguments shared by the sync and async pooled clients"""
+    return {
+        'http2': use_http2 and http2_available(),
+        'timeout': timeout,
+        'limits': httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        ),
+        'headers': {"User-Agent": get_userAgent()}
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Return the process-wide HTTP client.
+
+    The client keeps a pool of keep-alive connections shared by every
+    thread, so repeated requests to the same host skip the TCP/TLS handshake.
+
+    Returns:
+        httpx.Client: Shared client
+    """
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                options = client_options()
+                _client = httpx.Client(**options)
+                logging.info(f"Shared HTTP client created (http2={options['http2']}, max_connections={max_connections})")
+
+    return _client
+
+
+def close_http_client():
+    """Close the shared client, a new one is created on next use"""
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
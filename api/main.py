@@ -5,25 +5,32 @@ import traceback
 # Global crash handler wrapper
 try:
     import uuid
+    import json
+    import asyncio
     from typing import Optional, List, Dict
     from pydantic import BaseModel
-    from fastapi import FastAPI, HTTPException, BackgroundTasks
+    from fastapi import FastAPI, HTTPException
     from fastapi.middleware.cors import CORSMiddleware
     from fastapi.staticfiles import StaticFiles
-    from fastapi.responses import FileResponse
+    from fastapi.responses import FileResponse, StreamingResponse
     import logging
     from dotenv import load_dotenv
 
     # Añadir el directorio actual al path para poder importar SpotDown
     sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-    from SpotDown.extractor.spotify_extractor import SpotifyExtractor
-    from SpotDown.main import search_on_youtube, download_track
+    from SpotDown.extractor.spotify_extractor import SpotifyExtractor, reset_spotify_client, extract_playlist_id
+    from SpotDown.extractor.spotify_requests import SpotifyRateLimited
+    from SpotDown.downloader.scheduler import DownloadScheduler, DownloadJob
+    from SpotDown.downloader.progress import ProgressRegistry, FINAL_STATUSES
+    from SpotDown.downloader.job_store import JobStore, resumed_states, unstored_pages
+    from SpotDown.downloader.ydl_pool import get_ydl_pool
+    from SpotDown.downloader.info_cache import get_info_cache
+    from SpotDown.downloader.playlist_sync import PlaylistSyncStore, PlaylistDiff, prune_files, prune_default
     from SpotDown.utils.console_utils import ConsoleUtils
     from SpotDown.utils.os import file_utils
     from SpotDown.utils.text_parser import parse_tracklist
     import SpotDown
-    import yt_dlp
 
     # Configure logging
     log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend.log")
@@ -52,8 +59,115 @@ try:
         allow_headers=["*"],
     )
 
-    # Global dictionary to store download progress
-    download_progress: Dict[str, Dict] = {}
+    # Global registry to store download progress
+    download_progress = ProgressRegistry()
+
+    # Bounded resolve/download/postprocess pipeline shared by all download jobs
+    scheduler = DownloadScheduler()
+
+    # Persistent job store, unfinished jobs are resumed on startup
+    job_store = JobStore()
+
+    # Last synced snapshot and tracks of each playlist downloaded in sync mode
+    playlist_sync_store = PlaylistSyncStore()
+
+    @app.on_event("startup")
+    def resume_jobs():
+        """Resume the download jobs interrupted by the last shutdown"""
+        for stored in job_store.unfinished_jobs():
+            finished_tracks = resumed_states(stored["states"])
+            logging.info(f"Resuming job {stored['task_id']} ({len(finished_tracks)}/{len(stored['tracks'])} tracks already done)")
+
+            progress = stored["progress"]
+            progress["status"] = "starting"
+            if not stored["single"]:
+                progress["current_track"] = len(finished_tracks)
+            download_progress.create(stored["task_id"], **progress)
+
+            source = stored["source"] or {}
+            if source.get("spotify_url") and (stored["extracting"] or source.get("kind") == "sync"):
+                # The stored track list may be partial: extract the collection again in the request pool
+                scheduler.submit_request(stored["task_id"], download_progress, lambda stored=stored, finished_tracks=finished_tracks: resume_extraction(stored, finished_tracks))
+                continue
+
+            scheduler.submit(DownloadJob(
+                stored["task_id"],
+                stored["tracks"],
+                download_progress,
+                stored["quality"],
+                stored["dj_priority"],
+                subdirectory=stored["subdirectory"],
+                single=stored["single"],
+                video_info=stored["video_info"],
+                store=job_store,
+                finished_tracks=finished_tracks,
+                source=stored["source"]
+            ))
+
+    def resume_extraction(stored: Dict, finished_tracks: Dict[int, bool]):
+        """
+        Resume a collection job whose extraction was interrupted, or a sync job.
+
+        The collection is extracted again and only the tracks the job did not store yet
+        are appended. Sync jobs always go through this path: their completion callback
+        needs the diff of the whole current snapshot.
+        """
+        source = stored["source"]
+        url = source["spotify_url"]
+        on_complete = None
+
+        if source.get("kind") == "sync":
+            playlist_id = extract_playlist_id(url)
+            with SpotifyExtractor() as extractor:
+                collection_data = extractor.stream_playlist_tracks(url, fresh=True)
+            if not collection_data:
+                raise ValueError("No se encontraron canciones en Playlist")
+
+            diff = PlaylistDiff(playlist_sync_store.get(playlist_id))
+            pages = diff.added_pages(collection_data['pages'])
+            on_complete = sync_callback(playlist_id, stored["subdirectory"], source.get("prune", prune_default), diff, collection_data)
+        else:
+            collection_data, _ = stream_collection(url)
+            pages = collection_data.get('pages', iter(()))
+
+        job = DownloadJob(
+            stored["task_id"],
+            stored["tracks"],
+            download_progress,
+            stored["quality"],
+            stored["dj_priority"],
+            subdirectory=stored["subdirectory"],
+            store=job_store,
+            finished_tracks=finished_tracks,
+            extracting=True,
+            on_complete=on_complete,
+            source=source
+        )
+        scheduler.submit(job, unstored_pages(pages, stored["tracks"]))
+
+    def stream_collection(url: str):
+        """Start extracting a Spotify playlist, album or artist, returns the collection data and its type label"""
+        with SpotifyExtractor() as extractor:
+            if "playlist" in url:
+                return extractor.stream_playlist_tracks(url), "Playlist"
+            elif "album" in url:
+                return extractor.stream_album_tracks(url), "Álbum"
+            return extractor.stream_artist_tracks(url), "Artista"
+
+    def sync_callback(playlist_id: str, subdirectory: str, prune: bool, diff: PlaylistDiff, collection_data: Dict):
+        """Completion callback of a sync job: records the synced tracks and prunes the removed ones"""
+        def finish_sync(job):
+            downloaded = {diff.key(job.tracks[idx]) for idx, success in job.results.items() if success}
+            synced = diff.synced(downloaded)
+            removed = diff.removed()
+            if prune and removed:
+                logging.info(f"Pruned {prune_files(subdirectory, removed)} file(s) removed from playlist {playlist_id}")
+
+            # The snapshot is only remembered once every track is present, failed ones are retried next time
+            snapshot = collection_data.get('snapshot_id') if diff.fully_synced(synced) else None
+            playlist_sync_store.save(playlist_id, snapshot, subdirectory, synced)
+
+        return finish_sync
 
     class SpotifyUrl(BaseModel):
         url: str
@@ -64,6 +178,8 @@ try:
         tracklist_mode: bool = False
         tracks: Optional[List[Dict]] = None
         djPriority: bool = False
+        sync: bool = False
+        prune: Optional[bool] = None
 
     class TracklistRequest(BaseModel):
         text: str
@@ -102,9 +218,30 @@ try:
         os.environ["SPOTIPY_CLIENT_SECRET"] = settings.client_secret
         if settings.download_path:
             os.environ["DOWNLOAD_PATH"] = settings.download_path
+
+        # The shared Spotify client is rebuilt with the new credentials on next use
+        reset_spotify_client()
         
         return {"status": "saved"}
 
+    def rate_limited(e: SpotifyRateLimited) -> HTTPException:
+        """429 answer telling the client when Spotify accepts requests again"""
+        return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(int(e.retry_after))})
+
+    def playlist_entry_track(entry: Dict, playlist: Dict) -> Dict:
+        """Track dict of a flat yt-dlp playlist entry, flagged for direct download from its own URL"""
+        entry_url = entry.get('url') or entry.get('webpage_url')
+        return {
+            "title": entry.get('title'),
+            "artist": entry.get('uploader') or entry.get('artist') or entry.get('channel') or "Unknown",
+            "album": entry.get('album') or playlist.get('title') or "Unknown Album",
+            "duration_seconds": entry.get('duration'),
+            "cover_url": entry.get('thumbnail'),
+            "url": entry_url,
+            "original_url": entry_url,
+            "direct": bool(entry_url)
+        }
+
     @app.post("/api/info")
     def get_spotify_info(data: SpotifyUrl):
         """
@@ -124,6 +261,8 @@ try:
                             return {"type": "track", "data": info}
                         else:
                             raise HTTPException(status_code=404, detail="Track not found")
+                except SpotifyRateLimited as e:
+                    raise rate_limited(e)
                 except Exception as e:
                     raise HTTPException(status_code=400, detail=str(e))
             elif "playlist" in url:
@@ -134,6 +273,8 @@ try:
                             return {"type": "playlist", "data": playlist_data, "count": len(playlist_data['tracks'])}
                         else:
                             raise HTTPException(status_code=404, detail="No se encontraron canciones en la playlist")
+                except SpotifyRateLimited as e:
+                    raise rate_limited(e)
                 except Exception as e:
                     raise HTTPException(status_code=500, detail=str(e))
             
@@ -145,6 +286,21 @@ try:
                             return {"type": "playlist", "data": album_data, "count": len(album_data['tracks'])}
                         else:
                             raise HTTPException(status_code=404, detail="No se encontraron canciones en el álbum")
+                except SpotifyRateLimited as e:
+                    raise rate_limited(e)
+                except Exception as e:
+                    raise HTTPException(status_code=500, detail=str(e))
+
+            elif "artist" in url:
+                try:
+                    with SpotifyExtractor() as extractor:
+                        artist_data = extractor.extract_artist_tracks(url)
+                        if artist_data and artist_data.get('tracks'):
+                            return {"type": "playlist", "data": artist_data, "count": len(artist_data['tracks'])}
+                        else:
+                            raise HTTPException(status_code=404, detail="No se encontraron canciones del artista")
+                except SpotifyRateLimited as e:
+                    raise rate_limited(e)
                 except Exception as e:
                     raise HTTPException(status_code=500, detail=str(e))
             else:
@@ -160,23 +316,16 @@ try:
                     'ffmpeg_location': ffmpeg_dir,
                     'extract_flat': 'in_playlist' # Extract playlist entries without downloading
                 }
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                with get_ydl_pool().session(ydl_opts) as ydl:
                     info = ydl.extract_info(url, download=False)
                     
+                    if 'entries' not in info:
+                        # Reused by /api/download and the downloader instead of extracting the page again
+                        get_info_cache().put(info, url)
+
                     if 'entries' in info:
                         # It's a playlist
-                        tracks = []
-                        for entry in info['entries']:
-                            if not entry: continue
-                            tracks.append({
-                                "title": entry.get('title'),
-                                "artist": entry.get('uploader') or entry.get('artist') or entry.get('channel') or "Unknown",
-                                "album": entry.get('album') or info.get('title') or "Unknown Album",
-                                "duration_seconds": entry.get('duration'),
-                                "cover_url": entry.get('thumbnail'),
-                                "url": entry.get('url') or entry.get('webpage_url'),
-                                "original_url": entry.get('url') or entry.get('webpage_url')
-                            })
+                        tracks = [playlist_entry_track(entry, info) for entry in info['entries'] if entry]
                         
                         playlist_data = {
                             "title": info.get('title'),
@@ -207,107 +356,25 @@ try:
         return {"tracks": tracks, "count": len(tracks)}
 
     @app.post("/api/download")
-    async def start_download(request: DownloadRequest, background_tasks: BackgroundTasks):
+    async def start_download(request: DownloadRequest):
         task_id = str(uuid.uuid4())
-        
-        # --- Helper for batch download ---
-        def batch_download_wrapper(tracks, quality, task_id, dj_priority=False, subdirectory=None):
-            total = len(tracks)
-            success_count = 0
-            
-            for i, track in enumerate(tracks):
-                try:
-                    # Update progress for current track
-                    download_progress[task_id]["current_track"] = i + 1
-                    download_progress[task_id]["status"] = "downloading"
-                    download_progress[task_id]["filename"] = f"{track.get('artist', 'Unknown')} - {track.get('title', 'Unknown')}"
-                    download_progress[task_id]["percent"] = 0 # Reset for new track
-                    
-                    # Determine if we need to search on YouTube or if we have a direct URL
-                    direct_url = track.get('url') or track.get('original_url')
-                    is_spotify_track = "spotify.com" in (direct_url or "")
-                    
-                    video_info_to_download = None
-                    
-                    # If it's a manual tracklist item (no URL) or Spotify, we search
-                    if not direct_url or is_spotify_track or ("youtube" not in direct_url and "soundcloud" not in direct_url):
-                         # Search on YouTube logic
-                         query = f"{track['artist']} {track['title']}"
-                         # Adapt track dict keys if needed
-                         # Ensure cover_url is present for the downloader
-                         track['cover_url'] = track.get('cover_art') or track.get('cover_url')
-                         
-                         youtube_results = search_on_youtube(query, track, dj_priority)
-                         if youtube_results:
-                             best_match = youtube_results[0]
-                             video_info_to_download = best_match
-                             # Get cover art from YouTube thumbnail
-                             if not track.get('cover_url') and best_match.get('thumbnail'):
-                                 track['cover_url'] = best_match.get('thumbnail')
-                         else:
-                             continue
-                    else:
-                        # Generic playlist track (SoundCloud/YouTube) - Direct Download
-                        # We construct a video_info dict from the track info
-                        video_info_to_download = {
-                            'url': direct_url,
-                            'title': track.get('title'),
-                            'uploader': track.get('artist'),
-                            'webpage_url': direct_url
-                        }
-
-                    if video_info_to_download:
-                        # Define a per-track progress hook
-                        def track_hook(d):
-                            if d['status'] == 'downloading':
-                                try:
-                                    p = 0
-                                    if d.get('total_bytes'):
-                                        p = d['downloaded_bytes'] / d['total_bytes'] * 100
-                                    elif d.get('total_bytes_estimate'):
-                                        p = d['downloaded_bytes'] / d['total_bytes_estimate'] * 100
-                                    else:
-                                        import re
-                                        p_str = d.get('_percent_str', '0%').replace('%','')
-                                        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-                                        p_str = ansi_escape.sub('', p_str)
-                                        p = float(p_str)
-                                    
-                                    # Update global progress (we could average it, but for now just show current track percent)
-                                    download_progress[task_id]["percent"] = p
-                                except Exception:
-                                    pass
-                            elif d['status'] == 'finished':
-                                download_progress[task_id]["percent"] = 100
-
-                        # Download
-                        # Ensure spotify_info (track) has cover_url
-                        if download_track(video_info_to_download, track, quality, track_hook, overwrite=True, subdirectory=subdirectory):
-                            success_count += 1
-                except Exception as e:
-                    print(f"Error downloading {track.get('title')}: {e}")
-                    download_progress[task_id]["error"] = str(e)
-                    # Continue to next track
-            
-            # Finish task
-            download_progress[task_id]["status"] = "completed"
-            download_progress[task_id]["percent"] = 100
-            download_progress[task_id]["message"] = f"Descarga completada. {success_count}/{total} canciones descargadas."
 
         # --- Main Download Logic ---
         
         # Check if it's a manual tracklist download
         if request.tracklist_mode and request.tracks:
             # Initialize progress
-            download_progress[task_id] = {
-                "status": "starting",
-                "percent": 0,
-                "filename": "Tracklist Download",
-                "total_tracks": len(request.tracks),
-                "current_track": 0
-            }
+            download_progress.create(
+                task_id,
+                status="starting",
+                percent=0,
+                filename="Tracklist Download",
+                total_tracks=len(request.tracks),
+                current_track=0
+            )
             
-            background_tasks.add_task(batch_download_wrapper, request.tracks, request.quality, task_id, request.djPriority)
+            # submit() persists the job in SQLite, kept off the event loop
+            await asyncio.to_thread(scheduler.submit, DownloadJob(task_id, request.tracks, download_progress, request.quality, request.djPriority, store=job_store))
             
             return {
                 "status": "started",
@@ -315,6 +382,28 @@ try:
                 "message": f"Iniciando descarga de {len(request.tracks)} canciones..."
             }
 
+        if not request.spotify_url:
+            raise HTTPException(status_code=400, detail="Falta la URL a descargar")
+
+        # Spotify and yt-dlp extraction block for seconds: it runs in the scheduler's
+        # request pool and the client follows the task through /api/progress
+        download_progress.create(
+            task_id,
+            status="starting",
+            percent=0,
+            filename=request.spotify_url,
+            message="Obteniendo información..."
+        )
+        scheduler.submit_request(task_id, download_progress, lambda: resolve_download(task_id, request))
+
+        return {
+            "status": "started",
+            "task_id": task_id,
+            "message": "Obteniendo información..."
+        }
+
+    def resolve_download(task_id: str, request: DownloadRequest):
+        """Extract the metadata of a download request and submit its job, errors end up in the task progress"""
         url = request.spotify_url
         quality = request.quality
         dj_priority = request.djPriority
@@ -322,259 +411,215 @@ try:
         if "spotify.com" in url:
             if "track" in url:
                 # --- Single Track Logic (Spotify) ---
-                try:
-                    with SpotifyExtractor() as extractor:
-                        spotify_info = extractor.extract_track_info(url)
-                    
-                    if not spotify_info:
-                        raise HTTPException(status_code=404, detail="No se pudo obtener info de Spotify")
-                    
-                    # Buscar en YouTube
-                    query = f"{spotify_info['artist']} {spotify_info['title']}"
-                    youtube_results = search_on_youtube(query, spotify_info, dj_priority)
-                    
-                    if not youtube_results:
-                        raise HTTPException(status_code=404, detail="No se encontraron resultados en YouTube")
-                    
-                    best_match = youtube_results[0]
-                    video_info = best_match
-                    
-                    # Inicializar progreso
-                    download_progress[task_id] = {
-                        "status": "starting",
-                        "percent": 0,
-                        "filename": f"{spotify_info['artist']} - {spotify_info['title']}"
-                    }
-                    
-                    # Define hook
-                    def progress_hook(d):
-                        if d['status'] == 'downloading':
-                            try:
-                                p = 0
-                                if d.get('total_bytes'):
-                                    p = d['downloaded_bytes'] / d['total_bytes'] * 100
-                                elif d.get('total_bytes_estimate'):
-                                    p = d['downloaded_bytes'] / d['total_bytes_estimate'] * 100
-                                else:
-                                    import re
-                                    p_str = d.get('_percent_str', '0%').replace('%','')
-                                    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-                                    p_str = ansi_escape.sub('', p_str)
-                                    p = float(p_str)
-                                
-                                download_progress[task_id]["percent"] = p
-                                download_progress[task_id]["status"] = "downloading"
-                            except Exception:
-                                pass
-                        elif d['status'] == 'finished':
-                            download_progress[task_id]["percent"] = 100
-                            download_progress[task_id]["status"] = "processing"
-                    
-                    # Wrapper
-                    def download_wrapper(video_info, spotify_info, quality, hook):
-                        try:
-                            success = download_track(video_info, spotify_info, quality, hook, overwrite=True)
-                            if success:
-                                download_progress[task_id]["status"] = "completed"
-                                download_progress[task_id]["percent"] = 100
-                            else:
-                                download_progress[task_id]["status"] = "error"
-                        except Exception as e:
-                            download_progress[task_id]["status"] = "error"
-                            download_progress[task_id]["error"] = str(e)
-
-                    background_tasks.add_task(download_wrapper, video_info, spotify_info, quality, progress_hook)
-                    
-                    return {
-                        "status": "started", 
-                        "task_id": task_id,
-                        "message": f"Descargando {spotify_info['title']}..."
-                    }
-                except Exception as e:
-                     raise HTTPException(status_code=500, detail=str(e))
+                with SpotifyExtractor() as extractor:
+                    spotify_info = extractor.extract_track_info(url)
+                
+                if not spotify_info:
+                    raise ValueError("No se pudo obtener info de Spotify")
+                
+                # Inicializar progreso
+                download_progress.create(
+                    task_id,
+                    status="starting",
+                    percent=0,
+                    filename=f"{spotify_info['artist']} - {spotify_info['title']}"
+                )
+
+                # The YouTube search runs in the resolve stage of the pipeline
+                scheduler.submit(DownloadJob(task_id, [spotify_info], download_progress, quality, dj_priority, single=True, store=job_store))
+
+            elif "playlist" in url and request.sync:
+                # --- Playlist Sync (Spotify) ---
+                playlist_id = extract_playlist_id(url)
+                previous = playlist_sync_store.get(playlist_id) if playlist_id else None
+
+                with SpotifyExtractor() as extractor:
+                    # Unchanged snapshot: nothing to extract or download
+                    snapshot_id = extractor.playlist_snapshot(url)
+                    if previous and snapshot_id and previous["snapshot_id"] == snapshot_id:
+                        download_progress.create(
+                            task_id,
+                            status="completed",
+                            percent=100,
+                            filename=f"Playlist: {previous['subdirectory'] or 'Unknown'}",
+                            total_tracks=0,
+                            current_track=0,
+                            completed_tracks=0,
+                            message="La playlist ya está sincronizada."
+                        )
+                        return
+
+                    collection_data = extractor.stream_playlist_tracks(url, fresh=True)
+
+                if not collection_data:
+                    raise ValueError("No se encontraron canciones en Playlist")
+
+                # Keep downloading into the folder of the first sync even if the playlist was renamed
+                subdirectory = previous["subdirectory"] if previous and previous["subdirectory"] else collection_data.get('title', 'Playlist')
+                prune = request.prune if request.prune is not None else prune_default
+                diff = PlaylistDiff(previous)
+                pages = diff.added_pages(collection_data['pages'])
+                tracks = next(pages, [])
+
+                download_progress.create(
+                    task_id,
+                    status="starting",
+                    percent=0,
+                    filename=f"Playlist: {collection_data.get('title', 'Unknown')}",
+                    total_tracks=max(0, collection_data.get('total_tracks', 0) - len(diff.known)),
+                    current_track=0,
+                    message="Sincronizando playlist..."
+                )
+
+                job = DownloadJob(
+                    task_id, tracks, download_progress, quality, dj_priority, subdirectory=subdirectory, store=job_store, extracting=True,
+                    on_complete=sync_callback(playlist_id, subdirectory, prune, diff, collection_data),
+                    source={"spotify_url": url, "kind": "sync", "prune": prune}
+                )
+                scheduler.submit(job, pages)
+
+            elif "playlist" in url or "album" in url or "artist" in url:
+                # --- Playlist/Album/Artist Logic (Spotify) ---
+                collection_data, collection_type = stream_collection(url)
+
+                total_tracks = collection_data.get('total_tracks', 0)
+                if not total_tracks:
+                    raise ValueError(f"No se encontraron canciones en {collection_type}")
+
+                # The first page comes with the collection, the rest is extracted while downloading
+                pages = collection_data['pages']
+                tracks = next(pages, [])
+                
+                # Inicializar progreso
+                download_progress.create(
+                    task_id,
+                    status="starting",
+                    percent=0,
+                    filename=f"{collection_type}: {collection_data.get('title', 'Unknown')}",
+                    total_tracks=total_tracks,
+                    current_track=0,
+                    message=f"Iniciando descarga de {total_tracks} canciones..."
+                )
+
+                job = DownloadJob(task_id, tracks, download_progress, quality, dj_priority, subdirectory=collection_data.get('title', 'Playlist'), store=job_store, extracting=True, source={"spotify_url": url, "kind": "collection"})
+                scheduler.submit(job, pages)
 
-            elif "playlist" in url or "album" in url:
-                # --- Playlist/Album Logic (Spotify) ---
-                try:
-                    with SpotifyExtractor() as extractor:
-                        if "playlist" in url:
-                            collection_data = extractor.extract_playlist_tracks(url)
-                            collection_type = "Playlist"
-                        else:
-                            collection_data = extractor.extract_album_tracks(url)
-                            collection_type = "Álbum"
-                    
-                    tracks = collection_data.get('tracks', [])
-                    if not tracks:
-                        raise HTTPException(status_code=404, detail=f"No se encontraron canciones en {collection_type}")
-                    
-                    # Inicializar progreso
-                    download_progress[task_id] = {
-                        "status": "starting",
-                        "percent": 0,
-                        "filename": f"{collection_type}: {collection_data.get('title', 'Unknown')}",
-                        "total_tracks": len(tracks),
-                        "current_track": 0
-                    }
-
-                    background_tasks.add_task(batch_download_wrapper, tracks, quality, task_id, dj_priority, subdirectory=collection_data.get('title', 'Playlist'))
-                    
-                    return {
-                        "status": "started", 
-                        "task_id": task_id,
-                        "message": f"Iniciando descarga de {len(tracks)} canciones..."
-                    }
-                except Exception as e:
-                    raise HTTPException(status_code=500, detail=str(e))
+            else:
+                raise ValueError("Unsupported Spotify URL type")
 
         else:
             # Assume it's YouTube/SoundCloud/Other supported by yt-dlp
-            try:
-                import os
-                ffmpeg_dir = os.path.dirname(file_utils.ffmpeg_path) if file_utils.ffmpeg_path else None
-                ydl_opts = {
-                    'quiet': True,
-                    'ffmpeg_location': ffmpeg_dir,
-                    'extract_flat': 'in_playlist'
-                }
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            ffmpeg_dir = os.path.dirname(file_utils.ffmpeg_path) if file_utils.ffmpeg_path else None
+            ydl_opts = {
+                'quiet': True,
+                'ffmpeg_location': ffmpeg_dir,
+                'extract_flat': 'in_playlist'
+            }
+            info = get_info_cache().get(url)
+            if info is None:
+                with get_ydl_pool().session(ydl_opts) as ydl:
                     info = ydl.extract_info(url, download=False)
-                
-                if 'entries' in info:
-                    # --- Generic Playlist ---
-                    tracks = []
-                    for entry in info['entries']:
-                        if not entry: continue
-                        tracks.append({
-                            "title": entry.get('title'),
-                            "artist": entry.get('uploader') or entry.get('artist') or "Unknown",
-                            "album": entry.get('album') or info.get('title') or "Unknown Album",
-                            "percent": 0,
-                            "filename": f"{entry.get('uploader', 'Unknown')} - {entry.get('title', 'Unknown')}"
-                        })
-                    
-                    # Definir hook de progreso
-                    def progress_hook(d):
-                        if d['status'] == 'downloading':
-                            try:
-                                p = 0
-                                if d.get('total_bytes'):
-                                    p = d['downloaded_bytes'] / d['total_bytes'] * 100
-                                elif d.get('total_bytes_estimate'):
-                                    p = d['downloaded_bytes'] / d['total_bytes_estimate'] * 100
-                                else:
-                                    import re
-                                    p_str = d.get('_percent_str', '0%').replace('%','')
-                                    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-                                    p_str = ansi_escape.sub('', p_str)
-                                    p = float(p_str)
-                                
-                                download_progress[task_id]["percent"] = p
-                                download_progress[task_id]["status"] = "downloading"
-                            except Exception as e:
-                                print(f"Error in progress hook: {e}")
-                        elif d['status'] == 'finished':
-                            download_progress[task_id]["percent"] = 100
-                            download_progress[task_id]["status"] = "processing"
-                    
-                    # Wrapper
-                    def download_wrapper(video_info, spotify_info, quality, hook):
-                        try:
-                            success = download_track(video_info, spotify_info, quality, hook, overwrite=True)
-                            if success:
-                                download_progress[task_id]["status"] = "completed"
-                                download_progress[task_id]["percent"] = 100
-                            else:
-                                download_progress[task_id]["status"] = "error"
-                        except Exception as e:
-                            download_progress[task_id]["status"] = "error"
-                            download_progress[task_id]["error"] = str(e)
-
-                    # Ejecutar descarga en background
-                    background_tasks.add_task(batch_download_wrapper, tracks, quality, task_id, subdirectory=info.get('title', 'Playlist'))
-                    
-                    response = {
-                        "status": "started", 
-                        "task_id": task_id,
-                        "message": f"Descargando playlist de {len(tracks)} canciones..."
-                    }
-                    return response
+            
+            if 'entries' in info:
+                # --- Generic Playlist ---
+                # Entries keep their own URL: downloaded directly, without a YouTube search each
+                tracks = [playlist_entry_track(entry, info) for entry in info['entries'] if entry]
+
+                # Inicializar progreso
+                download_progress.create(
+                    task_id,
+                    status="starting",
+                    percent=0,
+                    filename=f"Playlist: {info.get('title', 'Unknown')}",
+                    total_tracks=len(tracks),
+                    current_track=0,
+                    message=f"Descargando playlist de {len(tracks)} canciones..."
+                )
+
+                # Ejecutar descarga en background
+                scheduler.submit(DownloadJob(task_id, tracks, download_progress, quality, subdirectory=info.get('title', 'Playlist'), store=job_store))
 
+            else:
+                # --- Generic Single Video ---
+                # The downloader takes the extracted info from the cache, only the download is left
+                page_url = info.get('webpage_url') or url
+                get_info_cache().put(info, url, page_url)
+                video_info = {
+                    'url': page_url,
+                    'title': info.get('title'),
+                    'uploader': info.get('uploader'),
+                    'thumbnail': info.get('thumbnail'),
+                    'webpage_url': page_url
+                }
+                spotify_info = {
+                    "title": info.get('title'),
+                    "artist": info.get('uploader') or info.get('artist') or "Unknown",
+                    "album": info.get('album') or "Single",
+                    "cover_url": info.get('thumbnail'),
+                    "url": url
+                }
+
+                # Inicializar progreso
+                download_progress.create(
+                    task_id,
+                    status="starting",
+                    percent=0,
+                    filename=f"{spotify_info['artist']} - {spotify_info['title']}"
+                )
+
+                scheduler.submit(DownloadJob(task_id, [spotify_info], download_progress, quality, single=True, video_info=video_info, store=job_store))
+
+    @app.get("/api/progress/stream")
+    async def stream_progress(task_ids: str, interval: float = 0.5):
+        """
+        Server-Sent Events stream of progress updates for one or more tasks.
+        Changes are coalesced: at most one event per task every `interval` seconds,
+        and only when something changed since the last event.
+        """
+        ids = [task_id for task_id in task_ids.split(",") if task_id]
+        if not ids:
+            raise HTTPException(status_code=400, detail="task_ids is required")
+        interval = min(max(interval, 0.1), 5.0)
+
+        async def event_stream():
+            last_version = 0
+            pending = set(ids)
+            idle = 0.0
+
+            # Unknown tasks are reported once and not followed
+            for task_id in ids:
+                if download_progress.get(task_id) is None:
+                    pending.discard(task_id)
+                    yield f"event: progress\ndata: {json.dumps({'task_id': task_id, 'status': 'not_found'})}\n\n"
+
+            while pending:
+                last_version, changed = download_progress.changes_since(pending, last_version)
+                for task_id, data in changed.items():
+                    yield f"event: progress\ndata: {json.dumps({'task_id': task_id, **data})}\n\n"
+                    if data.get("status") in FINAL_STATUSES:
+                        pending.discard(task_id)
+
+                if changed:
+                    idle = 0.0
                 else:
-                    # --- Generic Single Video ---
-                    video_info = info
-                    # Ensure 'url' key exists for the downloader
-                    if 'url' not in video_info:
-                        video_info['url'] = info.get('webpage_url') or url
-                    spotify_info = {
-                        "title": info.get('title'),
-                        "artist": info.get('uploader') or info.get('artist') or "Unknown",
-                        "album": info.get('album') or "Single",
-                        "cover_url": info.get('thumbnail'),
-                        "url": url
-                    }
-
-                    # Inicializar progreso
-                    download_progress[task_id] = {
-                        "status": "starting",
-                        "percent": 0,
-                        "filename": f"{spotify_info['artist']} - {spotify_info['title']}"
-                    }
-
-                    # Define hook
-                    def progress_hook(d):
-                        if d['status'] == 'downloading':
-                            try:
-                                p = 0
-                                if d.get('total_bytes'):
-                                    p = d['downloaded_bytes'] / d['total_bytes'] * 100
-                                elif d.get('total_bytes_estimate'):
-                                    p = d['downloaded_bytes'] / d['total_bytes_estimate'] * 100
-                                else:
-                                    import re
-                                    p_str = d.get('_percent_str', '0%').replace('%','')
-                                    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-                                    p_str = ansi_escape.sub('', p_str)
-                                    p = float(p_str)
-                                
-                                download_progress[task_id]["percent"] = p
-                                download_progress[task_id]["status"] = "downloading"
-                            except Exception:
-                                pass
-                        elif d['status'] == 'finished':
-                            download_progress[task_id]["percent"] = 100
-                            download_progress[task_id]["status"] = "processing"
-
-                    # Wrapper
-                    def download_wrapper(video_info, spotify_info, quality, hook):
-                        try:
-                            success = download_track(video_info, spotify_info, quality, hook, overwrite=True)
-                            if success:
-                                download_progress[task_id]["status"] = "completed"
-                                download_progress[task_id]["percent"] = 100
-                            else:
-                                download_progress[task_id]["status"] = "error"
-                        except Exception as e:
-                            download_progress[task_id]["status"] = "error"
-                            download_progress[task_id]["error"] = str(e)
-
-                    background_tasks.add_task(download_wrapper, video_info, spotify_info, quality, progress_hook)
-                    
-                    return {
-                        "status": "started", 
-                        "task_id": task_id,
-                        "message": f"Descargando {spotify_info['title']}..."
-                    }
-                
-            except Exception as e:
-                print(f"DEBUG: Exception in download_song: {e}")
-                import traceback
-                traceback.print_exc()
-                raise HTTPException(status_code=500, detail=str(e))
+                    idle += interval
+                    if idle >= 15:
+                        # Keep proxies from closing an idle connection
+                        yield ": keep-alive\n\n"
+                        idle = 0.0
+
+                if pending:
+                    await asyncio.sleep(interval)
+
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
 
     @app.get("/api/progress/{task_id}")
     def get_progress(task_id: str):
-        return download_progress.get(task_id, {"status": "not_found"})
+        return download_progress.get(task_id) or {"status": "not_found"}
 
     @app.get("/api/browse")
     def browse_directory(path: Optional[str] = None):
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import time
+import difflib
+import argparse
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.getcwd(), 'api'))
+
+from SpotDown.extractor.youtube_extractor import YouTubeExtractor
+from SpotDown.helpers.similarity import available_engines, get_engine
+
+CORPUS = os.path.join("fixtures", "ranking_corpus.json")
+
+
+def legacy_sort(youtube_results, spotify_info, dj_priority=False):
+    """Ranking before the similarity engines, with a fresh SequenceMatcher per comparison"""
+    target_duration = spotify_info.get('duration_seconds')
+    target_title = spotify_info.get('title', '').lower()
+    target_artists = [a.strip().lower() for a in spotify_info.get('artist', '').split(',')]
+    mix_keywords = ["extended mix", "original mix", "club mix"]
+
+    for result in youtube_results:
+        if result.get('duration_seconds') is not None and target_duration is not None:
+            result['duration_difference'] = abs(result['duration_seconds'] - target_duration)
+        else:
+            result['duration_difference'] = float('inf')
+
+        yt_title = result.get('title', '').lower()
+        yt_channel = result.get('channel', '').lower()
+        result['exact_title_match'] = yt_title == target_title
+        result['title_affinity'] = difflib.SequenceMatcher(None, yt_title, target_title).ratio()
+
+        result['has_mix_keyword'] = False
+        if dj_priority:
+            result['has_mix_keyword'] = any(keyword in yt_title for keyword in mix_keywords)
+            if result.get('duration_seconds') is not None and target_duration is not None:
+                diff = result['duration_seconds'] - target_duration
+                if 0 <= diff <= 300:
+                    result['duration_difference'] = 0
+                elif diff > 300:
+                    result['duration_difference'] = diff * 0.5
+                else:
+                    result['duration_difference'] = abs(diff) * 2
+
+        channel_exact_matches = []
+        channel_affinities = []
+        for artist in target_artists:
+            channel_exact_matches.append(yt_channel == artist)
+            channel_exact_matches.append(artist in yt_channel)
+            channel_affinities.append(difflib.SequenceMatcher(None, yt_channel, artist).ratio())
+
+        result['exact_channel_match'] = any(channel_exact_matches)
+        result['channel_affinity'] = max(channel_affinities) if channel_affinities else 0.0
+
+    youtube_results.sort(
+        key=lambda x: (
+            not x['exact_channel_match'],
+            not x['has_mix_keyword'],
+            x['duration_difference'],
+            -x['channel_affinity'],
+            not x['exact_title_match'],
+            -x['title_affinity']
+        )
+    )
+
+
+def rank_all(sort, corpus, dj_priority):
+    orders = []
+    for track in corpus:
+        results = [dict(c) for c in track["candidates"]]
+        sort(results, track["spotify"], dj_priority)
+        orders.append([r["video_id"] for r in results])
+    return orders
+
+
+def timed(sort, corpus, dj_priority, rounds):
+    # Candidates are copied outside of the timed section
+    batches = [[(dict(c) for c in t["candidates"]) for t in corpus] for _ in range(rounds)]
+    start = time.perf_counter()
+    for batch in batches:
+        for track, candidates in zip(corpus, batch):
+            sort(list(candidates), track["spotify"], dj_priority)
+    return time.perf_counter() - start
+
+
+def main():
+    # Order mismatches are expected for rapidfuzz, which is why it is not the default engine
+    parser = argparse.ArgumentParser(description="Check and benchmark YouTube result ranking on the regression corpus")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(CORPUS, encoding="utf-8") as f:
+        corpus = json.load(f)["tracks"]
+    candidates = sum(len(t["candidates"]) for t in corpus)
+    print(f"Corpus: {len(corpus)} tracks, {candidates} candidates | rounds: {args.rounds}")
+
+    extractor = YouTubeExtractor()
+    for dj_priority in (False, True):
+        expected = rank_all(legacy_sort, corpus, dj_priority)
+        legacy_time = timed(legacy_sort, corpus, dj_priority, args.rounds)
+        print(f"\ndj_priority={dj_priority}  legacy: {legacy_time * 1000:.0f} ms")
+
+        for name in available_engines():
+            extractor.similarity = get_engine(name)
+            orders = rank_all(extractor.sort_by_affinity_and_duration, corpus, dj_priority)
+            mismatches = sum(1 for got, want in zip(orders, expected) if got != want)
+            engine_time = timed(extractor.sort_by_affinity_and_duration, corpus, dj_priority, args.rounds)
+            print(f"  {name:10s} {engine_time * 1000:6.0f} ms  ({legacy_time / engine_time:.1f}x)  order mismatches: {mismatches}/{len(corpus)}")
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.CRITICAL)
+    main()
@@ -0,0 +1,83 @@
+import os
+import re
+import sys
+import json
+import time
+import glob
+import argparse
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.getcwd(), 'api'))
+
+from SpotDown.extractor import youtube_extractor
+from SpotDown.extractor.youtube_extractor import YouTubeExtractor, parse_initial_data
+
+FIXTURES_DIR = os.path.join("fixtures", "youtube_search")
+
+
+def legacy_initial_data(html):
+    """Previous extraction: non-greedy regex over the whole page, then json.loads"""
+    match = re.search(r'var ytInitialData = ({.+?});', html, re.DOTALL)
+    return json.loads(match.group(1)) if match else None
+
+
+def timeit(func, html, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(html)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def save_fixture(query):
+    """Download a live search page into the fixtures directory"""
+    extractor = YouTubeExtractor()
+    html = youtube_extractor.get_http_client().get(extractor._search_url(query)).text
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    path = os.path.join(FIXTURES_DIR, youtube_extractor.normalize_query(query).replace(" ", "_") + ".html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    print(f"Saved {len(html)} bytes to {path}")
+
+
+def main():
+    # Only captured result pages are meaningful: timings depend on the real page layout and blob size
+    parser = argparse.ArgumentParser(description="Benchmark ytInitialData extraction on saved YouTube search pages")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--save", metavar="QUERY", help="fetch a live search page and save it as a new fixture")
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixture(args.save)
+        return
+
+    fixtures = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+    if not fixtures:
+        print(f"No fixtures found in {FIXTURES_DIR}, capture some with --save \"artist song title\"")
+        return
+
+    extractor = YouTubeExtractor()
+    limit = youtube_extractor.search_limit
+    print(f"orjson: {'yes' if youtube_extractor.orjson else 'no'} | rounds: {args.rounds} | limit: {limit}")
+
+    for path in fixtures:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+
+        if legacy_initial_data(html) != parse_initial_data(html):
+            print(f"MISMATCH: {path}")
+            continue
+
+        legacy = timeit(legacy_initial_data, html, args.rounds)
+        current = timeit(parse_initial_data, html, args.rounds)
+        full = timeit(lambda h: extractor._extract_youtube_videos(h, limit), html, args.rounds)
+
+        print(f"{os.path.basename(path)} ({len(html) / 1024:.0f} KB)")
+        print(f"  legacy regex + json:  {legacy:7.2f} ms")
+        print(f"  scan + decoder:       {current:7.2f} ms  ({legacy / current:.1f}x)")
+        print(f"  full extraction:      {full:7.2f} ms")
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.CRITICAL)
+    main()
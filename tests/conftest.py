@@ -0,0 +1,6 @@
+import os
+import sys
+
+
+# SpotDown is imported from the api directory, config.json is read from the working directory (repo root)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
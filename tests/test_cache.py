@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import pytest
+
+from SpotDown.utils import cache as cache_module
+from SpotDown.utils.cache import DiskCache
+from SpotDown.extractor.youtube_extractor import normalize_query, search_cache_keys
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_values_round_trip_and_expire(tmp_path, clock):
+    cache = DiskCache("test", ttl=60, max_entries=10, file_name=str(tmp_path / "cache.db"))
+    cache.set("results", [{'video_id': "a", 'duration_seconds': 200}])
+    cache.set("short", "value", ttl=5)
+
+    assert cache.get("results") == [{'video_id': "a", 'duration_seconds': 200}]
+    assert cache.get("missing") is None
+
+    clock[0] += 10
+    assert cache.get("short") is None
+    assert cache.get("results") is not None
+
+    clock[0] += 60
+    assert cache.get("results") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_evicted(tmp_path, clock):
+    cache = DiskCache("test", ttl=60, max_entries=2, file_name=str(tmp_path / "cache.db"))
+    cache.set("a", 1)
+    clock[0] += 1
+    cache.set("b", 2)
+    clock[0] += 1
+    assert cache.get("a") == 1
+    clock[0] += 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert len(cache) == 2
+
+
+def test_persisted_and_namespaced(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    DiskCache("one", ttl=60, max_entries=10, file_name=path).set("key", "first")
+    DiskCache("two", ttl=60, max_entries=10, file_name=path).set("key", "second")
+
+    reopened = DiskCache("one", ttl=60, max_entries=10, file_name=path)
+    assert reopened.get("key") == "first"
+
+    reopened.delete("key")
+    assert reopened.get("key") is None
+
+
+def test_search_cache_keys():
+    assert normalize_query("  Daft  Punk GET lucky ") == "daft punk get lucky"
+    assert search_cache_keys("Daft Punk Get Lucky", {'isrc': "usqx91300108"}) == ["isrc:USQX91300108", "daft punk get lucky"]
+    assert search_cache_keys("Daft Punk Get Lucky") == ["daft punk get lucky"]
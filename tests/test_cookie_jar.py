@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import pytest
+
+from SpotDown.downloader import cookie_jar
+from SpotDown.downloader.cookie_jar import CookieJarCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cookie_jar, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(cookie_jar, "cookies_file", lambda: None)
+    return now
+
+
+def loader(cache, monkeypatch, results):
+    """Replace the jar loading with a scripted sequence of results, returns the list of loaded strategies"""
+    calls = []
+
+    def load(strategy):
+        calls.append(strategy)
+        return results.pop(0)
+
+    monkeypatch.setattr(cache, "_load", load)
+    return calls
+
+
+def test_jar_loaded_once_and_generation_bumped_on_auth_error(clock, monkeypatch):
+    cache = CookieJarCache(retry_after=60)
+    first, second = object(), object()
+    calls = loader(cache, monkeypatch, [first, second])
+
+    ref = cache.jar("chrome")
+    assert (ref.generation, ref.jar) == (0, first)
+    assert cache.jar("chrome").jar is first
+    assert calls == ["chrome"]
+
+    cache.failed("chrome", Exception("network unreachable"))
+    assert cache.jar("chrome").jar is first
+
+    cache.failed("chrome", Exception("Sign in to confirm you're not a bot"))
+    ref = cache.jar("chrome")
+    assert (ref.generation, ref.jar) == (1, second)
+    assert calls == ["chrome", "chrome"]
+
+
+def test_failed_load_is_retried_after_expiry(clock, monkeypatch):
+    cache = CookieJarCache(retry_after=60)
+    jar = object()
+    calls = loader(cache, monkeypatch, [None, jar])
+
+    assert cache.jar("edge") is None
+    clock[0] += 30
+    assert cache.jar("edge") is None
+    assert calls == ["edge"]
+
+    clock[0] += 31
+    assert cache.jar("edge").jar is jar
+    assert calls == ["edge", "edge"]
+
+
+def test_winner_tried_first(clock):
+    cache = CookieJarCache()
+    assert cache.strategies() == ["chrome", "edge"]
+
+    cache.succeeded("edge")
+    assert cache.strategies() == ["edge", "chrome"]
+
+    cache.failed("edge", Exception("HTTP Error 403: Forbidden"))
+    assert cache.strategies() == ["chrome", "edge"]
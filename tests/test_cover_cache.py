@@ -0,0 +1,88 @@
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from SpotDown.utils import cover_cache as cover_cache_module
+from SpotDown.utils.cover_cache import CoverCache
+
+
+@pytest.fixture
+def covers(tmp_path, monkeypatch):
+    """Cover cache whose downloads write 100 bytes and are counted per URL"""
+    now = [1000.0]
+    monkeypatch.setattr(cover_cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+
+    cache = CoverCache(str(tmp_path / "covers"), max_bytes=250, retry_after=60)
+    downloads = []
+    failing = set()
+    gate = threading.Event()
+    gate.set()
+
+    def download(url, path):
+        gate.wait()
+        downloads.append(url)
+        if url in failing:
+            return False
+        path.write_bytes(b"x" * 100)
+        return True
+
+    monkeypatch.setattr(cache, "_download", download)
+    return SimpleNamespace(cache=cache, downloads=downloads, failing=failing, gate=gate, now=now)
+
+
+def age(path, seconds):
+    """Make a cover look less recently used than the others"""
+    stat = path.stat()
+    os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+def test_concurrent_gets_download_once(covers):
+    covers.gate.clear()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(covers.cache.get("http://img/a"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    covers.gate.set()
+    for t in threads:
+        t.join()
+
+    assert covers.downloads == ["http://img/a"]
+    assert len(set(results)) == 1 and results[0].exists()
+    assert covers.cache.pinned[results[0]] == 8
+
+
+def test_pinned_covers_survive_eviction(covers):
+    cache = covers.cache
+    a = cache.get("http://img/a")
+    age(a, 100)
+    b = cache.get("http://img/b")
+    cache.release(b)
+    age(b, 50)
+
+    # Third cover goes above 250 bytes: b is the oldest unpinned one
+    c = cache.get("http://img/c")
+    assert a.exists() and c.exists()
+    assert not b.exists()
+
+    cache.release(a)
+    cache.release(c)
+    assert cache.pinned == {}
+    cache.get("http://img/d")
+    assert not a.exists()
+
+
+def test_failed_download_retried_after_delay(covers):
+    cache = covers.cache
+    covers.failing.add("http://img/broken")
+
+    assert cache.get("http://img/broken") is None
+    assert cache.get("http://img/broken") is None
+    assert covers.downloads == ["http://img/broken"]
+    assert cache.pinned == {}
+
+    covers.now[0] += 61
+    covers.failing.clear()
+    assert cache.get("http://img/broken") is not None
+    assert covers.downloads == ["http://img/broken"] * 2
@@ -0,0 +1,100 @@
+import pytest
+
+from SpotDown.utils.cache import DiskCache
+from SpotDown.utils.os import file_utils
+from SpotDown.helpers.string import normalize_title, track_keys
+from SpotDown.downloader import download_index
+from SpotDown.downloader import batch_downloader
+from SpotDown.downloader.download_index import audio_ext, find_downloaded, record_downloaded, reuse_downloaded
+from SpotDown.downloader.youtube_downloader import FetchedAudio, YouTubeDownloader
+
+
+@pytest.fixture
+def music(tmp_path, monkeypatch):
+    folder = tmp_path / "music"
+    folder.mkdir()
+    monkeypatch.setattr(file_utils, "get_music_folder", lambda: folder)
+    monkeypatch.setattr(download_index, "_index", DiskCache("downloaded", 3600, 100, str(tmp_path / "cache.db")))
+    return folder
+
+
+TRACK = {'artist': "Artist", 'title': "Song", 'isrc': "usaaa0000001", 'spotify_id': "sp1"}
+
+
+def test_normalize_title():
+    assert normalize_title("Señorita - 2011 Remaster") == "senorita"
+    assert normalize_title("Don't Stop (Deluxe Edition)") == "dont stop"
+    assert normalize_title("Song - Live") == "song live"
+    assert normalize_title(None) == ""
+
+
+def test_track_keys():
+    assert track_keys(TRACK) == ["isrc:USAAA0000001", "id:sp1", "title:song|artist"]
+    assert track_keys({'title': "Song - Remastered", 'artist': "Artíst"}) == ["title:song|artist"]
+
+
+def test_audio_ext():
+    assert audio_ext("320K") == "mp3"
+    assert audio_ext("flac") == "flac"
+
+
+def test_reuse_copies_previous_download(music):
+    first = music / "Playlist A" / "Artist - Song.mp3"
+    first.parent.mkdir()
+    first.write_bytes(b"audio")
+    record_downloaded(TRACK, first)
+
+    other_recording = dict(TRACK, isrc="USAAA0000002", spotify_id="sp2")
+    assert find_downloaded(other_recording, "mp3") is None
+    assert find_downloaded(TRACK, "flac") is None
+    # Only the exact keys are indexed, a title match is not enough
+    assert find_downloaded({'artist': "Artist", 'title': "Song"}, "mp3") is None
+
+    assert reuse_downloaded(TRACK, "mp3", "Playlist B")
+    assert (music / "Playlist B" / "Artist - Song.mp3").read_bytes() == b"audio"
+
+
+def test_missing_file_is_forgotten(music):
+    record_downloaded(TRACK, music / "gone.mp3")
+
+    assert find_downloaded(TRACK, "mp3") is None
+    assert download_index.get_download_index().get("isrc:USAAA0000001") is None
+
+
+def test_download_records_the_file(music, monkeypatch):
+    downloader = YouTubeDownloader()
+    fetched = FetchedAudio("source.webm", {}, music, "Artist - Song", "320K")
+    monkeypatch.setattr(downloader, "fetch", lambda *args, **kwargs: fetched)
+
+    def postprocess(f):
+        (f.music_folder / f"{f.filename}.{f.ext}").write_bytes(b"audio")
+        return True
+
+    monkeypatch.setattr(downloader, "postprocess", postprocess)
+
+    assert downloader.download({'url': "u", 'title': "Song"}, TRACK)
+    assert find_downloaded({'spotify_id': "sp1"}, "mp3") == music / "Artist - Song.mp3"
+
+
+def test_batch_downloader_skips_indexed_tracks(music):
+    previous = music / "Album" / "Artist - Song.mp3"
+    previous.parent.mkdir()
+    previous.write_bytes(b"audio")
+    record_downloaded(TRACK, previous)
+
+    searched = []
+
+    class FakeExtractor:
+        def search_many(self, tracks, dj_priority=False):
+            searched.extend(tracks)
+            for index in range(len(tracks)):
+                yield index, [{'title': "video", 'url': "u"}]
+
+    new_track = {'artist': "Artist", 'title': "New Song", 'isrc': "USAAA0000009", 'spotify_id': "sp9"}
+    batch = batch_downloader.BatchDownloader([dict(TRACK), new_track])
+    batch.youtube_extractor = FakeExtractor()
+    batch.resolver()
+
+    assert searched == [new_track]
+    assert batch.skipped == 1
+    assert (music / "Artist - Song.mp3").exists()
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+
+from SpotDown.helpers import ffmpeg
+from SpotDown.helpers.ffmpeg import transcode_audio
+from SpotDown.utils.os import file_utils
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Captured ffmpeg command lines, the fake always writes the output and exits with state.returncode"""
+    calls = []
+    state = SimpleNamespace(returncode=0)
+
+    def run(cmd, capture_output, text):
+        calls.append(cmd)
+        with open(cmd[-1], "wb") as f:
+            f.write(b"partial")
+        return SimpleNamespace(returncode=state.returncode, stderr="error")
+
+    monkeypatch.setattr(file_utils, "ffmpeg_path", "ffmpeg")
+    monkeypatch.setattr(ffmpeg, "subprocess", SimpleNamespace(run=run))
+    return SimpleNamespace(calls=calls, state=state)
+
+
+def test_mp3_with_cover_and_tags(tmp_path, runs):
+    output = tmp_path / "Artist - Song.mp3"
+    tags = {'title': "Song", 'artist': "Artist", 'album': None}
+
+    assert transcode_audio("src.webm", output, "320K", tags, "cover.jpg")
+    assert runs.calls == [[
+        'ffmpeg', '-y', '-i', 'src.webm', '-i', 'cover.jpg',
+        '-map', '0:a:0', '-map_metadata', '-1',
+        '-map', '1:0', '-c:v', 'copy',
+        '-metadata:s:v', 'title=Album cover', '-metadata:s:v', 'comment=Cover (front)',
+        '-disposition:v', 'attached_pic',
+        '-c:a', 'libmp3lame', '-b:a', '320k', '-id3v2_version', '3',
+        '-metadata', 'title=Song', '-metadata', 'artist=Artist',
+        str(output),
+    ]]
+
+
+def test_mp3_vbr_level_without_cover(tmp_path, runs):
+    output = tmp_path / "out.mp3"
+
+    assert transcode_audio("src.webm", output, "2", {})
+    assert runs.calls[0] == [
+        'ffmpeg', '-y', '-i', 'src.webm', '-map', '0:a:0', '-map_metadata', '-1',
+        '-c:a', 'libmp3lame', '-q:a', '2', '-id3v2_version', '3', str(output),
+    ]
+
+
+def test_flac(tmp_path, runs):
+    output = tmp_path / "out.flac"
+
+    assert transcode_audio("src.webm", output, "FLAC", {'date': "2013"}, "cover.jpg")
+    cmd = runs.calls[0]
+    assert cmd[cmd.index('-c:a') + 1] == 'flac'
+    assert '-b:a' not in cmd and '-id3v2_version' not in cmd
+    assert cmd[-3:] == ['-metadata', 'date=2013', str(output)]
+
+
+def test_failure_removes_partial_output(tmp_path, runs):
+    output = tmp_path / "out.mp3"
+    runs.state.returncode = 1
+
+    assert not transcode_audio("src.webm", output, "192K")
+    assert not output.exists()
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+from yt_dlp import YoutubeDL
+
+from SpotDown.downloader import info_cache as info_cache_module
+from SpotDown.downloader.info_cache import InfoCache
+
+
+URL = "https://www.youtube.com/watch?v=abc"
+
+
+def extracted_info():
+    """Info dict as the API extracts it: the default format selection already applied"""
+    info = {
+        'id': 'abc',
+        'title': 'Song',
+        'extractor': 'youtube',
+        'extractor_key': 'Youtube',
+        'webpage_url': URL,
+        'formats': [
+            {'format_id': '251', 'url': 'https://media.invalid/251', 'ext': 'webm', 'acodec': 'opus', 'vcodec': 'none', 'abr': 160},
+            {'format_id': '137', 'url': 'https://media.invalid/137', 'ext': 'mp4', 'acodec': 'none', 'vcodec': 'avc1', 'height': 1080, 'tbr': 4000},
+            {'format_id': '18', 'url': 'https://media.invalid/18', 'ext': 'mp4', 'acodec': 'mp4a', 'vcodec': 'avc1', 'height': 360, 'tbr': 500},
+        ],
+    }
+    with YoutubeDL({'quiet': True, 'format': 'bestvideo+bestaudio'}) as ydl:
+        return ydl.process_ie_result(info, download=False)
+
+
+def test_reprocessed_info_downloads_single_audio_format():
+    info = extracted_info()
+    assert [f['format_id'] for f in info['requested_formats']] == ['137', '251']
+
+    cache = InfoCache(ttl=60, max_entries=10)
+    cache.put(info, URL)
+    cached = cache.get(URL)
+    assert 'requested_formats' not in cached
+    assert 'format_id' not in cached and 'url' not in cached and 'ext' not in cached
+
+    with YoutubeDL({'quiet': True, 'format': 'bestaudio/best', 'simulate': True}) as ydl:
+        result = ydl.process_ie_result(cached, download=True)
+
+    assert result.get('requested_formats') is None
+    assert [d['format_id'] for d in result['requested_downloads']] == ['251']
+    assert result['vcodec'] == 'none'
+
+
+def test_put_keeps_a_copy_and_get_returns_copies():
+    cache = InfoCache(ttl=60, max_entries=10)
+    info = {'id': 'abc', 'title': 'Song', 'webpage_url': URL, 'formats': []}
+    cache.put(info, "https://youtu.be/abc")
+    info['title'] = 'Changed'
+
+    first = cache.get("https://youtu.be/abc")
+    first['title'] = 'Mutated'
+    assert cache.get(URL)['title'] == 'Song'
+
+
+def test_expired_and_oldest_entries_are_dropped(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(info_cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+
+    cache = InfoCache(ttl=10, max_entries=2)
+    for name in ("a", "b", "c"):
+        cache.put({'id': name}, name)
+
+    assert cache.get("a") is None
+    assert cache.get("c")['id'] == 'c'
+
+    now[0] += 11
+    assert cache.get("b") is None
+    assert cache.get("c") is None
+    assert cache.get(None) is None
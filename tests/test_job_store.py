@@ -0,0 +1,58 @@
+from SpotDown.downloader.progress import ProgressRegistry
+from SpotDown.downloader.scheduler import DownloadJob
+from SpotDown.downloader.job_store import JobStore, TRACK_DONE, TRACK_FAILED, TRACK_PENDING, resumed_states, unstored_pages
+
+
+def make_job(store, tracks, **kwargs):
+    progress = ProgressRegistry()
+    progress.create("job-1", status="starting", total_tracks=len(tracks))
+    return DownloadJob("job-1", list(tracks), progress, "320K", store=store, **kwargs)
+
+
+def test_saved_job_is_resumed_with_track_states(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job = make_job(store, [{"title": "A"}, {"title": "B"}, {"title": "C"}], subdirectory="Mix")
+    store.save_job(job)
+    store.set_track_state("job-1", 0, TRACK_DONE)
+    store.set_track_state("job-1", 2, TRACK_FAILED)
+
+    [stored] = store.unfinished_jobs()
+    assert stored["task_id"] == "job-1"
+    assert stored["subdirectory"] == "Mix"
+    assert [track["title"] for track in stored["tracks"]] == ["A", "B", "C"]
+    assert stored["states"] == [TRACK_DONE, TRACK_PENDING, TRACK_FAILED]
+    assert resumed_states(stored["states"]) == {0: True, 2: False}
+
+
+def test_finished_job_is_forgotten(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.save_job(make_job(store, [{"title": "A"}]))
+    store.finish_job("job-1")
+    assert store.unfinished_jobs() == []
+
+
+def test_streamed_job_stays_extracting_until_finish_extraction(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    source = {"spotify_url": "https://open.spotify.com/playlist/x", "kind": "collection"}
+    job = make_job(store, [{"title": "A"}], extracting=True, source=source)
+    store.save_job(job)
+    job.add_tracks([{"title": "B"}, {"title": "C"}])
+
+    # Interrupted here: the stored list is partial and says so
+    [stored] = store.unfinished_jobs()
+    assert stored["extracting"] is True
+    assert stored["source"] == source
+    assert len(stored["tracks"]) == 3
+
+    store.finish_extraction("job-1")
+    [stored] = store.unfinished_jobs()
+    assert stored["extracting"] is False
+
+
+def test_unstored_pages_skip_tracks_already_stored():
+    stored = [{"title": "A", "artist": "X", "spotify_id": "1"}, {"title": "B", "artist": "X", "isrc": "us123"}]
+    pages = iter([
+        [{"title": "A", "artist": "X", "spotify_id": "1"}, {"title": "B (Remastered)", "artist": "X", "isrc": "US123"}],
+        [{"title": "C", "artist": "X", "spotify_id": "3"}],
+    ])
+    assert [[track["title"] for track in page] for page in unstored_pages(pages, stored)] == [[], ["C"]]
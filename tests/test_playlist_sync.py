@@ -0,0 +1,36 @@
+from SpotDown.downloader.playlist_sync import PlaylistDiff, PlaylistSyncStore
+
+
+def track(title, spotify_id=None, isrc=None):
+    return {"title": title, "artist": "Artist", "spotify_id": spotify_id, "isrc": isrc}
+
+
+def test_first_sync_downloads_every_track():
+    diff = PlaylistDiff(None)
+    pages = list(diff.added_pages(iter([[track("A", "1")], [track("B", "2")]])))
+    assert [[t["title"] for t in page] for page in pages] == [["A"], ["B"]]
+    assert diff.removed() == []
+
+
+def test_diff_matches_synced_tracks_on_any_identity_key(tmp_path):
+    store = PlaylistSyncStore(str(tmp_path / "sync.db"))
+    first = PlaylistDiff(None)
+    list(first.added_pages(iter([[track("A", "1"), track("B", "2", isrc="US1"), track("C", "3")]])))
+    store.save("pl", "snap-1", "Mix", first.synced({first.key(track("A", "1")), first.key(track("B", "2", isrc="US1")), first.key(track("C", "3"))}))
+
+    # B is relinked to another Spotify ID with the same ISRC, C was removed, D is new
+    diff = PlaylistDiff(store.get("pl"))
+    added = [t["title"] for page in diff.added_pages(iter([[track("A", "1"), track("B", "9", isrc="US1"), track("D", "4")]])) for t in page]
+    assert added == ["D"]
+    assert diff.removed() == ["Artist - C"]
+
+    synced = diff.synced({diff.key(track("D", "4"))})
+    assert diff.fully_synced(synced)
+    assert len(synced) == 3
+
+
+def test_failed_download_keeps_the_snapshot_unsynced():
+    diff = PlaylistDiff(None)
+    list(diff.added_pages(iter([[track("A", "1"), track("B", "2")]])))
+    synced = diff.synced({diff.key(track("A", "1"))})
+    assert not diff.fully_synced(synced)
@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+from SpotDown.downloader import progress as progress_module
+from SpotDown.downloader.progress import ProgressRegistry
+
+
+def test_finished_tasks_are_bounded():
+    registry = ProgressRegistry(ttl=3600, max_finished_tasks=2, stale=3600)
+    for task_id in ("a", "b", "c"):
+        registry.create(task_id, status="completed")
+    assert registry.get("a") is None
+    assert registry.get("c") == {"status": "completed"}
+
+
+def test_stale_unfinished_task_is_evicted_on_read(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(progress_module, "time", SimpleNamespace(time=lambda: clock[0]))
+    registry = ProgressRegistry(ttl=3600, max_finished_tasks=10, stale=60)
+    registry.create("stuck", status="starting")
+    registry.create("running", status="starting")
+
+    clock[0] += 50
+    registry.update("running", status="downloading", percent=10)
+    clock[0] += 20
+
+    # No write happened since, the read alone sweeps the stuck task
+    assert registry.get("stuck") is None
+    assert registry.get("running")["status"] == "downloading"
+    assert registry.changes_since(["stuck"], 0)[1] == {"stuck": {"status": "not_found"}}
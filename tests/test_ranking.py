@@ -0,0 +1,97 @@
+import os
+import json
+import difflib
+import random
+
+import pytest
+
+from SpotDown.extractor.youtube_extractor import YouTubeExtractor
+from SpotDown.helpers.similarity import DifflibEngine, available_engines, get_engine
+
+
+CORPUS = os.path.join(os.path.dirname(__file__), "..", "fixtures", "ranking_corpus.json")
+
+
+def load_corpus():
+    with open(CORPUS, encoding="utf-8") as f:
+        return json.load(f)["tracks"]
+
+
+def full_sort(results, spotify_info, dj_priority):
+    """Reference order: the key of sort_by_affinity_and_duration over every result, affinities included"""
+    ranked = [dict(r) for r in results]
+    YouTubeExtractor().sort_by_affinity_and_duration(ranked, spotify_info, dj_priority)
+    by_id = {r['video_id']: r for r in ranked}
+
+    title = spotify_info['title'].lower()
+    artists = [a.strip().lower() for a in spotify_info['artist'].split(',')]
+    reference = []
+    for result in results:
+        scored = dict(by_id[result['video_id']])
+        scored['title_affinity'] = difflib.SequenceMatcher(None, scored['title'].lower(), title).ratio()
+        scored['channel_affinity'] = max(difflib.SequenceMatcher(None, scored['channel'].lower(), a).ratio() for a in artists)
+        reference.append(scored)
+
+    reference.sort(key=lambda x: (
+        not x['exact_channel_match'],
+        not x['has_mix_keyword'],
+        x['duration_difference'],
+        -x['channel_affinity'],
+        not x['exact_title_match'],
+        -x['title_affinity'],
+    ))
+    return [r['video_id'] for r in reference]
+
+
+def tied_results(seed):
+    """Candidates sharing a few durations, so most of them tie on the primary key"""
+    rng = random.Random(seed)
+    words = ["feel", "better", "strobe", "monday", "live", "remix", "official", "audio", "extended mix", "lyrics"]
+    channels = ["Calvin de Witte", "Calvin de Witte - Topic", "Witte Records", "Strobe Fans", "Daft Eilish", "Lyrics Hub"]
+    return [
+        {
+            'video_id': f"v{i}",
+            'title': " ".join(rng.sample(words, rng.randint(2, 5))),
+            'channel': rng.choice(channels),
+            'duration_seconds': rng.choice([None, 230, 232, 240, 400]),
+        }
+        for i in range(40)
+    ]
+
+
+@pytest.mark.parametrize("dj_priority", [False, True])
+def test_tie_group_sort_matches_full_sort_on_corpus(dj_priority):
+    extractor = YouTubeExtractor()
+    extractor.similarity = DifflibEngine()
+
+    for track in load_corpus():
+        results = [dict(c) for c in track["candidates"]]
+        extractor.sort_by_affinity_and_duration(results, track["spotify"], dj_priority)
+
+        assert [r['video_id'] for r in results] == full_sort(track["candidates"], track["spotify"], dj_priority)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_tie_group_sort_matches_full_sort_with_ties(seed):
+    spotify_info = {'artist': "Calvin de Witte, Daft Eilish", 'title': "Feel Better", 'duration_seconds': 232}
+    candidates = tied_results(seed)
+    extractor = YouTubeExtractor()
+    extractor.similarity = DifflibEngine()
+
+    for dj_priority in (False, True):
+        results = [dict(c) for c in candidates]
+        extractor.sort_by_affinity_and_duration(results, spotify_info, dj_priority)
+
+        assert [r['video_id'] for r in results] == full_sort(candidates, spotify_info, dj_priority)
+
+
+@pytest.mark.parametrize("name", available_engines())
+def test_engine_scores(name):
+    score = get_engine(name).scorer("feel better")
+
+    assert score("feel better") == pytest.approx(1.0)
+    assert 0.0 <= score("strobe") < score("feel betta") < 1.0
+
+
+def test_unknown_engine_falls_back_to_difflib():
+    assert isinstance(get_engine("nope"), DifflibEngine)
@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+
+from SpotDown.downloader import scheduler as scheduler_module
+from SpotDown.downloader.progress import ProgressRegistry
+from SpotDown.downloader.scheduler import DownloadJob, DownloadScheduler
+
+
+class FakeFetched:
+    def __init__(self, track):
+        self.music_folder = Path("/music")
+        self.filename = track["title"]
+        self.ext = "mp3"
+
+
+class FakeDownloader:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.fetched = []
+
+    def fetch(self, video_info, track, quality, progress_hook, subdirectory):
+        progress_hook({"status": "downloading", "downloaded_bytes": 5, "total_bytes": 10})
+        progress_hook({"status": "finished"})
+        self.fetched.append(track["title"])
+        return None if track["title"] in self.failing else FakeFetched(track)
+
+    def postprocess(self, fetched):
+        return True
+
+
+class FakeExtractor:
+    def search(self, query, track, dj_priority=False):
+        return [{"url": f"https://youtube.com/watch?v={track['title']}", "title": track["title"]}]
+
+    def search_many(self, tracks, dj_priority=False):
+        for position, track in enumerate(tracks):
+            yield position, self.search("", track, dj_priority)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    # The download index lives next to config.json, keep the tests away from it
+    monkeypatch.setattr(scheduler_module, "reuse_downloaded", lambda track, ext, subdirectory=None: False)
+    monkeypatch.setattr(scheduler_module, "record_downloaded", lambda track, path: None)
+
+    scheduler = DownloadScheduler(resolve_count=2, download_count=2, postprocess_count=1, max_queued=2, request_count=1)
+    scheduler.youtube_extractor = FakeExtractor()
+    scheduler.downloader = FakeDownloader()
+    return scheduler
+
+
+def tracks(*titles):
+    return [{"title": title, "artist": "Artist"} for title in titles]
+
+
+def test_job_runs_every_track_through_the_pipeline(scheduler):
+    progress = ProgressRegistry()
+    progress.create("job", status="starting", total_tracks=5)
+    job = DownloadJob("job", tracks("a", "b", "c", "d", "e"), progress, concurrency=2)
+
+    scheduler.submit(job)
+    assert job.done.wait(5)
+
+    assert sorted(scheduler.downloader.fetched) == ["a", "b", "c", "d", "e"]
+    assert job.results == {index: True for index in range(5)}
+    assert progress.get("job")["status"] == "completed"
+    assert progress.get("job")["completed_tracks"] == 5
+
+
+def test_failed_track_does_not_block_the_job(scheduler):
+    scheduler.downloader = FakeDownloader(failing={"b"})
+    progress = ProgressRegistry()
+    progress.create("job", status="starting")
+    job = DownloadJob("job", tracks("a", "b", "c"), progress)
+
+    scheduler.submit(job)
+    assert job.done.wait(5)
+    assert job.results == {0: True, 1: False, 2: True}
+    assert "2/3" in progress.get("job")["message"]
+
+
+def test_resumed_job_skips_finished_tracks(scheduler):
+    progress = ProgressRegistry()
+    progress.create("job", status="starting")
+    job = DownloadJob("job", tracks("a", "b", "c"), progress, finished_tracks={0: True, 2: False})
+
+    scheduler.submit(job)
+    assert job.done.wait(5)
+    assert scheduler.downloader.fetched == ["b"]
+    assert job.success_count == 2
+
+
+def test_streamed_job_completes_after_the_last_page(scheduler):
+    progress = ProgressRegistry()
+    progress.create("job", status="starting")
+    completed = []
+    job = DownloadJob("job", tracks("a"), progress, extracting=True, on_complete=completed.append)
+
+    scheduler.submit(job, iter([tracks("b", "c"), [], tracks("d")]))
+    assert job.done.wait(5)
+
+    assert job.total == 4
+    assert completed == [job]
+    assert progress.get("job")["total_tracks"] == 4
+
+
+def test_request_error_ends_up_in_the_task_progress(scheduler):
+    progress = ProgressRegistry()
+    progress.create("job", status="starting")
+
+    def resolve():
+        raise ValueError("No se encontraron canciones")
+
+    scheduler.submit_request("job", progress, resolve)
+    scheduler.request_queue.join()
+    assert progress.get("job")["status"] == "error"
+    assert progress.get("job")["error"] == "No se encontraron canciones"
@@ -0,0 +1,148 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from SpotDown.extractor import youtube_extractor
+from SpotDown.extractor.youtube_extractor import RateLimiter, SearchSlots, YouTubeExtractor
+
+
+class InFlight:
+    """Counts the search requests sent and the peak of those running at once"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+        self.sent = 0
+
+    def enter(self):
+        with self.lock:
+            self.current += 1
+            self.sent += 1
+            self.peak = max(self.peak, self.current)
+
+    def exit(self):
+        with self.lock:
+            self.current -= 1
+
+
+class FakeResponse:
+    text = ""
+
+
+class FakeClient:
+    def __init__(self, in_flight, delay):
+        self.in_flight = in_flight
+        self.delay = delay
+
+    def get(self, url):
+        self.in_flight.enter()
+        time.sleep(self.delay)
+        self.in_flight.exit()
+        return FakeResponse()
+
+
+class FakeAsyncClient:
+    def __init__(self, in_flight, delay):
+        self.in_flight = in_flight
+        self.delay = delay
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def get(self, url):
+        self.in_flight.enter()
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight.exit()
+        return FakeResponse()
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    in_flight = InFlight()
+    delay = 0.05
+
+    monkeypatch.setattr(youtube_extractor, "_search_slots", SearchSlots(2))
+    monkeypatch.setattr(youtube_extractor, "_rate_limiter", RateLimiter(0))
+    monkeypatch.setattr(youtube_extractor, "get_http_client", lambda: FakeClient(in_flight, delay))
+    monkeypatch.setattr(youtube_extractor.httpx, "AsyncClient", lambda **kwargs: FakeAsyncClient(in_flight, delay))
+    monkeypatch.setattr(YouTubeExtractor, "_cached_results", lambda self, query, track=None: None)
+    monkeypatch.setattr(YouTubeExtractor, "_cache_results", lambda self, query, results, track=None: None)
+    monkeypatch.setattr(YouTubeExtractor, "_extract_youtube_videos", lambda self, html, limit: [{'video_id': 'v'}])
+    monkeypatch.setattr(YouTubeExtractor, "sort_by_affinity_and_duration", lambda self, results, info, dj_priority=False: None)
+    return in_flight
+
+
+def make_tracks(count):
+    return [{'artist': "Artist", 'title': f"Song {i}", 'duration_seconds': 200} for i in range(count)]
+
+
+def test_batch_and_single_searches_share_the_cap(searches):
+    extractor = YouTubeExtractor()
+
+    def single_searches():
+        for i in range(6):
+            extractor.search_videos(f"single {i}")
+
+    threads = [threading.Thread(target=single_searches) for _ in range(3)]
+    for t in threads:
+        t.start()
+    batch = list(extractor.search_many(make_tracks(12)))
+    for t in threads:
+        t.join()
+
+    assert sorted(index for index, _ in batch) == list(range(12))
+    assert all(results for _, results in batch)
+    assert searches.sent == 12 + 18
+    assert searches.peak == 2
+
+
+def test_closing_the_generator_stops_the_batch(searches):
+    extractor = YouTubeExtractor()
+    batch = extractor.search_many(make_tracks(40))
+
+    next(batch)
+    batch.close()
+    time.sleep(0.3)
+    sent = searches.sent
+    time.sleep(0.2)
+
+    assert searches.sent == sent
+    assert sent < 10
+    assert searches.current == 0
+    slots = youtube_extractor.get_search_slots()._semaphore
+    assert slots.acquire(blocking=False) and slots.acquire(blocking=False)
+
+
+def test_rate_limiter_spaces_requests_across_threads():
+    limiter = RateLimiter(20)
+    stamps = []
+
+    def wait():
+        limiter.wait_blocking("host")
+        stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=wait) for _ in range(4)]
+    for t in threads:
+        t.start()
+    asyncio.run(limiter.wait("host"))
+    stamps.append(time.monotonic())
+    for t in threads:
+        t.join()
+
+    stamps.sort()
+    assert stamps[-1] - stamps[0] >= 4 * 0.05 - 0.01
+
+
+def test_rate_limiter_and_slots_are_process_wide(monkeypatch):
+    monkeypatch.setattr(youtube_extractor, "_search_slots", None)
+    monkeypatch.setattr(youtube_extractor, "_rate_limiter", None)
+
+    assert youtube_extractor.get_rate_limiter() is youtube_extractor.get_rate_limiter()
+    assert youtube_extractor.get_search_slots() is youtube_extractor.get_search_slots()
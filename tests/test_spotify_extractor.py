@@ -0,0 +1,97 @@
+import time
+import threading
+
+from SpotDown.extractor.spotify_extractor import SpotifyExtractor, chunked, fetch_pages
+
+
+def album(album_id, name, tracks):
+    return {
+        'id': album_id,
+        'name': name,
+        'images': [],
+        'tracks': {'total': len(tracks), 'items': tracks},
+    }
+
+
+def item(track_id, title, artists, duration_ms=200000):
+    return {'id': track_id, 'name': title, 'artists': [{'name': a} for a in artists], 'duration_ms': duration_ms}
+
+
+class FakeSpotify:
+    def __init__(self, albums, isrcs):
+        self._albums = {a['id']: a for a in albums}
+        self._isrcs = isrcs
+
+    def albums(self, album_ids):
+        return {'albums': [self._albums[album_id] for album_id in album_ids]}
+
+    def album_tracks(self, album_id, offset=0, limit=50):
+        items = self._albums[album_id]['tracks']['items']
+        return {'total': len(items), 'items': items[offset:offset + limit]}
+
+    def tracks(self, track_ids):
+        return {'tracks': [{'id': i, 'external_ids': {'isrc': self._isrcs[i]} if self._isrcs.get(i) else {}} for i in track_ids]}
+
+
+def extractor_for(albums, isrcs):
+    extractor = SpotifyExtractor.__new__(SpotifyExtractor)
+    extractor.sp = FakeSpotify(albums, isrcs)
+    return extractor
+
+
+def test_artist_pages_dedup_on_isrc_or_title_and_artist():
+    albums = [
+        album("a1", "Album", [
+            item("t1", "Song", ["Artist"]),
+            item("t2", "Intro", ["Artist"]),
+            item("t3", "Other Song", ["Artist"]),
+        ]),
+        album("a2", "Single", [
+            # Same ISRC as t1 under another title
+            item("t4", "Song (Radio Edit)", ["Artist"]),
+            # No ISRC: a different artist's "Intro" is another recording, the same artist's is not
+            item("t5", "Intro", ["Artist", "Guest"]),
+            item("t6", "Intro", ["Artist"]),
+            # Remaster of t3 without ISRC
+            item("t7", "Other Song - 2011 Remaster", ["Artist"]),
+        ]),
+    ]
+    isrcs = {"t1": "USAAA0000001", "t4": "USAAA0000001", "t3": "USAAA0000003"}
+
+    pages = list(extractor_for(albums, isrcs)._artist_pages(["a1", "a2"]))
+    tracks = [track for page in pages for track in page]
+
+    assert [t['spotify_id'] for t in tracks] == ["t1", "t2", "t3", "t5"]
+    assert tracks[0]['isrc'] == "USAAA0000001"
+
+
+def test_fetch_pages_keeps_order():
+    total, limit = 230, 50
+    items = list(range(total))
+    started = []
+    lock = threading.Lock()
+
+    def fetch_page(offset):
+        with lock:
+            started.append(offset)
+        # Later pages answer first
+        time.sleep((total - offset) / 2000)
+        return {'total': total, 'items': items[offset:offset + limit]}
+
+    first = {'total': total, 'items': items[:20]}
+    pages = list(fetch_pages(first, fetch_page, limit))
+
+    assert [page[0] for page in pages] == [0, 20, 70, 120, 170, 220]
+    assert [item for page in pages for item in page] == items
+    assert sorted(started) == [20, 70, 120, 170, 220]
+
+
+def test_fetch_pages_stops_at_empty_page():
+    def fetch_page(offset):
+        return {'total': 100, 'items': [offset] if offset < 60 else []}
+
+    pages = list(fetch_pages({'total': 100, 'items': ["first"] * 20}, fetch_page, 20))
+
+    assert pages[1:] == [[20], [40]]
+    assert list(fetch_pages({'total': 100, 'items': []}, fetch_page, 20)) == [[]]
+    assert chunked([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
@@ -0,0 +1,118 @@
+import threading
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from spotipy.exceptions import SpotifyException
+
+from SpotDown.extractor import spotify_requests, spotify_extractor
+from SpotDown.extractor.spotify_requests import SpotifyRateLimited, SpotifyRequests
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Fake clock: the waits of the request layer are recorded and advance time instead of sleeping"""
+    waits = []
+    now = [0.0]
+
+    def sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(spotify_requests, "time", SimpleNamespace(sleep=sleep, monotonic=lambda: now[0]))
+    return waits
+
+
+def failing(*statuses, retry_after=None):
+    """Callable answering the given HTTP errors in turn, then "ok" """
+    calls = []
+    errors = list(statuses)
+
+    def call():
+        calls.append(1)
+        if errors:
+            headers = {"Retry-After": retry_after} if retry_after is not None else {}
+            raise SpotifyException(errors.pop(0), -1, "error", headers=headers)
+        return "ok"
+
+    return call, calls
+
+
+def test_429_waits_for_retry_after_then_succeeds(sleeps):
+    layer = SpotifyRequests(rate=0, capacity=1, concurrency=4, maximum=8)
+    call, calls = failing(429, 429, retry_after="3")
+
+    assert layer.call(call) == "ok"
+    assert len(calls) == 3
+    assert sleeps == [3.0, 3.0]
+    assert layer.limiter.limit < 4
+
+
+def test_retry_after_above_max_retry_wait_is_raised(sleeps):
+    layer = SpotifyRequests(rate=0, capacity=1)
+    call, calls = failing(429, retry_after=str(spotify_requests.max_retry_wait + 1))
+
+    with pytest.raises(SpotifyRateLimited) as error:
+        layer.call(call)
+    assert error.value.retry_after == spotify_requests.max_retry_wait + 1
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_server_errors_back_off_until_max_retries(sleeps):
+    layer = SpotifyRequests(rate=0, capacity=1)
+    call, calls = failing(*[503] * (spotify_requests.max_retries + 1))
+
+    with pytest.raises(SpotifyException):
+        layer.call(call)
+    assert len(calls) == spotify_requests.max_retries + 1
+    assert sleeps == sorted(sleeps) and sleeps[0] == 1.0
+
+
+def test_other_errors_are_not_retried(sleeps):
+    layer = SpotifyRequests(rate=0, capacity=1)
+    call, calls = failing(404)
+
+    with pytest.raises(SpotifyException):
+        layer.call(call)
+    assert len(calls) == 1
+
+
+class TooManyRequests(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        TooManyRequests.hits += 1
+        self.send_response(429)
+        self.send_header("Retry-After", "1")
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"error": {"status": 429, "message": "API rate limit exceeded"}}')
+
+    def log_message(self, *args):
+        pass
+
+
+def test_shared_client_leaves_429_to_the_request_layer(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TooManyRequests)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("SPOTIPY_CLIENT_ID", "test-client")
+    monkeypatch.setenv("SPOTIPY_CLIENT_SECRET", "test-secret")
+    spotify_extractor.reset_spotify_client()
+
+    try:
+        client = spotify_extractor.get_spotify_client()
+        monkeypatch.setattr(client, "prefix", f"http://127.0.0.1:{server.server_port}/v1/")
+        monkeypatch.setattr(client, "_auth_manager", None)
+
+        TooManyRequests.hits = 0
+        with pytest.raises(SpotifyException) as error:
+            client.track("0" * 22)
+
+        # urllib3 must not retry on its own, Retry-After has to reach SpotifyRequests
+        assert TooManyRequests.hits == 1
+        assert error.value.http_status == 429
+        assert error.value.headers.get("Retry-After") == "1"
+    finally:
+        spotify_extractor.reset_spotify_client()
+        server.shutdown()
@@ -0,0 +1,112 @@
+import pytest
+
+from SpotDown.downloader import ydl_pool
+from SpotDown.downloader.cookie_jar import CookieJarRef
+from SpotDown.downloader.ydl_pool import YDLSessionPool, profile_key
+
+
+class FakeSession:
+    created = []
+
+    def __init__(self, options, cookies=None):
+        self.options = options
+        self.cookies = cookies
+        self.closed = False
+        self.ydl = self
+        FakeSession.created.append(self)
+
+    def prepare(self, outtmpl, progress_hook):
+        self.outtmpl = outtmpl
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    FakeSession.created = []
+    monkeypatch.setattr(ydl_pool, "YDLSession", FakeSession)
+    return YDLSessionPool(max_idle=3)
+
+
+def use(pool, options, cookies=None):
+    with pool.session(options, cookies) as ydl:
+        return ydl
+
+
+AUDIO = {'format': 'bestaudio/best', 'quiet': True}
+FLAT = {'extract_flat': 'in_playlist', 'quiet': True}
+
+
+def test_sessions_reused_per_profile(pool):
+    first = use(pool, AUDIO)
+    assert use(pool, dict(reversed(list(AUDIO.items())))) is first
+    assert use(pool, FLAT) is not first
+    assert len(FakeSession.created) == 2
+
+
+def test_keyed_by_cookie_strategy_and_generation(pool):
+    chrome = CookieJarRef("chrome", 0, object())
+    edge = CookieJarRef("edge", 0, object())
+
+    plain = use(pool, AUDIO)
+    with_chrome = use(pool, AUDIO, chrome)
+    with_edge = use(pool, AUDIO, edge)
+    assert len({id(plain), id(with_chrome), id(with_edge)}) == 3
+    assert use(pool, AUDIO, CookieJarRef("chrome", 0, object())) is with_chrome
+
+    # Reloaded jar: the idle sessions of the old generation are closed, not reused
+    reloaded = use(pool, AUDIO, CookieJarRef("chrome", 1, object()))
+    assert reloaded is not with_chrome
+    assert with_chrome.closed
+    assert not with_edge.closed and not plain.closed
+    assert profile_key(AUDIO, chrome) != profile_key(AUDIO, CookieJarRef("chrome", 1, chrome.jar))
+
+
+def test_session_checked_out_during_invalidation_is_closed(pool):
+    old = CookieJarRef("chrome", 0, object())
+    with pool.session(AUDIO, old) as checked_out:
+        use(pool, AUDIO, CookieJarRef("chrome", 1, object()))
+
+    assert checked_out.closed
+    assert pool.idle_count == 1
+
+
+def test_failed_call_discards_session(pool):
+    with pytest.raises(RuntimeError):
+        with pool.session(AUDIO) as ydl:
+            raise RuntimeError("download failed")
+
+    assert ydl.closed
+    assert use(pool, AUDIO) is not ydl
+
+
+def test_least_recently_used_closed_above_max_idle(pool):
+    sessions = [use(pool, {'format': f"format-{i}"}) for i in range(4)]
+
+    assert sessions[0].closed
+    assert not any(session.closed for session in sessions[1:])
+    assert pool.idle_count == 3
+
+    pool.close()
+    assert all(session.closed for session in sessions)
+    assert pool.idle_count == 0
+
+
+def test_real_session_output_template_is_per_call():
+    pool = YDLSessionPool(max_idle=1)
+    calls = []
+
+    with pool.session({'quiet': True}, outtmpl="/tmp/a.%(ext)s", progress_hook=calls.append) as ydl:
+        assert ydl.params['outtmpl'] == {'default': "/tmp/a.%(ext)s"}
+        for hook in ydl._progress_hooks:
+            hook({'status': 'downloading'})
+
+    with pool.session({'quiet': True}, outtmpl="/tmp/b.%(ext)s") as again:
+        assert again is ydl
+        assert ydl.params['outtmpl'] == {'default': "/tmp/b.%(ext)s"}
+        for hook in ydl._progress_hooks:
+            hook({'status': 'finished'})
+
+    assert calls == [{'status': 'downloading'}]
+    pool.close()
@@ -0,0 +1,77 @@
+import re
+import json
+import glob
+import os
+
+import pytest
+
+from SpotDown.extractor import youtube_extractor
+from SpotDown.extractor.youtube_extractor import YouTubeExtractor, parse_initial_data
+
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "fixtures", "youtube_search", "*.html")))
+
+
+def legacy_initial_data(html):
+    """Extraction before the substring scan: non-greedy regex over the whole page, then json.loads"""
+    match = re.search(r'var ytInitialData = ({.+?});', html, re.DOTALL)
+    return json.loads(match.group(1)) if match else None
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "raw_decode"])
+def decoder(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(youtube_extractor, "orjson", None)
+    return request.param
+
+
+def test_fixtures_present():
+    assert FIXTURES
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_parity_with_legacy_regex(path, decoder):
+    html = read(path)
+    data = parse_initial_data(html)
+
+    assert data is not None
+    assert data == legacy_initial_data(html)
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+def test_results_extracted_from_fixture(path, decoder):
+    videos = YouTubeExtractor()._extract_youtube_videos(read(path), 5)
+
+    assert len(videos) == 5
+    assert all(video['video_id'] and video['duration_seconds'] for video in videos)
+
+
+def test_window_marker(decoder):
+    html = '<script>window["ytInitialData"] = {"contents": {"a": [1, "};"]}};</script>'
+
+    assert parse_initial_data(html) == {"contents": {"a": [1, "};"]}}
+
+
+def test_raw_decode_without_closing_script(decoder):
+    html = '<script>var ytInitialData = {"a": {"b": 1}}; var other = 2'
+
+    assert parse_initial_data(html) == {"a": {"b": 1}}
+
+
+def test_missing_marker(decoder):
+    assert parse_initial_data("<html><script>var ytcfg = {};</script></html>") is None
+
+
+def test_truncated_json(decoder):
+    html = read(FIXTURES[0])
+    start = html.find("var ytInitialData = ")
+
+    assert parse_initial_data(html[:start + 5000]) is None
+    assert parse_initial_data('<script>var ytInitialData = {"a": [1, 2;</script>') is None
@@ -295,70 +295,73 @@ export default function Home() {
     }
   };
 
-  // Polling for progress
+  // Progress stream (Server-Sent Events)
   useEffect(() => {
     if (!taskId) return;
 
-    const interval = setInterval(async () => {
+    const source = new EventSource(`http://localhost:8001/api/progress/stream?task_ids=${taskId}`);
+    const stop = () => source.close();
+
+    source.addEventListener("progress", (event) => {
       try {
-        const res = await fetch(`http://localhost:8001/api/progress/${taskId}`);
-        if (res.ok) {
-          const data = await res.json();
-          console.log("Progress data:", data);
-
-          if (data.status === 'downloading') {
-            if (data.total_tracks) {
-              setDownloadStatus(`Descargando ${data.current_track}/${data.total_tracks}: ${data.filename} (${data.percent.toFixed(1)}%)`);
-            } else {
-              setDownloadStatus(`Descargando: ${data.percent.toFixed(1)}%`);
-            }
-            setProgress(data.percent);
-          } else if (data.status === 'processing') {
-            setDownloadStatus("Procesando audio...");
-            setProgress(100);
-          } else if (data.status === 'completed') {
-            setDownloadStatus(t.completed);
-            setProgress(100);
-            clearInterval(interval);
-            setTaskId(null); // Stop polling
-
-            // Add to history
-            if (display.title) {
-              const currentQuality = localStorage.getItem("audio_quality") || "320K";
-              const format = currentQuality === "FLAC" ? "FLAC" : "MP3";
-
-              let platform = "other";
-              if (mode === "tracklist") {
-                platform = "tracklist";
-              } else if (searchedUrl) {
-                if (searchedUrl.includes("spotify")) platform = "spotify";
-                else if (searchedUrl.includes("youtu")) platform = "youtube";
-                else if (searchedUrl.includes("soundcloud")) platform = "soundcloud";
-              }
-
-              addToHistory({
-                title: display.title,
-                artist: display.artist,
-                cover: display.cover,
-                date: new Date().toISOString(),
-                platform,
-                format
-              });
+        const data = JSON.parse((event as MessageEvent).data);
+        console.log("Progress data:", data);
+
+        if (data.status === 'downloading') {
+          if (data.total_tracks) {
+            setDownloadStatus(`Descargando ${data.current_track}/${data.total_tracks}: ${data.filename} (${data.percent.toFixed(1)}%)`);
+          } else {
+            setDownloadStatus(`Descargando: ${data.percent.toFixed(1)}%`);
+          }
+          setProgress(data.percent);
+        } else if (data.status === 'processing') {
+          setDownloadStatus("Procesando audio...");
+          setProgress(100);
+        } else if (data.status === 'completed') {
+          setDownloadStatus(t.completed);
+          setProgress(100);
+          stop();
+          setTaskId(null); // Stop listening
+
+          // Add to history
+          if (display.title) {
+            const currentQuality = localStorage.getItem("audio_quality") || "320K";
+            const format = currentQuality === "FLAC" ? "FLAC" : "MP3";
+
+            let platform = "other";
+            if (mode === "tracklist") {
+              platform = "tracklist";
+            } else if (searchedUrl) {
+              if (searchedUrl.includes("spotify")) platform = "spotify";
+              else if (searchedUrl.includes("youtu")) platform = "youtube";
+              else if (searchedUrl.includes("soundcloud")) platform = "soundcloud";
             }
-          } else if (data.status === 'error') {
-            setDownloadStatus(`Error: ${data.error || "Falló la descarga"}`);
-            clearInterval(interval);
-            setTaskId(null);
-          } else if (data.status === 'starting') {
-            setDownloadStatus("Iniciando...");
+
+            addToHistory({
+              title: display.title,
+              artist: display.artist,
+              cover: display.cover,
+              date: new Date().toISOString(),
+              platform,
+              format
+            });
           }
+        } else if (data.status === 'error') {
+          setDownloadStatus(`Error: ${data.error || "Falló la descarga"}`);
+          stop();
+          setTaskId(null);
+        } else if (data.status === 'not_found') {
+          stop();
+          setTaskId(null);
+        } else if (data.status === 'starting') {
+          setDownloadStatus("Iniciando...");
         }
       } catch (e) {
-        console.error("Polling error", e);
+        console.error("Progress stream error", e);
       }
-    }, 500);
+    });
 
-    return () => clearInterval(interval);
+    return stop;
   }, [taskId]);
 
   // Helper to safely get display data